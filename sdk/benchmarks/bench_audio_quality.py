@@ -0,0 +1,71 @@
+"""
+Per-frame cost benchmark for the audio-quality analyzer.
+
+Feeds synthetic 10 ms user and agent frames (as delivered by RoomAudioTap)
+through AudioQualityAnalyzer and reports the average cost per frame, the
+share of real time spent analyzing and the cost of a single batch.
+
+Usage:
+    python benchmarks/bench_audio_quality.py [--minutes 10] [--batch-seconds 0.5]
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from whispey.audio_quality import AudioQualityAnalyzer  # noqa: E402
+
+SAMPLE_RATE = 48000
+FRAME_SAMPLES = SAMPLE_RATE // 100
+
+
+class Frame:
+    def __init__(self, samples):
+        self.data = memoryview(samples.astype(np.int16).tobytes()).cast("h")
+
+
+def build_frames(count, seed=7):
+    # A pool of speech-like and near-silent frames, reused round-robin
+    rng = np.random.default_rng(seed)
+    t = np.arange(FRAME_SAMPLES)
+    speech = [Frame(rng.normal(0, 40, FRAME_SAMPLES) + 6000 * np.sin(2 * np.pi * f * t / SAMPLE_RATE))
+              for f in (180, 220, 260, 310)]
+    silence = [Frame(rng.normal(0, 40, FRAME_SAMPLES)) for _ in range(4)]
+    return [(speech if (i // 200) % 2 else silence)[i % 4] for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=10, help="length of the simulated call")
+    parser.add_argument("--batch-seconds", type=float, default=0.5, help="audio buffered per source before analysis")
+    args = parser.parse_args()
+
+    frame_count = int(args.minutes * 60 * 100)
+    user_frames = build_frames(frame_count, seed=7)
+    # Agent turns lag the user by a second, so both overlap and dead air occur
+    agent_frames = build_frames(frame_count + 100, seed=11)[100:]
+    analyzer = AudioQualityAnalyzer(sample_rate=SAMPLE_RATE, batch_seconds=args.batch_seconds)
+
+    start = time.perf_counter()
+    for user_frame, agent_frame in zip(user_frames, agent_frames):
+        analyzer.on_audio_frame("user", user_frame)
+        analyzer.on_audio_frame("agent", agent_frame)
+    metrics = analyzer.session_metrics(final=True)
+    elapsed = time.perf_counter() - start
+
+    frames = 2 * frame_count
+    batches = frames * FRAME_SAMPLES / (SAMPLE_RATE * args.batch_seconds)
+    print(f"Call: {args.minutes:g} min, {frames:,} frames (user + agent)")
+    print(f"Total analysis     {elapsed * 1000:9.1f} ms")
+    print(f"Per frame          {elapsed / frames * 1e6:9.2f} us")
+    print(f"Per batch          {elapsed / batches * 1000:9.3f} ms  ({args.batch_seconds:g} s of audio)")
+    print(f"Share of real time {elapsed / (args.minutes * 60) * 100:9.4f} %")
+    print(f"Overlap {metrics['overlap_seconds']} s, dead air {metrics['dead_air_seconds']} s")
+
+
+if __name__ == "__main__":
+    main()
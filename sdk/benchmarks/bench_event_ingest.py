@@ -0,0 +1,139 @@
+"""
+Per-event handler cost benchmark for session event ingestion.
+
+Replays synthetic calls (user item, STT, EOU, LLM, assistant item and TTS
+events per turn) through the handlers registered by
+setup_session_event_handlers, once processing events inline and once with the
+ring-buffer pipeline. Reports the time spent inside the handlers, i.e. in the
+agent's event emitter, plus the cost of draining the buffered events.
+
+Usage:
+    python benchmarks/bench_event_ingest.py [--calls 200] [--turns 20] [--log-level WARNING]
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livekit.agents import metrics  # noqa: E402
+from whispey.event_handlers import setup_session_event_handlers  # noqa: E402
+from whispey.metrics_service import setup_usage_collector, create_session_data  # noqa: E402
+
+
+class Session:
+    """Bare stand-in for AgentSession: just enough to register and call handlers"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, name):
+        def register(handler):
+            self.handlers[name] = handler
+            return handler
+        return register
+
+
+class Event:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+def build_metric(cls, **fields):
+    # Validated like the metrics plugins emit; fields this livekit-agents version does not define are left out
+    known = getattr(cls, "model_fields", None)
+    if known is not None:
+        fields = {name: value for name, value in fields.items() if name in known}
+    return cls(**fields)
+
+
+def build_call(turns):
+    events = []
+    for i in range(turns):
+        now = time.time()
+        events += [
+            ("conversation_item_added", Event(item=Event(role="user", text_content=f"user message number {i} about the order"))),
+            ("metrics_collected", Event(metrics=build_metric(
+                metrics.STTMetrics, label="bench", request_id=f"stt-{i}", timestamp=now, duration=0.2,
+                audio_duration=1.2, streamed=True))),
+            ("metrics_collected", Event(metrics=build_metric(
+                metrics.EOUMetrics, timestamp=now, end_of_utterance_delay=0.5, transcription_delay=0.1,
+                on_user_turn_completed_delay=0.0, speech_id=f"speech-{i}"))),
+            ("metrics_collected", Event(metrics=build_metric(
+                metrics.LLMMetrics, label="bench", request_id=f"llm-{i}", timestamp=now, duration=1.1, ttft=0.4,
+                cancelled=False, completion_tokens=36, prompt_tokens=420, prompt_cached_tokens=0, total_tokens=456,
+                tokens_per_second=40.0, speech_id=f"speech-{i}"))),
+            ("conversation_item_added", Event(item=Event(role="assistant", text_content=f"agent reply number {i}, happy to help"))),
+            ("metrics_collected", Event(metrics=build_metric(
+                metrics.TTSMetrics, label="bench", request_id=f"tts-{i}", timestamp=now, ttfb=0.2, duration=0.6,
+                audio_duration=1.8, cancelled=False, characters_count=32, streamed=True,
+                speech_id=f"speech-{i}"))),
+        ]
+    return events
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def replay(calls, turns, event_buffer_size=None):
+    """Returns (per-event handler times in ns, total drain time in ns)"""
+    handler_ns = []
+    drain_ns = 0
+    for _ in range(calls):
+        session = Session()
+        session_data = create_session_data(
+            type("Ctx", (), {"room": type("Room", (), {"name": "bench"})})(), time.time()
+        )
+        pipeline = setup_session_event_handlers(session, session_data, setup_usage_collector(), None,
+                                                event_buffer_size=event_buffer_size)
+        events = [(session.handlers[name], event) for name, event in build_call(turns)]
+
+        clock = time.perf_counter_ns
+        for handler, event in events:
+            start = clock()
+            handler(event)
+            handler_ns.append(clock() - start)
+
+        if pipeline:
+            start = clock()
+            pipeline.stop()
+            drain_ns += clock() - start
+    return handler_ns, drain_ns
+
+
+def report(label, handler_ns, drain_ns=None):
+    mean = sum(handler_ns) / len(handler_ns) / 1000
+    line = (f"{label:<9} mean {mean:7.2f} us   p50 {percentile(handler_ns, 0.5) / 1000:7.2f} us   "
+            f"p99 {percentile(handler_ns, 0.99) / 1000:7.2f} us")
+    if drain_ns is not None:
+        line += f"   drain {drain_ns / len(handler_ns) / 1000:7.2f} us/event"
+    print(line)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="number of simulated calls")
+    parser.add_argument("--turns", type=int, default=20, help="turns per call")
+    parser.add_argument("--log-level", default="WARNING", help="SDK log level while replaying")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level)
+
+    # Room for a whole call, so the comparison is not skewed by dropped events
+    capacity = args.turns * 6
+    inline_ns, _ = replay(args.calls, args.turns)
+    buffered_ns, drain_ns = replay(args.calls, args.turns, event_buffer_size=capacity)
+
+    print(f"Replayed {args.calls} calls x {args.turns} turns ({len(inline_ns):,} events per mode)")
+    report("inline", inline_ns)
+    report("buffered", buffered_ns, drain_ns)
+    speedup = sum(inline_ns) / sum(buffered_ns)
+    print(f"Handler time in the event emitter: {speedup:.1f}x lower with the ring buffer")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""
+Import-time benchmark for the whispey package.
+
+Runs ``import whispey`` in fresh interpreters (the cost LiveKit pays in every
+job process), reports the median wall time and fails if it regresses past the
+budget or if a heavy dependency is imported eagerly.
+
+Usage:
+    python benchmarks/bench_import.py [--runs 20] [--budget-ms 15]
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+SDK_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only load once a session is observed or exported
+HEAVY_MODULES = ["aiohttp", "dotenv", "livekit", "pyarrow", "whispey.whispey", "whispey.event_handlers"]
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import whispey
+elapsed = time.perf_counter() - start
+print(json.dumps({"ms": elapsed * 1000, "modules": sorted(sys.modules)}))
+"""
+
+
+def run_probe():
+    env = dict(os.environ, PYTHONPATH=SDK_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    output = subprocess.check_output([sys.executable, "-c", PROBE], env=env, cwd=SDK_ROOT)
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="number of fresh interpreters to sample")
+    parser.add_argument("--budget-ms", type=float, default=15.0, help="fail if the median import time exceeds this")
+    args = parser.parse_args()
+
+    samples = []
+    eager = set()
+    for _ in range(args.runs):
+        result = run_probe()
+        samples.append(result["ms"])
+        eager.update(
+            name for name in result["modules"]
+            if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES)
+        )
+
+    median = statistics.median(samples)
+    print(f"import whispey: median {median:.2f} ms, min {min(samples):.2f} ms, max {max(samples):.2f} ms over {args.runs} runs")
+
+    failed = False
+    if eager:
+        print(f"❌ Heavy modules imported eagerly: {', '.join(sorted(eager))}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"❌ Median import time {median:.2f} ms exceeds budget of {args.budget_ms:.2f} ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✅ Import time within budget")
+
+
+if __name__ == "__main__":
+    main()
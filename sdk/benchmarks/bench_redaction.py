@@ -0,0 +1,87 @@
+"""
+Throughput benchmark for PII redaction on long transcripts.
+
+Builds a synthetic transcript of N utterances (a share of them carrying
+emails, card numbers, SSNs and phone numbers), then compares the single-pass
+PIIRedactor with a naive pass-per-detector loop.
+
+Usage:
+    python benchmarks/bench_redaction.py [--utterances 20000] [--pii-ratio 0.2]
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from whispey.redaction import PIIRedactor, DEFAULT_DETECTORS, luhn_valid  # noqa: E402
+
+WORDS = (
+    "okay so I wanted to ask about my order from last week and whether the "
+    "delivery can be moved to the afternoon because I will not be home before "
+    "three also can you tell me how much the premium plan costs per month"
+).split()
+
+PII_SAMPLES = [
+    "my email is jane.doe@example.com",
+    "the card number is 4111 1111 1111 1111",
+    "you can reach me at +1 (415) 555-2671",
+    "my social is 123-45-6789",
+    "call back on 98765 43210 please",
+]
+
+
+def build_transcript(utterances, pii_ratio, seed=7):
+    rng = random.Random(seed)
+    transcript = []
+    for _ in range(utterances):
+        words = rng.choices(WORDS, k=rng.randint(8, 30))
+        if rng.random() < pii_ratio:
+            words.insert(rng.randint(0, len(words)), rng.choice(PII_SAMPLES))
+        transcript.append(" ".join(words))
+    return transcript
+
+
+def naive_redact(text, patterns):
+    # One full scan of the utterance per detector
+    for name, pattern in patterns:
+        if name == "card":
+            text = pattern.sub(lambda m: "[REDACTED_CARD]" if luhn_valid(m.group(0)) else m.group(0), text)
+        else:
+            text = pattern.sub(f"[REDACTED_{name.upper()}]", text)
+    return text
+
+
+def timed(label, fn, transcript, total_bytes):
+    start = time.perf_counter()
+    for utterance in transcript:
+        fn(utterance)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed * 1000:9.1f} ms  "
+          f"{len(transcript) / elapsed:12,.0f} utterances/s  {total_bytes / elapsed / 1e6:7.1f} MB/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=20000, help="number of utterances in the transcript")
+    parser.add_argument("--pii-ratio", type=float, default=0.2, help="share of utterances containing PII")
+    args = parser.parse_args()
+
+    transcript = build_transcript(args.utterances, args.pii_ratio)
+    total_bytes = sum(len(utterance.encode("utf-8")) for utterance in transcript)
+    print(f"Transcript: {len(transcript):,} utterances, {total_bytes / 1e6:.2f} MB")
+
+    redactor = PIIRedactor()
+    patterns = [(name, re.compile(pattern)) for name, pattern in DEFAULT_DETECTORS.items()]
+
+    single = timed("PIIRedactor (1 pass)", redactor.redact, transcript, total_bytes)
+    naive = timed(f"naive ({len(patterns)} passes)", lambda text: naive_redact(text, patterns), transcript, total_bytes)
+    print(f"Speed-up: {naive / single:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,5 +35,16 @@ setup(
         "aiohttp>=3.8.0",
         "python-dotenv>=1.0.0",
     ],
+    extras_require={
+        "columnar": ["pyarrow>=12.0.0"],
+        "recording": ["av>=12.0.0", "numpy>=1.26.0"],
+        "audio": ["numpy>=1.26.0"],
+        "test": ["pytest>=7.0"],
+    },
+    entry_points={
+        "console_scripts": [
+            "whispey-reingest=whispey.reingest:main",
+        ],
+    },
     keywords="voice analytics, AI agents, conversation intelligence, whispey"
 )
\ No newline at end of file
@@ -0,0 +1,95 @@
+import asyncio
+import gc
+import logging
+from types import SimpleNamespace
+
+from whispey.anomaly_detector import EwmaBaseline, LatencyAnomalyDetector
+
+
+class LLMMetrics(SimpleNamespace):
+    pass
+
+
+class STTMetrics(SimpleNamespace):
+    pass
+
+
+def make_turn(turn_id, user="hello", agent="hi", stt=True, tts=True):
+    return SimpleNamespace(turn_id=turn_id, user_transcript=user, agent_response=agent,
+                           stt_metrics={"duration": 0.2} if stt else None,
+                           tts_metrics={"ttfb": 0.2} if tts else None)
+
+
+def test_ewma_baseline_tracks_mean():
+    baseline = EwmaBaseline(alpha=0.5)
+    for value in (1.0, 1.0, 1.0):
+        baseline.update(value)
+    assert baseline.mean == 1.0
+    assert baseline.std == 0.0
+    baseline.update(3.0)
+    assert baseline.mean == 2.0
+
+
+def test_spike_flagged_after_warmup_and_clamped():
+    detector = LatencyAnomalyDetector(warmup_samples=5, min_spike_seconds=0.25)
+    session = {"agent_id": "agent"}
+    for _ in range(5):
+        detector.on_metrics_collected(session, LLMMetrics(ttft=0.5))
+    assert "bug_reports" not in session
+
+    detector.on_metrics_collected(session, LLMMetrics(ttft=2.0), make_turn("turn_1"))
+    assert session["bug_reports"] == {"latency_spike": 1}
+    assert session["bug_flagged_turns"][0]["turn_id"] == "turn_1"
+    # The spike was folded in at the threshold, not at 2.0
+    assert detector.get_baselines("agent")["llm_ttft"]["mean"] < 0.6
+
+
+def test_stalled_ttft_flagged_without_warmup():
+    detector = LatencyAnomalyDetector(llm_stall_seconds=3.0)
+    session = {"agent_id": "agent"}
+    detector.on_metrics_collected(session, LLMMetrics(ttft=4.0))
+    assert session["bug_reports"] == {"llm_ttft_stalled": 1}
+
+
+def test_baselines_are_per_agent():
+    detector = LatencyAnomalyDetector()
+    detector.on_metrics_collected({"agent_id": "a"}, STTMetrics(duration=0.3))
+    assert set(detector.get_baselines("a")) == {"stt_duration"}
+    assert detector.get_baselines("b") == {}
+
+
+def test_missing_metrics_checked_once_per_turn():
+    detector = LatencyAnomalyDetector()
+    session = {"agent_id": "agent"}
+    collector = SimpleNamespace(turns=[make_turn("turn_1", stt=False), make_turn("turn_2", tts=False)])
+
+    detector.on_turn_completed(session, collector)
+    detector.on_turn_completed(session, collector)
+    assert session["bug_reports"] == {"missing_stt": 1}
+
+    detector.finalize(session, collector)
+    assert session["bug_reports"] == {"missing_stt": 1, "missing_tts": 1}
+
+
+def test_async_callback_is_kept_alive_and_errors_logged(caplog):
+    received = []
+
+    async def on_anomaly(flag):
+        await asyncio.sleep(0.01)
+        received.append(flag["type"])
+        raise RuntimeError("pager down")
+
+    async def run():
+        detector = LatencyAnomalyDetector(on_anomaly=on_anomaly, llm_stall_seconds=1.0)
+        detector.on_metrics_collected({"agent_id": "agent"}, LLMMetrics(ttft=2.0))
+        assert len(detector._callback_tasks) == 1
+        gc.collect()
+        await asyncio.sleep(0.05)
+        return detector
+
+    with caplog.at_level(logging.ERROR, logger="anomaly_detector"):
+        detector = asyncio.run(run())
+
+    assert received == ["llm_ttft_stalled"]
+    assert detector._callback_tasks == set()
+    assert "pager down" in caplog.text
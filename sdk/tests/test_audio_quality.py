@@ -0,0 +1,118 @@
+import math
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from whispey import audio_quality
+from whispey.audio_quality import AudioQualityAnalyzer
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.02
+FRAME_SAMPLES = int(SAMPLE_RATE * FRAME_SECONDS)
+
+
+class Frame:
+    def __init__(self, samples):
+        self.data = np.asarray(samples, dtype=np.int16).tobytes()
+
+
+def tone(amplitude, samples=FRAME_SAMPLES):
+    return np.sin(2 * np.pi * 440 * np.arange(samples) / SAMPLE_RATE) * amplitude
+
+
+def silence(samples=FRAME_SAMPLES):
+    return np.zeros(samples)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(audio_quality, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def feed(analyzer, clock, seconds, user, agent):
+    """Deliver both sources frame by frame on a simulated wall clock"""
+    for _ in range(round(seconds / FRAME_SECONDS)):
+        analyzer.on_audio_frame("user", Frame(user()))
+        analyzer.on_audio_frame("agent", Frame(agent()))
+        clock[0] += FRAME_SECONDS
+
+
+def test_levels_clipping_and_silence(clock):
+    analyzer = AudioQualityAnalyzer(sample_rate=SAMPLE_RATE)
+    feed(analyzer, clock, 1.0, user=lambda: tone(3276.8), agent=lambda: np.full(FRAME_SAMPLES, 32767))
+    feed(analyzer, clock, 1.0, user=silence, agent=lambda: np.full(FRAME_SAMPLES, 32767))
+
+    metrics = analyzer.session_metrics(final=True)
+    user, agent = metrics["user"], metrics["agent"]
+    assert user["duration_seconds"] == pytest.approx(2.0)
+    # A sine at a tenth of full scale for half the time: -20 dB - 3 dB (sine) - 3 dB (half silent)
+    assert user["rms_dbfs"] == pytest.approx(-20 - 10 * math.log10(2) - 10 * math.log10(2), abs=0.2)
+    assert user["silence_ratio"] == pytest.approx(0.5, abs=0.02)
+    assert user["clipping_ratio"] == 0
+    assert agent["clipping_ratio"] == 1
+    assert agent["silence_ratio"] == 0
+    # Always-loud audio has no quiet windows to estimate a noise floor from
+    assert agent["snr_db"] is None
+
+
+def test_snr_from_speech_against_noise_floor(clock):
+    analyzer = AudioQualityAnalyzer(sample_rate=SAMPLE_RATE)
+    rng = np.random.default_rng(0)
+    noise = lambda: rng.normal(0, 10, FRAME_SAMPLES)
+    feed(analyzer, clock, 1.0, user=lambda: tone(8000) + noise(), agent=silence)
+    feed(analyzer, clock, 1.0, user=noise, agent=silence)
+
+    snr = analyzer.session_metrics(final=True)["user"]["snr_db"]
+    # Speech windows sit around -15 dBFS, the noise floor around -70 dBFS
+    assert 50 <= snr <= 60
+
+
+def test_overlap_and_dead_air(clock):
+    analyzer = AudioQualityAnalyzer(sample_rate=SAMPLE_RATE)
+    talk = lambda: tone(8000)
+    feed(analyzer, clock, 1.0, user=talk, agent=silence)
+    feed(analyzer, clock, 1.0, user=silence, agent=talk)
+    feed(analyzer, clock, 1.0, user=silence, agent=silence)
+    feed(analyzer, clock, 0.5, user=talk, agent=talk)
+
+    metrics = analyzer.session_metrics(final=True)
+    assert metrics["overlap_seconds"] == pytest.approx(0.5, abs=0.04)
+    assert metrics["dead_air_seconds"] == pytest.approx(1.0, abs=0.04)
+    assert metrics["dead_air_ratio"] == pytest.approx(1 / 3.5, abs=0.02)
+
+
+def test_paused_source_resumes_at_its_wall_clock_position(clock):
+    analyzer = AudioQualityAnalyzer(sample_rate=SAMPLE_RATE)
+    talk = lambda: tone(8000)
+    feed(analyzer, clock, 1.0, user=talk, agent=talk)
+    # The agent sends no frames for two seconds while the user keeps talking
+    for _ in range(100):
+        analyzer.on_audio_frame("user", Frame(talk()))
+        clock[0] += FRAME_SECONDS
+    feed(analyzer, clock, 1.0, user=silence, agent=talk)
+
+    metrics = analyzer.session_metrics(final=True)
+    assert metrics["overlap_seconds"] == pytest.approx(1.0, abs=0.1)
+    assert metrics["dead_air_seconds"] == pytest.approx(0.0, abs=0.1)
+
+
+def test_turn_metrics_reset_while_session_metrics_accumulate(clock):
+    analyzer = AudioQualityAnalyzer(sample_rate=SAMPLE_RATE)
+    feed(analyzer, clock, 1.0, user=lambda: tone(8000), agent=silence)
+    first = analyzer.close_turn()
+    feed(analyzer, clock, 0.5, user=silence, agent=lambda: tone(8000))
+    second = analyzer.close_turn()
+
+    assert first["user"]["duration_seconds"] == pytest.approx(1.0)
+    assert second["user"]["duration_seconds"] == pytest.approx(0.5)
+    assert second["user"]["silence_ratio"] == 1
+    assert analyzer.session_metrics(final=True)["user"]["duration_seconds"] == pytest.approx(1.5)
+
+
+def test_no_audio_reports_no_levels(clock):
+    metrics = AudioQualityAnalyzer(sample_rate=SAMPLE_RATE).session_metrics(final=True)
+    assert metrics == {"overlap_seconds": 0, "overlap_ratio": None, "dead_air_seconds": 0, "dead_air_ratio": None}
@@ -0,0 +1,89 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from whispey.columnar_sink import ColumnarSink
+
+
+def make_turn(index):
+    return SimpleNamespace(
+        turn_id=f"turn_{index}", timestamp=1000.0 + index, user_transcript=f"question {index}",
+        agent_response=f"answer {index}", stt_metrics={"audio_duration": 1.5, "duration": 0.2, "request_id": "stt"},
+        llm_metrics={"prompt_tokens": 100, "completion_tokens": 20, "ttft": 0.4}, tts_metrics=None, eou_metrics=None,
+    )
+
+
+def write_sessions(sink, count, turns_per_session=3):
+    for index in range(count):
+        data = {"call_id": f"call-{index}", "agent_id": "agent", "duration_seconds": 60,
+                "metadata": {"usage": {"llm_prompt_tokens": 100}}}
+        sink.write_session(f"session-{index}", data, [make_turn(i) for i in range(turns_per_session)])
+
+
+def files(directory, table):
+    return sorted(name for name in os.listdir(directory) if name.startswith(table))
+
+
+def test_sessions_share_one_row_group(tmp_path):
+    sink = ColumnarSink(str(tmp_path), max_file_seconds=0)
+    write_sessions(sink, 3)
+    assert files(tmp_path, "turns") == []  # still buffered
+    sink.close()
+
+    [turns_file] = files(tmp_path, "turns")
+    parquet = pq.ParquetFile(str(tmp_path / turns_file))
+    assert parquet.metadata.num_row_groups == 1
+    assert parquet.metadata.num_rows == 9
+    table = parquet.read()
+    assert table.column("llm_ttft").to_pylist() == [0.4] * 9
+    assert table.column("tts_ttfb").to_pylist() == [None] * 9
+
+
+def test_row_group_written_once_rows_build_up(tmp_path):
+    sink = ColumnarSink(str(tmp_path), max_file_seconds=0, row_group_rows=4)
+    write_sessions(sink, 3)
+    [in_progress] = files(tmp_path, "turns")
+    assert in_progress.endswith(".inprogress")
+    sink.close()
+
+    [turns_file] = files(tmp_path, "turns")
+    metadata = pq.ParquetFile(str(tmp_path / turns_file)).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [6, 3]
+
+
+def test_idle_file_is_rotated_by_timer(tmp_path):
+    sink = ColumnarSink(str(tmp_path), max_file_seconds=0.2, row_group_rows=1)
+    write_sessions(sink, 1)
+    deadline = time.time() + 5
+    while any(name.endswith(".inprogress") for name in os.listdir(tmp_path)) and time.time() < deadline:
+        time.sleep(0.05)
+
+    assert not any(name.endswith(".inprogress") for name in os.listdir(tmp_path))
+    assert len(files(tmp_path, "turns")) == 1
+    sink.close()
+
+
+def test_flush_finalizes_and_later_sessions_start_new_files(tmp_path):
+    sink = ColumnarSink(str(tmp_path), file_format="arrow", max_file_seconds=0)
+    write_sessions(sink, 2)
+    sink.flush()
+    write_sessions(sink, 1)
+    sink.close()
+
+    turns_files = files(tmp_path, "turns")
+    assert len(turns_files) == 2
+    rows = 0
+    for name in turns_files:
+        with pa.ipc.open_file(str(tmp_path / name)) as reader:
+            rows += reader.read_all().num_rows
+    assert rows == 9
+
+
+def test_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarSink(str(tmp_path), file_format="csv")
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from whispey.event_buffer import BufferedEventPipeline, EventRingBuffer
+from whispey.telemetry import sdk_stats
+
+
+def test_ring_buffer_keeps_order_across_wraparound():
+    buffer = EventRingBuffer(3)
+    for record in "abc":
+        assert buffer.push(record)
+    assert buffer.drain(2) == ["a", "b"]
+    buffer.push("d")
+    buffer.push("e")
+    assert len(buffer) == 3
+    assert buffer.drain() == ["c", "d", "e"]
+    assert buffer.drain() == []
+    # Drained slots no longer hold the records
+    assert buffer._slots == [None, None, None]
+
+
+def test_ring_buffer_drops_and_counts_overflow_without_overwriting():
+    buffer = EventRingBuffer(2)
+    assert buffer.push(1) and buffer.push(2)
+    assert not buffer.push(3)
+    assert not buffer.push(4)
+    assert buffer.dropped == 2
+    assert buffer.drain() == [1, 2]
+    assert buffer.push(5)
+    assert buffer.dropped == 2
+
+
+def test_ring_buffer_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        EventRingBuffer(0)
+
+
+def test_pipeline_reports_each_drop_once_and_isolates_processor_errors():
+    seen = []
+
+    def fail(event, timestamp):
+        raise RuntimeError("bad event")
+
+    pipeline = BufferedEventPipeline({"ok": lambda event, timestamp: seen.append((event, timestamp)), "bad": fail},
+                                     capacity=3)
+    before = sdk_stats.counters["events_dropped"]
+    for index, kind in enumerate(["ok", "bad", "ok", "ok", "ok"]):
+        pipeline.push((kind, float(index), index))
+
+    assert pipeline.drain() == 3
+    assert seen == [(0, 0.0), (2, 2.0)]
+    assert pipeline.dropped == 2
+    assert sdk_stats.counters["events_dropped"] == before + 2
+
+    pipeline.push(("ok", 5.0, 5))
+    pipeline.drain()
+    assert sdk_stats.counters["events_dropped"] == before + 2
+    assert pipeline.processed == 4
+
+
+def test_background_drain_processes_in_batches_and_stop_flushes():
+    seen = []
+
+    async def run():
+        pipeline = BufferedEventPipeline({"ok": lambda event, timestamp: seen.append(event)}, capacity=100,
+                                         drain_interval=0.01, batch_size=7)
+        pipeline.start()
+        for index in range(50):
+            pipeline.push(("ok", 0.0, index))
+        await asyncio.sleep(0.1)
+        assert seen == list(range(50))
+
+        pipeline.push(("ok", 0.0, 50))
+        pipeline.stop()
+        assert seen[-1] == 50
+        assert pipeline._task is None
+
+    asyncio.run(run())
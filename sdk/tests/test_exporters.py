@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from whispey.exporters import (
+    DirectoryExporter, FanOutExporter, FileExporter, HttpExporter, MemoryExporter, WhispeyExporter, write_atomic,
+)
+
+PAYLOAD = json.dumps({"call_id": "call-1", "agent_id": "agent"}).encode("utf-8")
+DATA = {"call_id": "call-1", "agent_id": "agent"}
+
+
+class FailingExporter(WhispeyExporter):
+    name = "failing"
+
+    async def export(self, payload, data, deadline=None):
+        raise RuntimeError("sink down")
+
+
+class ScriptedHttpExporter(HttpExporter):
+    """HttpExporter whose requests are scripted coroutines instead of network calls"""
+
+    def __init__(self, responses, **kwargs):
+        super().__init__(apikey="key", api_url="http://ingest.invalid", **kwargs)
+        self.responses = list(responses)
+        self.started = []
+        self.cancelled = []
+
+    async def _post(self, payload, deadline):
+        index = len(self.started)
+        delay, result = self.responses[min(index, len(self.responses) - 1)]
+        self.started.append(index)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(index)
+            raise
+        return dict(result)
+
+
+def test_fan_out_isolates_failing_sinks():
+    memory = MemoryExporter()
+    result = asyncio.run(FanOutExporter([memory, FailingExporter()], require="any").export(PAYLOAD, DATA))
+
+    assert result["success"]
+    assert memory.records == [DATA]
+    assert result["results"]["1:failing"] == {"success": False, "error": "sink down"}
+
+    result = asyncio.run(FanOutExporter([MemoryExporter(), FailingExporter()]).export(PAYLOAD, DATA))
+    assert not result["success"]
+    assert "1:failing" in result["error"]
+
+
+def test_fan_out_rejects_bad_configuration():
+    with pytest.raises(ValueError):
+        FanOutExporter([])
+    with pytest.raises(ValueError):
+        FanOutExporter([MemoryExporter()], require="most")
+
+
+def test_file_and_directory_exporters(tmp_path):
+    path = tmp_path / "sessions.ndjson"
+    exporter = FileExporter(str(path))
+
+    async def export_twice():
+        await asyncio.gather(exporter.export(PAYLOAD, DATA), exporter.export(PAYLOAD, DATA))
+
+    asyncio.run(export_twice())
+    assert [json.loads(line) for line in path.read_bytes().splitlines()] == [DATA, DATA]
+
+    result = asyncio.run(DirectoryExporter(str(tmp_path / "dumps")).export(PAYLOAD, DATA))
+    assert result["path"] == str(tmp_path / "dumps" / "call-1.json")
+    assert json.loads((tmp_path / "dumps" / "call-1.json").read_bytes()) == DATA
+
+
+def test_write_atomic_leaves_no_temp_files(tmp_path):
+    path = tmp_path / "session.json"
+    write_atomic(str(path), b"old")
+    write_atomic(str(path), b"new")
+    assert path.read_bytes() == b"new"
+    assert os.listdir(tmp_path) == ["session.json"]
+
+
+def test_hedged_request_wins_and_slow_primary_is_cancelled():
+    exporter = ScriptedHttpExporter([(5, {"success": True, "via": "primary"}), (0, {"success": True, "via": "hedge"})],
+                                    hedge_after=0.05, min_attempt_seconds=0.01)
+    result = asyncio.run(exporter.export(PAYLOAD, DATA, deadline=None))
+    assert result["via"] == "hedge"
+    assert exporter.cancelled == [0]
+
+
+def test_cancelling_the_export_cancels_primary_and_hedge():
+    exporter = ScriptedHttpExporter([(5, {"success": True})], hedge_after=0.05, min_attempt_seconds=0.01)
+
+    async def cancel_mid_export(wait):
+        task = asyncio.ensure_future(exporter.export(PAYLOAD, DATA))
+        await asyncio.sleep(wait)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+        # Checked inside the loop: asyncio.run would cancel leftover tasks on exit anyway
+        return sorted(exporter.cancelled)
+
+    # While waiting for the primary to answer before hedging
+    assert asyncio.run(cancel_mid_export(0.01)) == [0]
+
+    # While primary and hedge race
+    exporter.started, exporter.cancelled = [], []
+    assert asyncio.run(cancel_mid_export(0.1)) == [0, 1]
+
+
+def test_retries_retryable_failures():
+    exporter = ScriptedHttpExporter([(0, {"success": False, "retryable": True}), (0, {"success": True})],
+                                    retry_backoff=0.01, min_attempt_seconds=0.01)
+    result = asyncio.run(exporter.export(PAYLOAD, DATA))
+    assert result["success"]
+    assert result["attempts"] == 2
+
+
+def test_does_not_retry_client_errors():
+    exporter = ScriptedHttpExporter([(0, {"success": False, "retryable": False, "status": 400})],
+                                    min_attempt_seconds=0.01)
+    result = asyncio.run(exporter.export(PAYLOAD, DATA))
+    assert not result["success"]
+    assert result["attempts"] == 1
+
+
+def test_no_attempt_starts_after_the_deadline():
+    exporter = ScriptedHttpExporter([(0, {"success": True})])
+    result = asyncio.run(exporter.export(PAYLOAD, DATA, deadline=time.monotonic() - 1))
+    assert not result["success"]
+    assert result["deadline_exceeded"]
+    assert exporter.started == []
+
+
+def test_retries_stop_before_the_backoff_overruns_the_deadline():
+    exporter = ScriptedHttpExporter([(0.05, {"success": False, "retryable": True})], max_retries=100,
+                                    retry_backoff=0.2, min_attempt_seconds=0.1)
+    started = time.monotonic()
+    result = asyncio.run(exporter.export(PAYLOAD, DATA, deadline=started + 1.0))
+    assert not result["success"]
+    assert result["deadline_exceeded"]
+    assert 1 < result["attempts"] < 100
+    assert time.monotonic() - started < 1.0
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+import os
+
+SDK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=SDK_DIR, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def test_import_loads_no_heavy_dependencies():
+    loaded = run_python(
+        "import sys, whispey; "
+        "print(sorted({m.split('.')[0] for m in sys.modules} & {'livekit', 'aiohttp', 'dotenv', 'pyarrow', 'numpy'}))"
+    )
+    assert loaded == "[]"
+
+
+def test_import_has_no_output():
+    assert run_python("import whispey") == ""
+
+
+def test_lazy_attributes_resolve_on_access():
+    assert run_python("import whispey; print(whispey.PIIRedactor.__module__)") == "whispey.redaction"
+    assert run_python("import whispey; print('PhraseTagger' in dir(whispey))") == "True"
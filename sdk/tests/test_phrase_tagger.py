@@ -0,0 +1,47 @@
+import pytest
+
+from whispey.phrase_tagger import HANDOFF_TAG, PhraseTagger, get_default_phrase_tagger
+
+
+def test_default_handoff_phrases_only_tag_agent_messages():
+    tagger = get_default_phrase_tagger()
+    assert tagger.scan("[Handing off to billing]", "assistant") == {HANDOFF_TAG: 1}
+    assert tagger.scan("[Handing off to billing]", "user") == {}
+    assert tagger.scan("", "assistant") == {}
+
+
+def test_counts_every_phrase_of_every_tag_in_one_scan():
+    tagger = PhraseTagger({"escalation": ["manager", "supervisor"], "refund": ["refund", "money back"]})
+    hits = tagger.scan("Get me a Manager, I want my MONEY BACK or a refund from your supervisor", "user")
+    assert hits == {"escalation": 2, "refund": 2}
+
+
+def test_longest_overlapping_phrase_wins():
+    tagger = PhraseTagger({"short": ["cancel"], "long": ["cancel my subscription"]}, include_handoff=False)
+    assert tagger.scan("please cancel my subscription", "user") == {"long": 1}
+    assert tagger.scan("please cancel it", "user") == {"short": 1}
+
+
+def test_phrase_shared_by_tags_counts_for_each():
+    tagger = PhraseTagger({"a": ["lawyer"], "b": ["lawyer"]})
+    assert tagger.scan("my lawyer", "user") == {"a": 1, "b": 1}
+
+
+def test_case_sensitivity_and_whole_words():
+    assert PhraseTagger({"t": ["SSN"]}, case_sensitive=True).scan("my ssn", "user") == {}
+    whole = PhraseTagger({"t": ["cat"]}, whole_word=True)
+    assert whole.scan("concatenate", "user") == {}
+    assert whole.scan("the cat sat", "user") == {"t": 1}
+
+
+def test_phrases_added_later_are_compiled_on_next_scan():
+    tagger = PhraseTagger(include_handoff=False)
+    assert tagger.scan("competitor x is cheaper", "user") == {}
+    tagger.add("competitor", ["competitor x"], roles=("user",))
+    assert tagger.scan("competitor x is cheaper", "user") == {"competitor": 1}
+    assert tagger.scan("competitor x is cheaper", "assistant") == {}
+
+
+def test_unknown_role_rejected():
+    with pytest.raises(ValueError):
+        PhraseTagger().add("t", ["x"], roles=("system",))
@@ -0,0 +1,223 @@
+import asyncio
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+av = pytest.importorskip("av")
+
+from whispey.recorder import CallRecorder, HttpStreamingStore, LocalObjectStore, RecordingStore, RecordingUpload
+
+SAMPLE_RATE = 48000
+FRAME_SAMPLES = 480
+
+
+class Frame:
+    def __init__(self, samples):
+        self.data = samples.astype(np.int16).tobytes()
+
+
+class Tap:
+    def add_consumer(self, consumer):
+        self.consumer = consumer
+
+
+def tone(index):
+    t = np.arange(index * FRAME_SAMPLES, (index + 1) * FRAME_SAMPLES) / SAMPLE_RATE
+    return Frame(np.sin(2 * np.pi * 440 * t) * 8000)
+
+
+class ScriptedUpload(RecordingUpload):
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.blocked = asyncio.Event()
+        self.chunks = []
+        self.aborted = False
+
+    async def write(self, chunk):
+        if self.fail:
+            raise RuntimeError("store unavailable")
+        self.chunks.append(chunk)
+        # Never returns: the store stopped accepting data
+        await self.blocked.wait()
+
+    async def complete(self):
+        return "never"
+
+    async def abort(self):
+        self.aborted = True
+
+
+class ScriptedStore(RecordingStore):
+    def __init__(self, upload):
+        self.upload = upload
+
+    async def open(self, key, content_type):
+        return self.upload
+
+
+def test_records_both_sources_to_a_local_store(tmp_path):
+    async def run():
+        recorder = CallRecorder(LocalObjectStore(str(tmp_path)), "call.ogg", chunk_bytes=4096)
+        recorder.attach_tap(Tap())
+        for index in range(200):
+            recorder.on_audio_frame("user", tone(index))
+            recorder.on_audio_frame("agent", tone(index))
+            await asyncio.sleep(0)
+        return recorder, await recorder.stop()
+
+    recorder, url = asyncio.run(run())
+    path = tmp_path / "call.ogg"
+    assert url == f"file://{path}"
+    assert recorder.error is None
+    # The agent's first frame arrives after the user's was mixed alone, so it runs one frame late
+    assert recorder.samples_recorded == 201 * FRAME_SAMPLES
+    assert not os.path.exists(str(path) + ".part")
+
+    with av.open(str(path)) as container:
+        decoded = sum(frame.samples for frame in container.decode(audio=0))
+    assert abs(decoded - 200 * FRAME_SAMPLES) <= SAMPLE_RATE // 10
+
+
+def test_call_without_audio_uploads_nothing(tmp_path):
+    async def run():
+        recorder = CallRecorder(LocalObjectStore(str(tmp_path)), "silent.ogg")
+        recorder.attach_tap(Tap())
+        return await recorder.stop()
+
+    assert asyncio.run(run()) is None
+    assert not os.listdir(tmp_path)
+
+
+def test_stalled_upload_abandons_recording_instead_of_buffering():
+    upload = ScriptedUpload()
+
+    async def run():
+        recorder = CallRecorder(ScriptedStore(upload), "call.ogg", chunk_bytes=2048, max_buffered_seconds=0)
+        recorder.attach_tap(Tap())
+        index = 0
+        while recorder.error is None and index < 5000:
+            recorder.on_audio_frame("user", tone(index))
+            index += 1
+            await asyncio.sleep(0)
+        recorded = recorder.samples_recorded
+
+        # Nothing is encoded or queued once the recording has failed
+        for extra in range(50):
+            recorder.on_audio_frame("user", tone(index + extra))
+        assert recorder.samples_recorded == recorded
+        assert recorder._chunks.qsize() == 0
+        return recorder, await asyncio.wait_for(recorder.stop(), timeout=5)
+
+    recorder, url = asyncio.run(run())
+    assert url is None
+    assert "fell behind by more than 2 chunks" in recorder.error
+    assert upload.chunks and upload.aborted
+
+
+def test_failed_upload_stops_encoding_and_records_the_error():
+    upload = ScriptedUpload(fail=True)
+
+    async def run():
+        recorder = CallRecorder(ScriptedStore(upload), "call.ogg", chunk_bytes=512)
+        recorder.attach_tap(Tap())
+        index = 0
+        while not recorder._upload_task.done() and index < 5000:
+            recorder.on_audio_frame("user", tone(index))
+            index += 1
+            await asyncio.sleep(0)
+        recorded = recorder.samples_recorded
+
+        recorder.on_audio_frame("user", tone(index))
+        assert recorder.samples_recorded == recorded
+        return recorder, await asyncio.wait_for(recorder.stop(), timeout=5)
+
+    recorder, url = asyncio.run(run())
+    assert url is None
+    assert recorder.error == "store unavailable"
+    assert upload.aborted
+
+
+def _serve(handler):
+    web = pytest.importorskip("aiohttp.web")
+
+    async def start():
+        app = web.Application()
+        app.router.add_post("/upload", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/upload"
+
+    return start
+
+
+def test_http_upload_streams_body_and_returns_url():
+    web = pytest.importorskip("aiohttp.web")
+    received = {}
+
+    async def handler(request):
+        received["key"] = request.headers["X-Recording-Key"]
+        received["body"] = await request.read()
+        return web.json_response({"url": "https://cdn.example.com/call.ogg"})
+
+    async def run():
+        runner, url = await _serve(handler)()
+        try:
+            upload = await HttpStreamingStore(url).open("call.ogg", "audio/ogg")
+            for chunk in (b"one", b"two", b"three"):
+                await upload.write(chunk)
+            return await upload.complete()
+        finally:
+            await runner.cleanup()
+
+    assert asyncio.run(run()) == "https://cdn.example.com/call.ogg"
+    assert received == {"key": "call.ogg", "body": b"onetwothree"}
+
+
+def test_http_upload_is_not_cut_off_but_the_response_wait_is_bounded():
+    web = pytest.importorskip("aiohttp.web")
+
+    async def handler(request):
+        await request.read()
+        await asyncio.sleep(2)
+        return web.json_response({"url": "late"})
+
+    async def run():
+        runner, url = await _serve(handler)()
+        try:
+            store = HttpStreamingStore(url, response_timeout=0.5)
+            upload = await store.open("call.ogg", "audio/ogg")
+            # The body keeps streaming for longer than the response timeout
+            for _ in range(8):
+                await upload.write(b"audio")
+                await asyncio.sleep(0.1)
+            assert not upload.response_task.done()
+            with pytest.raises(asyncio.TimeoutError):
+                await upload.complete()
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(asyncio.wait_for(run(), timeout=10))
+
+
+def test_abort_discards_the_upload_without_waiting():
+    upload = ScriptedUpload()
+
+    async def run():
+        recorder = CallRecorder(ScriptedStore(upload), "call.ogg", chunk_bytes=512)
+        recorder.attach_tap(Tap())
+        while not upload.chunks:
+            recorder.on_audio_frame("user", tone(recorder.samples_recorded // FRAME_SAMPLES))
+            await asyncio.sleep(0)
+        recorder.abort()
+        await asyncio.wait({recorder._upload_task})
+        samples = recorder.samples_recorded
+        recorder.on_audio_frame("user", tone(0))
+        assert recorder.samples_recorded == samples
+        return recorder
+
+    recorder = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert recorder._upload_task.cancelled()
+    assert upload.aborted
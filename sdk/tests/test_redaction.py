@@ -0,0 +1,85 @@
+import pytest
+
+from whispey.redaction import PIIRedactor, luhn_valid, phone_valid
+
+
+@pytest.fixture(scope="module")
+def redactor():
+    return PIIRedactor()
+
+
+def test_luhn():
+    assert luhn_valid("4111 1111 1111 1111")
+    assert luhn_valid("5500-0000-0000-0004")
+    assert not luhn_valid("4111 1111 1111 1112")
+    assert not luhn_valid("411111")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("mail jane.doe@example.com now", "mail [REDACTED_EMAIL] now"),
+    ("card 4111 1111 1111 1111 thanks", "card [REDACTED_CARD] thanks"),
+    ("my social is 123-45-6789", "my social is [REDACTED_SSN]"),
+    ("call +1 (415) 555-2671", "call [REDACTED_PHONE]"),
+    ("call (415) 555-2671 today", "call [REDACTED_PHONE] today"),
+    ("call 415.555.2671", "call [REDACTED_PHONE]"),
+    ("reach me on 98765 43210 please", "reach me on [REDACTED_PHONE] please"),
+    ("ring +44 20 7946 0958", "ring [REDACTED_PHONE]"),
+    ("ring +353 1 234 567", "ring [REDACTED_PHONE]"),
+    # A card followed by its expiry date or CVV
+    ("card 4111 1111 1111 1111 12/25", "card [REDACTED_CARD] 12/25"),
+    ("4111111111111111 12", "[REDACTED_CARD] 12"),
+    ("card 5500-0000-0000-0004 123", "card [REDACTED_CARD] 123"),
+])
+def test_redacts_pii(redactor, text, expected):
+    assert redactor.redact(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "the appointment is on 2024-10-19",
+    "see you 2024-10-19 1030",
+    "the loan is 1500000 rupees",
+    "invoice 1234567 was paid",
+    "order number 12345678",
+    "extension 555-2671",
+    "card 4111 1111 1111 1112 failed",
+    "it costs 1,500,000 dollars",
+    "order 12345678901234567890",
+    "invoice 1234 5678 9012 3456 78",
+])
+def test_leaves_non_pii_numbers_alone(redactor, text):
+    redacted, counts = redactor.redact_with_counts(text)
+    assert redacted == text
+    assert counts == {}
+
+
+def test_phone_valid():
+    assert phone_valid("4155552671")
+    assert phone_valid("+49 30 1234567")
+    assert not phone_valid("12345678")
+    assert not phone_valid("2024-10-19 10:30")
+
+
+def test_counts_per_detector(redactor):
+    text = "email a@b.io or c@d.io, phone 4155552671, card 4111111111111111"
+    redacted, counts = redactor.redact_with_counts(text)
+    assert counts == {"email": 2, "phone": 1, "card": 1}
+    assert "@" not in redacted
+
+
+def test_custom_and_extra_detectors():
+    redactor = PIIRedactor(detectors={"email": r"\S+@\S+"}, extra_detectors={"account": r"ACC-\d{6}"},
+                           replacement="<{name}>")
+    assert redactor.redact("x@y ACC-123456 4155552671") == "<EMAIL> <ACCOUNT> 4155552671"
+
+    with pytest.raises(ValueError):
+        PIIRedactor(detectors={})
+
+
+def test_empty_text(redactor):
+    assert redactor.redact_with_counts("") == ("", {})
+
+
+def test_card_prefix_counts_what_follows_it(redactor):
+    redacted, counts = redactor.redact_with_counts("4111 1111 1111 1111 12/25 and 5500000000000004 123")
+    assert redacted == "[REDACTED_CARD] 12/25 and [REDACTED_CARD] 123"
+    assert counts == {"card": 2}
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from whispey.phrase_tagger import PhraseTagger
+from whispey.reingest import STATE_FILE, main, recompute_derived_metrics, run, run_mode
+
+
+def session(call_id="call-1", agent_response="[Handing off to billing]"):
+    return {
+        "call_id": call_id,
+        "duration_seconds": 125.7,
+        "metadata": {"phrase_tags": {"esc": 3, "handoff": 4}},
+        "transcript_with_metrics": [
+            {"user_transcript": "I want a refund", "agent_response": agent_response,
+             "phrase_tags": {"esc": 3, "handoff": 4}},
+        ],
+    }
+
+
+def write_dumps(directory, count=3):
+    for index in range(count):
+        (directory / f"call-{index}.json").write_text(json.dumps(session(f"call-{index}")))
+
+
+def options(**overrides):
+    defaults = {"send": False, "recompute": True, "hook": None, "output": None, "apikey": None, "api_url": None}
+    defaults.update(overrides)
+    return defaults
+
+
+def test_recompute_keeps_custom_tags_and_rebuilds_handoff():
+    data = recompute_derived_metrics(session())
+    assert data["metadata"]["duration_formatted"] == "2m 5s"
+    assert data["transcript_with_metrics"][0]["phrase_tags"] == {"esc": 3, "handoff": 1}
+    assert data["metadata"]["phrase_tags"] == {"esc": 3, "handoff": 1}
+
+    data = recompute_derived_metrics(session(agent_response="Sure, one moment"))
+    assert data["transcript_with_metrics"][0]["phrase_tags"] == {"esc": 3}
+    assert data["metadata"]["phrase_tags"] == {"esc": 3}
+
+
+def test_recompute_with_rules_replaces_every_tag():
+    tagger = PhraseTagger({"refund": ["refund"]}, include_handoff=False)
+    data = recompute_derived_metrics(session(), tagger)
+    assert data["transcript_with_metrics"][0]["phrase_tags"] == {"refund": 1}
+    assert data["metadata"]["phrase_tags"] == {"refund": 1}
+
+
+def test_mode_key_covers_phrase_rules_and_hook():
+    assert run_mode(options()) == "recompute"
+    assert run_mode(options(send=True, recompute=False)) == "send"
+    with_rules = run_mode(options(phrases={"refund": ["refund"]}))
+    assert with_rules.startswith("recompute;phrases=")
+    assert with_rules != run_mode(options(phrases={"refund": ["refunds"]}))
+    assert with_rules == run_mode(options(phrases={"refund": ["refund"]}))
+    assert run_mode(options(hook="pkg.mod:fix")) == "recompute+hook;hook=pkg.mod:fix"
+
+
+def test_rewrites_to_output_and_leaves_sources_untouched(tmp_path):
+    source, output = tmp_path / "dumps", tmp_path / "out"
+    source.mkdir()
+    write_dumps(source)
+    original = (source / "call-0.json").read_text()
+
+    counts = run(str(source), options(output=str(output)), workers=1)
+    assert counts == {"succeeded": 3, "failed": 0, "skipped": 0}
+    assert (source / "call-0.json").read_text() == original
+    rewritten = json.loads((output / "call-0.json").read_text())
+    assert rewritten["metadata"]["phrase_tags"] == {"esc": 3, "handoff": 1}
+
+
+def test_without_output_or_in_place_nothing_is_rewritten(tmp_path):
+    write_dumps(tmp_path, count=1)
+    original = (tmp_path / "call-0.json").read_text()
+    run(str(tmp_path), options(), workers=1)
+    assert (tmp_path / "call-0.json").read_text() == original
+
+    run(str(tmp_path), options(in_place=True), workers=1, restart=True)
+    assert json.loads((tmp_path / "call-0.json").read_text())["metadata"]["duration_formatted"] == "2m 5s"
+
+
+def test_resume_skips_finished_sessions_and_retries_failures(tmp_path):
+    write_dumps(tmp_path)
+    (tmp_path / "broken.json").write_text("{not json")
+    output = str(tmp_path / "out")
+
+    first = run(str(tmp_path), options(output=output), workers=1)
+    assert first == {"succeeded": 3, "failed": 1, "skipped": 0}
+
+    (tmp_path / "broken.json").write_text(json.dumps(session("broken")))
+    second = run(str(tmp_path), options(output=output), workers=1)
+    assert second == {"succeeded": 1, "failed": 0, "skipped": 3}
+
+    # New phrase rules invalidate the earlier results
+    third = run(str(tmp_path), options(output=output, phrases={"refund": ["refund"]}), workers=1)
+    assert third == {"succeeded": 4, "failed": 0, "skipped": 0}
+
+    entries = [json.loads(line) for line in (tmp_path / STATE_FILE).read_text().splitlines()]
+    assert len(entries) == 9
+
+
+@pytest.mark.parametrize("argv", [
+    ["--recompute", "--no-send"],
+    ["--output", "out"],
+    ["--recompute", "--output", "out", "--in-place"],
+])
+def test_cli_refuses_runs_that_discard_or_misplace_results(tmp_path, argv):
+    with pytest.raises(SystemExit):
+        main([str(tmp_path)] + argv)
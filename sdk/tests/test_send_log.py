@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+web = pytest.importorskip("aiohttp.web")
+
+from whispey.send_log import post_payload, request_timeouts
+
+PAYLOAD = b'{"call_id": "call-1"}'
+
+
+def post_to(handler, timeout=None):
+    async def run():
+        app = web.Application()
+        app.router.add_post("/ingest", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            return await post_payload(PAYLOAD, apikey="key", api_url=f"http://127.0.0.1:{port}/ingest", timeout=timeout)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+def test_success_keeps_non_json_bodies():
+    async def handler(request):
+        assert request.headers["x-pype-token"] == "key"
+        return web.Response(text="accepted")
+
+    assert post_to(handler) == {"success": True, "status": 200, "data": "accepted"}
+
+
+@pytest.mark.parametrize("status, retryable", [(429, True), (503, True), (400, False), (401, False)])
+def test_failures_are_marked_retryable_by_status(status, retryable):
+    async def handler(request):
+        return web.Response(status=status, text="nope")
+
+    result = post_to(handler)
+    assert not result["success"]
+    assert result["status"] == status
+    assert result["retryable"] is retryable
+
+
+def test_timeout_is_retryable():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    result = post_to(handler, timeout=0.2)
+    assert not result["success"]
+    assert result["retryable"]
+    assert "timed out" in result["error"]
+
+
+def test_connection_errors_are_retryable():
+    result = asyncio.run(post_payload(PAYLOAD, apikey="key", api_url="http://127.0.0.1:9/ingest", timeout=2))
+    assert not result["success"]
+    assert result["retryable"]
+
+
+def test_request_timeouts_fit_the_budget():
+    timeouts = request_timeouts(2.0)
+    assert timeouts["total"] == 2.0
+    assert timeouts["connect"] < 2.0
+    assert request_timeouts(-1)["total"] > 0
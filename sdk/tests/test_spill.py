@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from whispey.send_log import PayloadFile, encode_payload, payload_bytes, post_payload, write_payload
+from whispey.spill import SpillList, StreamedArray
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_spill_round_trip(use_mmap):
+    items = SpillList(4, to_record=lambda item: {"n": item}, from_record=lambda record: record["n"],
+                      use_mmap=use_mmap, name="test")
+    for index in range(25):
+        items.append(index)
+
+    assert len(items) == 25
+    assert items.spilled_count > 0
+    assert os.path.exists(items.spill_path)
+    assert list(items) == list(range(25))
+    # Iterating twice reads the spill file again
+    assert list(items) == list(range(25))
+    assert items[-1] == 24
+    with pytest.raises(IndexError):
+        items[0]
+
+    path = items.spill_path
+    items.close()
+    assert not os.path.exists(path)
+
+
+def test_spill_list_rejects_tiny_budget():
+    with pytest.raises(ValueError):
+        SpillList(2)
+
+
+def test_payload_without_streams_is_bytes():
+    data = {"call_id": "call-1", "turns": [{"n": 1}]}
+    assert encode_payload(data) == json.dumps(data).encode("utf-8")
+
+
+def test_streamed_payload_matches_json_dumps():
+    turns = [{"turn_id": f"turn_{index}", "text": "héllo"} for index in range(50)]
+    data = {"call_id": "call-1", "metadata": {"nested": {"turns": StreamedArray(lambda: iter(turns), len(turns)), 1: "x"}},
+            "empty": StreamedArray(lambda: iter([]), 0), "tail": [1, 2]}
+    expected = {"call_id": "call-1", "metadata": {"nested": {"turns": turns, 1: "x"}}, "empty": [], "tail": [1, 2]}
+
+    payload = encode_payload(data)
+    try:
+        assert isinstance(payload, PayloadFile)
+        assert payload_bytes(payload) == json.dumps(expected).encode("utf-8")
+        assert len(payload) == len(payload_bytes(payload))
+    finally:
+        path = payload.path
+        payload.close()
+    assert not os.path.exists(path)
+
+
+def test_user_text_that_looks_like_a_placeholder_is_kept():
+    data = {"note": "__whispey_stream_0__", "turns": StreamedArray(lambda: iter([{"n": 1}]), 1)}
+    payload = encode_payload(data)
+    assert json.loads(payload_bytes(payload)) == {"note": "__whispey_stream_0__", "turns": [{"n": 1}]}
+    payload.close()
+
+
+def test_unserializable_values_still_raise():
+    with pytest.raises(TypeError):
+        encode_payload({"when": object(), "turns": StreamedArray(lambda: iter([]), 0)})
+
+
+def test_payload_file_copies_and_streams_in_chunks(tmp_path):
+    payload = PayloadFile.from_chunks(["a" * 10, "b" * 10])
+    with open(tmp_path / "copy.json", "wb") as f:
+        write_payload(f, payload)
+    assert (tmp_path / "copy.json").read_bytes() == b"a" * 10 + b"b" * 10
+
+    async def collect():
+        return [chunk async for chunk in payload.stream(chunk_size=8)]
+
+    assert asyncio.run(collect()) == [b"aaaaaaaa", b"aabbbbbb", b"bbbb"]
+    payload.close()
+
+
+def test_payload_file_is_posted_with_content_length():
+    web = pytest.importorskip("aiohttp.web")
+    received = {}
+
+    async def ingest(request):
+        received["length"] = request.headers.get("Content-Length")
+        received["chunked"] = request.headers.get("Transfer-Encoding")
+        received["body"] = await request.read()
+        return web.json_response({"ok": True})
+
+    async def run():
+        app = web.Application()
+        app.router.add_post("/ingest", ingest)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        payload = PayloadFile.from_chunks(['{"turns": [', "1, 2, 3", "]}"])
+        try:
+            return await post_payload(payload, apikey="key", api_url=f"http://127.0.0.1:{port}/ingest")
+        finally:
+            payload.close()
+            await runner.cleanup()
+
+    result = asyncio.run(run())
+    assert result["success"]
+    assert received == {"length": "20", "chunked": None, "body": b'{"turns": [1, 2, 3]}'}
@@ -0,0 +1,75 @@
+import asyncio
+
+from whispey.telemetry import LatencyHistogram, SDKTelemetry, start_stats_reporter
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram([10, 100, 1000])
+    for value in [1, 5, 50, 60, 70, 80, 90, 500, 5000, 9000]:
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 10
+    assert snapshot["min_ms"] == 1 and snapshot["max_ms"] == 9000
+    assert snapshot["avg_ms"] == sum([1, 5, 50, 60, 70, 80, 90, 500, 5000, 9000]) / 10
+    assert snapshot["buckets"] == {"le_10": 2, "le_100": 5, "le_1000": 1, "le_inf": 2}
+    assert snapshot["p50_ms"] == 100
+    # The open-ended bucket reports the largest value seen
+    assert snapshot["p95_ms"] == 9000
+
+
+def test_empty_histogram_has_no_quantiles():
+    snapshot = LatencyHistogram().snapshot()
+    assert snapshot["count"] == 0
+    assert snapshot["avg_ms"] is None and snapshot["p99_ms"] is None
+
+
+def test_bucket_bounds_are_inclusive():
+    histogram = LatencyHistogram([10, 100])
+    histogram.observe(10)
+    histogram.observe(100)
+    assert histogram.counts == [1, 1, 0]
+
+
+def test_counters_histograms_and_reset():
+    stats = SDKTelemetry()
+    stats.incr("exports_attempted")
+    stats.incr("bytes_sent", 512)
+    stats.incr("custom_counter")
+    stats.observe("export_ms", 42)
+    stats.observe("custom_ms", 3)
+
+    snapshot = stats.snapshot()
+    assert snapshot["counters"]["exports_attempted"] == 1
+    assert snapshot["counters"]["bytes_sent"] == 512
+    assert snapshot["counters"]["custom_counter"] == 1
+    assert snapshot["counters"]["exports_failed"] == 0
+    assert snapshot["histograms"]["export_ms"]["count"] == 1
+    assert snapshot["histograms"]["custom_ms"]["max_ms"] == 3
+    assert set(snapshot["sessions"]) == {"in_store", "active", "awaiting_export"}
+
+    # The snapshot is a copy
+    snapshot["counters"]["exports_attempted"] = 99
+    assert stats.counters["exports_attempted"] == 1
+
+    stats.reset()
+    assert stats.snapshot()["counters"]["bytes_sent"] == 0
+    assert "custom_ms" not in stats.histograms
+
+
+def test_stats_reporter_calls_async_hook_and_survives_errors():
+    snapshots = []
+
+    async def hook(snapshot):
+        snapshots.append(snapshot)
+        if len(snapshots) == 1:
+            raise RuntimeError("hook failed")
+
+    async def run():
+        task = start_stats_reporter(interval_seconds=0.01, hook=hook)
+        while len(snapshots) < 3:
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert all("counters" in snapshot for snapshot in snapshots)
@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("livekit.agents")
+
+from whispey import whispey
+from whispey.exporters import MemoryExporter, WhispeyExporter
+
+
+class Session:
+    """Just enough of an AgentSession to register handlers on"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, name):
+        def register(handler):
+            self.handlers.setdefault(name, []).append(handler)
+            return handler
+        return register
+
+
+class HangingExporter(WhispeyExporter):
+    name = "hanging"
+
+    async def export(self, payload, data, deadline=None):
+        await asyncio.sleep(30)
+        return {"success": True}
+
+
+class FailingExporter(WhispeyExporter):
+    name = "failing"
+
+    async def export(self, payload, data, deadline=None):
+        return {"success": False, "error": "ingest down"}
+
+
+@pytest.fixture(autouse=True)
+def empty_store():
+    whispey.cleanup_all_sessions()
+    yield
+    whispey.cleanup_all_sessions()
+
+
+def start_session(**kwargs):
+    return whispey.observe_session(Session(), "agent-1", None, **kwargs)
+
+
+def test_deadline_cuts_off_the_export_and_hands_the_payload_to_the_fallback():
+    session_id = start_session()
+    fallback = MemoryExporter()
+
+    started = time.monotonic()
+    result = asyncio.run(whispey.send_session_to_whispey(session_id, exporter=HangingExporter(), deadline=1.0,
+                                                         fallback=fallback))
+    assert time.monotonic() - started < 1.0 + whispey.FALLBACK_RESERVE_SECONDS
+
+    assert not result["success"]
+    assert result["deadline_exceeded"]
+    assert result["fallback"]["success"]
+    assert fallback.records[0]["call_id"].startswith(session_id)
+    assert session_id not in whispey._session_data_store
+
+
+def test_failed_export_without_fallback_keeps_the_session():
+    session_id = start_session()
+    result = asyncio.run(whispey.send_session_to_whispey(session_id, exporter=FailingExporter()))
+    assert not result["success"]
+    assert "fallback" not in result
+    assert session_id in whispey._session_data_store
+
+
+def test_flush_all_sends_spools_and_skips_running_exports():
+    sent = [start_session() for _ in range(3)]
+    busy = start_session()
+    whispey._session_data_store[busy]['exporting'] = True
+    exporter = MemoryExporter()
+
+    report = asyncio.run(whispey.flush_all(deadline=5.0, exporter=exporter, fallback=MemoryExporter()))
+    assert sorted(report["sent"]) == sorted(sent)
+    assert report["in_progress"] == [busy]
+    assert report["spooled"] == [] and report["dropped"] == []
+    assert len(exporter.payloads) == 3
+    assert list(whispey._session_data_store) == [busy]
+
+
+def test_flush_all_spools_what_misses_the_deadline():
+    session_ids = [start_session() for _ in range(3)]
+    fallback = MemoryExporter()
+
+    started = time.monotonic()
+    report = asyncio.run(whispey.flush_all(deadline=1.0, concurrency=1, exporter=HangingExporter(),
+                                           fallback=fallback))
+    assert time.monotonic() - started < 1.0 + whispey.FALLBACK_RESERVE_SECONDS
+
+    assert sorted(report["spooled"]) == sorted(session_ids)
+    assert report["sent"] == [] and report["dropped"] == []
+    assert len(fallback.payloads) == 3
+    assert not whispey._session_data_store
+
+
+def test_flush_all_drops_sessions_without_a_fallback():
+    session_id = start_session()
+    report = asyncio.run(whispey.flush_all(deadline=1.0, exporter=FailingExporter()))
+    assert report["dropped"] == [session_id]
+
+
+class FakeTap:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeAnalyzer:
+    def session_metrics(self, final=False):
+        return {"final": final}
+
+
+class FakeRecorder:
+    def __init__(self, url=None, hang=False):
+        self.url = url
+        self.hang = hang
+        self.aborted = False
+
+    async def stop(self):
+        if self.hang:
+            await asyncio.sleep(30)
+        return self.url
+
+    def abort(self):
+        self.aborted = True
+
+
+def attach_audio(session_id, recorder):
+    session_info = whispey._session_data_store[session_id]
+    session_info.update(audio_tap=FakeTap(), audio_analyzer=FakeAnalyzer(), recorder=recorder)
+    return session_info['audio_tap']
+
+
+def test_spool_finalizes_the_recording_and_audio_metrics_first():
+    session_id = start_session()
+    tap = attach_audio(session_id, FakeRecorder(url="https://cdn.example.com/call.ogg"))
+    fallback = MemoryExporter()
+
+    result = asyncio.run(whispey.spool_session(session_id, fallback, deadline=2.0))
+    assert result["success"]
+    record = fallback.records[0]
+    assert record["recording_url"] == "https://cdn.example.com/call.ogg"
+    assert record["metadata"]["audio_quality"] == {"final": True}
+    assert tap.closed
+
+
+def test_spool_at_the_deadline_stops_a_stuck_recording():
+    session_id = start_session()
+    recorder = FakeRecorder(hang=True)
+    tap = attach_audio(session_id, recorder)
+    fallback = MemoryExporter()
+
+    async def run():
+        started = time.monotonic()
+        result = await whispey.spool_session(session_id, fallback, deadline=0.4)
+        elapsed = time.monotonic() - started
+        await asyncio.sleep(0)
+        return result, elapsed
+
+    result, elapsed = asyncio.run(run())
+    assert result["success"]
+    assert elapsed < 0.4
+    assert recorder.aborted
+    assert tap.closed
+    assert session_id not in whispey._session_data_store
+
+
+def test_flush_all_spools_with_the_recording_finalized():
+    session_id = start_session()
+    attach_audio(session_id, FakeRecorder(url="https://cdn.example.com/call.ogg"))
+    fallback = MemoryExporter()
+
+    # Less time than the fallback reserve: the session goes straight to the fallback
+    report = asyncio.run(whispey.flush_all(deadline=0.4, exporter=HangingExporter(), fallback=fallback))
+    assert report["spooled"] == [session_id]
+    assert fallback.records[0]["recording_url"] == "https://cdn.example.com/call.ogg"
@@ -3,20 +3,135 @@
 __version__ = "2.1.0"
 __author__ = "Whispey AI Voice Analytics"
 
-from .whispey import observe_session, send_session_to_whispey
+# Importing whispey must stay cheap and side-effect free: LiveKit pays it in every
+# job process. Everything below is resolved on first attribute access (PEP 562),
+# so LiveKit, aiohttp and .env loading only happen once a session is observed or exported.
+_LAZY_ATTRIBUTES = {
+    "observe_session": "whispey.whispey",
+    "send_session_to_whispey": "whispey.whispey",
+    "WhispeyExporter": "whispey.exporters",
+    "HttpExporter": "whispey.exporters",
+    "FileExporter": "whispey.exporters",
+    "DirectoryExporter": "whispey.exporters",
+    "StdoutExporter": "whispey.exporters",
+    "MemoryExporter": "whispey.exporters",
+    "FanOutExporter": "whispey.exporters",
+    "LatencyAnomalyDetector": "whispey.anomaly_detector",
+    "PhraseTagger": "whispey.phrase_tagger",
+    "PIIRedactor": "whispey.redaction",
+}
+
+__all__ = ["LivekitObserve", *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 # Professional wrapper class
 class LivekitObserve:
-    def __init__(self, agent_id="whispey-agent", apikey=None, host_url=None):
+    def __init__(self, agent_id="whispey-agent", apikey=None, host_url=None,
+                 columnar_sink=None, exporter=None, bug_detector=None, phrase_tagger=None,
+                 redactor=None, max_turns_in_memory=None, spill_mmap=False, recording_store=None,
+                 audio_quality=False, telemetry_dir=None, export_deadline=None, fallback_exporter=None,
+                 event_buffer_size=None):
         self.agent_id = agent_id
         self.apikey = apikey
         self.host_url = host_url
-    
+        self.columnar_sink = columnar_sink
+        self.exporter = exporter
+        self.bug_detector = bug_detector
+        self.phrase_tagger = phrase_tagger
+        self.redactor = redactor
+        self.max_turns_in_memory = max_turns_in_memory
+        self.spill_mmap = spill_mmap
+        self.recording_store = recording_store
+        self.audio_quality = audio_quality
+        self.telemetry_dir = telemetry_dir
+        self.export_deadline = export_deadline
+        self.fallback_exporter = fallback_exporter
+        self.event_buffer_size = event_buffer_size
+
     def start_session(self, session, **kwargs):
-        return observe_session(session, self.agent_id, self.host_url, **kwargs)
-    
-    async def export(self, session_id, recording_url=""):
-        return await send_session_to_whispey(session_id, recording_url, apikey=self.apikey, api_url=self.host_url)
-    
+        from whispey.whispey import observe_session
+        return observe_session(
+            session, self.agent_id, self.host_url,
+            bug_detector=self.bug_detector,
+            columnar_sink=self.columnar_sink,
+            phrase_tagger=self.phrase_tagger,
+            redactor=self.redactor,
+            max_turns_in_memory=self.max_turns_in_memory,
+            spill_mmap=self.spill_mmap,
+            recording_store=self.recording_store,
+            audio_quality=self.audio_quality,
+            event_buffer_size=self.event_buffer_size,
+            **kwargs
+        )
+
+    def attach_room(self, session_id, room):
+        """Tap a connected room's audio for the session (alternative to start_session(..., room=room))"""
+        from whispey.whispey import attach_session_room
+        return attach_session_room(session_id, room)
+
+    async def export(self, session_id, recording_url="", save_telemetry_json=False, deadline=None):
+        """
+        Export a finished session
+
+        save_telemetry_json also writes the payload to <telemetry_dir>/<call_id>.json: pass True to use
+        the telemetry_dir given to LivekitObserve (or WHISPEY_TELEMETRY_DIR, default ./whispey_telemetry),
+        or a directory path. deadline (seconds, default: export_deadline) bounds the whole export; what
+        cannot be sent in time goes to the fallback_exporter
+        """
+        from whispey.whispey import send_session_to_whispey
+        return await send_session_to_whispey(session_id, recording_url, apikey=self.apikey, api_url=self.host_url,
+                                             exporter=self.exporter, telemetry_dir=self._telemetry_dir(save_telemetry_json),
+                                             deadline=deadline or self.export_deadline, fallback=self.fallback_exporter)
+
+    def _telemetry_dir(self, save_telemetry_json):
+        if not save_telemetry_json:
+            return None
+        if isinstance(save_telemetry_json, str):
+            return save_telemetry_json
+        from whispey.send_log import get_telemetry_dir
+        return self.telemetry_dir or get_telemetry_dir()
+
+    async def flush_all(self, deadline=30.0, concurrency=8, save_telemetry_json=False):
+        """
+        Export every open or unsent session concurrently within deadline seconds
+
+        Returns the session IDs that were sent, spooled to the fallback_exporter or dropped. The
+        columnar_sink, if any, is flushed too
+        """
+        from whispey.whispey import flush_all
+        return await flush_all(deadline, concurrency, exporter=self.exporter, fallback=self.fallback_exporter,
+                               apikey=self.apikey, api_url=self.host_url,
+                               telemetry_dir=self._telemetry_dir(save_telemetry_json),
+                               columnar_sink=self.columnar_sink)
+
+    def flush_on_shutdown(self, ctx, deadline=30.0, concurrency=8, save_telemetry_json=False):
+        """Flush every session when the LiveKit job shuts down (including worker drains for deploys)"""
+        async def flush_sessions():
+            await self.flush_all(deadline, concurrency, save_telemetry_json)
+
+        ctx.add_shutdown_callback(flush_sessions)
+
+    def stats(self):
+        """Snapshot of the SDK's own export counters, latency histograms and session gauges"""
+        from whispey.telemetry import get_stats
+        return get_stats()
 
-     
\ No newline at end of file
+    def start_stats_reporter(self, interval_seconds=60.0, hook=None):
+        """Log the stats snapshot every interval_seconds, or pass it to hook; returns the asyncio task"""
+        from whispey.telemetry import start_stats_reporter
+        return start_stats_reporter(interval_seconds, hook)
@@ -0,0 +1,195 @@
+# sdk/whispey/anomaly_detector.py
+import math
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Optional, Set
+
+logger = logging.getLogger("anomaly_detector")
+
+# (metrics attribute on the turn, key in that metrics dict) -> baseline name
+TRACKED_LATENCIES = {
+    ("stt_metrics", "duration"): "stt_duration",
+    ("llm_metrics", "ttft"): "llm_ttft",
+    ("tts_metrics", "ttfb"): "tts_ttfb",
+    ("eou_metrics", "end_of_utterance_delay"): "eou_delay",
+}
+
+METRIC_ATTRIBUTES = {
+    "STTMetrics": "stt_metrics",
+    "LLMMetrics": "llm_metrics",
+    "TTSMetrics": "tts_metrics",
+    "EOUMetrics": "eou_metrics",
+}
+
+
+@dataclass
+class EwmaBaseline:
+    """Exponentially weighted mean/variance of one latency, updated in O(1)"""
+    alpha: float
+    mean: float = 0.0
+    variance: float = 0.0
+    count: int = 0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def update(self, value: float):
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        self.count += 1
+
+
+class LatencyAnomalyDetector:
+    """
+    Real-time latency anomaly detector for the ``bug_detector`` hook of observe_session.
+
+    Keeps rolling EWMA baselines per agent and latency (STT duration, LLM TTFT,
+    TTS TTFB, EOU delay) for the lifetime of the worker process, so every
+    session of the same agent shares them. Each metric event costs O(1).
+
+    Flags, while the call is live:
+        - latency_spike: a latency above ``mean + spike_sigma * std`` (and at least
+          ``min_spike_seconds`` above the mean) once ``warmup_samples`` were seen
+        - llm_ttft_stalled: an LLM TTFT above ``llm_stall_seconds``, warmed up or not
+        - missing_stt / missing_tts: a completed turn that never received its
+          STT (user side) or TTS (agent side) metrics
+
+    Flags are appended to ``session_data["bug_flagged_turns"]``, counted per type
+    in ``session_data["bug_reports"]`` and passed to ``on_anomaly`` if given
+    (plain function or coroutine function).
+
+    Args:
+        on_anomaly: Optional callback receiving each flag dict
+        alpha: EWMA smoothing factor (higher reacts faster)
+        spike_sigma: Standard deviations above the mean that count as a spike
+        min_spike_seconds: Minimum absolute distance from the mean for a spike
+        warmup_samples: Samples needed per baseline before spikes are flagged
+        llm_stall_seconds: LLM TTFT treated as stalled regardless of baseline
+    """
+
+    def __init__(self, on_anomaly: Optional[Callable[[Dict[str, Any]], Any]] = None, alpha: float = 0.1,
+                 spike_sigma: float = 3.0, min_spike_seconds: float = 0.25, warmup_samples: int = 10,
+                 llm_stall_seconds: float = 5.0):
+        self.on_anomaly = on_anomaly
+        self.alpha = alpha
+        self.spike_sigma = spike_sigma
+        self.min_spike_seconds = min_spike_seconds
+        self.warmup_samples = warmup_samples
+        self.llm_stall_seconds = llm_stall_seconds
+
+        # agent_id -> baseline name -> EwmaBaseline
+        self.baselines: Dict[str, Dict[str, EwmaBaseline]] = {}
+        # Running async on_anomaly calls; the event loop only keeps weak references to tasks
+        self._callback_tasks: Set[asyncio.Task] = set()
+
+    def _baseline(self, agent_id: str, name: str) -> EwmaBaseline:
+        agent_baselines = self.baselines.setdefault(agent_id, {})
+        baseline = agent_baselines.get(name)
+        if baseline is None:
+            baseline = agent_baselines[name] = EwmaBaseline(alpha=self.alpha)
+        return baseline
+
+    def get_baselines(self, agent_id: str) -> Dict[str, Dict[str, float]]:
+        """Current baselines for an agent, for debugging and dashboards"""
+        return {
+            name: {"mean": baseline.mean, "std": baseline.std, "count": baseline.count}
+            for name, baseline in self.baselines.get(agent_id, {}).items()
+        }
+
+    def _flag(self, session_data: Dict[str, Any], anomaly_type: str, turn, **details):
+        flag = {
+            "type": anomaly_type,
+            "turn_id": turn.turn_id if turn else None,
+            "agent_id": session_data.get("agent_id"),
+            "timestamp": time.time(),
+            **details
+        }
+        session_data.setdefault("bug_flagged_turns", []).append(flag)
+        reports = session_data.setdefault("bug_reports", {})
+        reports[anomaly_type] = reports.get(anomaly_type, 0) + 1
+
+        logger.warning(f"🚨 Anomaly {anomaly_type} on {flag['turn_id']}: {details}")
+
+        if self.on_anomaly:
+            try:
+                result = self.on_anomaly(flag)
+                if asyncio.iscoroutine(result):
+                    task = asyncio.ensure_future(result)
+                    self._callback_tasks.add(task)
+                    task.add_done_callback(self._callback_done)
+            except Exception as e:
+                logger.error(f"❌ on_anomaly callback failed: {e}")
+
+    def _callback_done(self, task: asyncio.Task):
+        self._callback_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ on_anomaly callback failed: {task.exception()}")
+
+    def on_metrics_collected(self, session_data: Dict[str, Any], metrics_obj, turn=None):
+        """
+        Check one metric event against the agent's baseline, then fold it in
+
+        Args:
+            session_data: The session's data dict (flags are recorded here)
+            metrics_obj: LiveKit metrics object from the metrics_collected event
+            turn: ConversationTurn the collector mapped the metric to (None if pending)
+        """
+        attribute = METRIC_ATTRIBUTES.get(type(metrics_obj).__name__)
+        if attribute is None:
+            return
+
+        agent_id = session_data.get("agent_id", "unknown")
+        for (source, key), name in TRACKED_LATENCIES.items():
+            if source != attribute:
+                continue
+
+            value = getattr(metrics_obj, key, None)
+            if value is None or value < 0:
+                continue
+
+            if name == "llm_ttft" and value >= self.llm_stall_seconds:
+                self._flag(session_data, "llm_ttft_stalled", turn, metric=name, value=value,
+                           threshold=self.llm_stall_seconds)
+
+            baseline = self._baseline(agent_id, name)
+            threshold = baseline.mean + max(self.spike_sigma * baseline.std, self.min_spike_seconds)
+            if baseline.count >= self.warmup_samples and value > threshold:
+                self._flag(session_data, "latency_spike", turn, metric=name, value=value,
+                           baseline_mean=baseline.mean, baseline_std=baseline.std, threshold=threshold)
+                # Clamp spikes before folding them in so one outage does not drag the baseline up
+                value = threshold
+
+            baseline.update(value)
+
+    def on_turn_completed(self, session_data: Dict[str, Any], collector):
+        """
+        Check the turn completed before the latest one for missing metrics.
+
+        STT and TTS metrics can land after their turn completes, so a turn is
+        only judged once the next one has completed (or the session finalizes).
+        """
+        if len(collector.turns) >= 2:
+            self._check_missing(session_data, collector.turns[-2])
+
+    def finalize(self, session_data: Dict[str, Any], collector):
+        """Check the last turn of a session that has ended"""
+        if collector.turns:
+            self._check_missing(session_data, collector.turns[-1])
+
+    def _check_missing(self, session_data: Dict[str, Any], turn):
+        if getattr(turn, "anomaly_checked", False):
+            return
+        turn.anomaly_checked = True
+
+        if turn.user_transcript and not turn.stt_metrics:
+            self._flag(session_data, "missing_stt", turn)
+        if turn.agent_response and not turn.tts_metrics:
+            self._flag(session_data, "missing_tts", turn)
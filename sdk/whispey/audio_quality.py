@@ -0,0 +1,300 @@
+# sdk/whispey/audio_quality.py
+import math
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+from whispey.audio_tap import USER_SOURCE, AGENT_SOURCE
+
+logger = logging.getLogger("whispey_audio_quality")
+
+FULL_SCALE = 32768.0
+# Window levels are histogrammed in 1 dB bins from -HISTOGRAM_FLOOR_DB to 0 dBFS
+HISTOGRAM_FLOOR_DB = 120
+
+
+def _import_numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError as e:
+        raise ImportError(
+            "AudioQualityAnalyzer requires NumPy. Install it with: pip install 'whispey[audio]'"
+        ) from e
+
+
+class _LevelStats:
+    """Running level statistics of one source over one scope (a turn or the whole session)"""
+
+    def __init__(self, np):
+        self.samples = 0
+        self.sum_squares = 0.0
+        self.clipped = 0
+        self.windows = 0
+        self.active_windows = 0
+        self.histogram = np.zeros(HISTOGRAM_FLOOR_DB + 1, dtype=np.int64)
+
+    def add(self, samples: int, sum_squares: float, clipped: int, windows: int, active_windows: int, histogram):
+        self.samples += samples
+        self.sum_squares += sum_squares
+        self.clipped += clipped
+        self.windows += windows
+        self.active_windows += active_windows
+        self.histogram += histogram
+
+    def _level_percentile(self, q: float) -> float:
+        rank = q * self.windows
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank and count:
+                return float(index - HISTOGRAM_FLOOR_DB)
+        return 0.0
+
+    def to_dict(self, sample_rate: int) -> Optional[Dict[str, Any]]:
+        if not self.samples:
+            return None
+
+        mean_square = self.sum_squares / self.samples / (FULL_SCALE * FULL_SCALE)
+        # SNR estimate: loud windows (speech) against quiet windows (noise floor)
+        snr_db = None
+        if self.active_windows and self.active_windows < self.windows:
+            snr_db = self._level_percentile(0.9) - self._level_percentile(0.1)
+
+        return {
+            "duration_seconds": round(self.samples / sample_rate, 3),
+            "rms_dbfs": round(10 * math.log10(mean_square), 2) if mean_square > 0 else -float(HISTOGRAM_FLOOR_DB),
+            "clipping_ratio": round(self.clipped / self.samples, 6),
+            "silence_ratio": round(1 - self.active_windows / self.windows, 4) if self.windows else None,
+            "snr_db": snr_db,
+        }
+
+
+class _Scope:
+    """Level statistics per source plus the user/agent timeline counters of one scope"""
+
+    def __init__(self, np):
+        self.np = np
+        self.sources: Dict[str, _LevelStats] = {}
+        self.windows = 0
+        self.overlap_windows = 0
+        self.dead_air_windows = 0
+
+    def stats(self, source: str) -> _LevelStats:
+        stats = self.sources.get(source)
+        if stats is None:
+            stats = self.sources[source] = _LevelStats(self.np)
+        return stats
+
+    def to_dict(self, sample_rate: int, window_seconds: float) -> Dict[str, Any]:
+        metrics = {source: stats.to_dict(sample_rate) for source, stats in self.sources.items()}
+        metrics.update({
+            "overlap_seconds": round(self.overlap_windows * window_seconds, 3),
+            "overlap_ratio": round(self.overlap_windows / self.windows, 4) if self.windows else None,
+            "dead_air_seconds": round(self.dead_air_windows * window_seconds, 3),
+            "dead_air_ratio": round(self.dead_air_windows / self.windows, 4) if self.windows else None,
+        })
+        return metrics
+
+
+class _SourceState:
+    def __init__(self, np):
+        self.frames: List[Any] = []
+        self.buffered = 0
+        self.carry = np.zeros(0, dtype=np.int16)
+        self.last_frame_at = 0.0
+        # Global index of this source's next window, and its windows not yet matched against the other source
+        self.next_window = 0
+        self.activity = np.zeros(0, dtype=bool)
+        self.activity_start = 0
+
+    @property
+    def activity_end(self) -> int:
+        return self.activity_start + len(self.activity)
+
+
+class AudioQualityAnalyzer:
+    """
+    Computes audio-quality metrics from room audio frames, as a RoomAudioTap consumer.
+
+    Frames are only queued as they arrive; every ``batch_seconds`` of audio the
+    queue is analyzed in one vectorized NumPy pass over fixed ``window_ms``
+    windows, so the per-frame cost stays a buffer view and a list append.
+
+    Per source ("user"/"agent") it reports the RMS level, clipping ratio, share
+    of silent windows and an SNR estimate (90th against 10th percentile of the
+    window levels). Windows of both sources are aligned on the wall clock to
+    measure overlap (both talking) and dead air (neither talking).
+
+    Args:
+        sample_rate: Sample rate of the tapped frames (mono, int16)
+        window_ms: Analysis window length
+        batch_seconds: Audio buffered per source before it is analyzed
+        silence_threshold_dbfs: Windows below this level count as silence
+        clip_level: Absolute sample value counted as clipped
+        max_source_lag_seconds: How far (beyond one batch) a source may fall behind before its missing
+            windows count as silence
+    """
+
+    def __init__(self, sample_rate: int = 48000, window_ms: int = 20, batch_seconds: float = 0.5,
+                 silence_threshold_dbfs: float = -45.0, clip_level: int = 32767,
+                 max_source_lag_seconds: float = 0.2):
+        self.np = _import_numpy()
+        self.sample_rate = sample_rate
+        self.window = int(sample_rate * window_ms / 1000)
+        self.window_seconds = self.window / sample_rate
+        self.batch_samples = int(sample_rate * batch_seconds)
+        self.silence_threshold_dbfs = silence_threshold_dbfs
+        self.clip_level = clip_level
+        # Sources deliver a whole batch at a time, so they may trail each other by a batch plus the lag
+        self.max_lag_windows = int((batch_seconds + max_source_lag_seconds) / self.window_seconds)
+
+        self._sources: Dict[str, _SourceState] = {}
+        self._epoch: Optional[float] = None
+        self._cursor = 0
+        self._session = _Scope(self.np)
+        self._turn = _Scope(self.np)
+
+    def on_audio_frame(self, source: str, frame):
+        now = time.monotonic()
+        if self._epoch is None:
+            self._epoch = now
+
+        state = self._sources.get(source)
+        if state is None:
+            state = self._sources[source] = _SourceState(self.np)
+
+        samples = self.np.frombuffer(frame.data, dtype=self.np.int16)
+        state.frames.append(samples)
+        state.buffered += len(samples)
+        state.last_frame_at = now
+
+        if state.buffered >= self.batch_samples:
+            self._process(source, state)
+            self._resolve()
+
+    def _process(self, source: str, state: _SourceState):
+        np = self.np
+        if not state.frames:
+            return
+
+        samples = np.concatenate([state.carry] + state.frames)
+        state.frames = []
+        state.buffered = 0
+
+        count = len(samples) // self.window
+        state.carry = samples[count * self.window:].copy()
+        if not count:
+            return
+
+        body = samples[:count * self.window]
+        windows = body.reshape(count, self.window).astype(np.float32)
+        energies = np.einsum("ij,ij->i", windows, windows)
+        levels = 10 * np.log10(energies / (self.window * FULL_SCALE * FULL_SCALE) + 1e-12)
+        active = levels > self.silence_threshold_dbfs
+
+        sum_squares = float(energies.sum(dtype=np.float64))
+        clipped = int(np.count_nonzero((body >= self.clip_level) | (body <= -self.clip_level)))
+        active_windows = int(np.count_nonzero(active))
+        bins = np.clip(levels.astype(np.int64) + HISTOGRAM_FLOOR_DB, 0, HISTOGRAM_FLOOR_DB)
+        histogram = np.bincount(bins, minlength=HISTOGRAM_FLOOR_DB + 1)
+
+        for scope in (self._session, self._turn):
+            scope.stats(source).add(len(body), sum_squares, clipped, count, active_windows, histogram)
+
+        self._place(state, active)
+
+    def _place(self, state: _SourceState, active):
+        np = self.np
+        count = len(active)
+
+        # A source that paused (e.g. the agent between replies) resumes at its wall-clock position
+        latest_window = int((state.last_frame_at - self._epoch) / self.window_seconds)
+        if state.next_window + count < latest_window - self.max_lag_windows:
+            state.next_window = latest_window - count
+
+        start = state.next_window
+        state.next_window += count
+
+        # Windows already matched against the other source can no longer count
+        if start < state.activity_end:
+            skip = state.activity_end - start
+            active = active[skip:]
+            start = state.activity_end
+        gap = start - state.activity_end
+        parts = [state.activity]
+        if gap:
+            parts.append(np.zeros(gap, dtype=bool))
+        parts.append(active)
+        state.activity = np.concatenate(parts)
+
+    def _resolve(self, force: bool = False):
+        """Match user and agent windows up to where both sources have delivered audio"""
+        np = self.np
+        if not self._sources:
+            return
+
+        ends = [state.activity_end for state in self._sources.values()]
+        latest = max(ends)
+        upto = latest if force else max(min(ends), latest - self.max_lag_windows)
+        if upto <= self._cursor:
+            return
+
+        length = upto - self._cursor
+        timelines = {}
+        for source, state in self._sources.items():
+            timeline = np.zeros(length, dtype=bool)
+            low = max(self._cursor, state.activity_start)
+            high = min(upto, state.activity_end)
+            if high > low:
+                timeline[low - self._cursor:high - self._cursor] = state.activity[low - state.activity_start:high - state.activity_start]
+            if state.activity_end > upto:
+                state.activity = state.activity[max(0, upto - state.activity_start):]
+                state.activity_start = max(state.activity_start, upto)
+            else:
+                state.activity = state.activity[:0]
+                state.activity_start = upto
+            timelines[source] = timeline
+
+        silent = np.zeros(length, dtype=bool)
+        user = timelines.get(USER_SOURCE, silent)
+        agent = timelines.get(AGENT_SOURCE, silent)
+        overlap = int(np.count_nonzero(user & agent))
+        dead_air = length - int(np.count_nonzero(user | agent))
+
+        for scope in (self._session, self._turn):
+            scope.windows += length
+            scope.overlap_windows += overlap
+            scope.dead_air_windows += dead_air
+        self._cursor = upto
+
+    def flush(self, final: bool = False):
+        """Analyze buffered audio now; final also settles windows still waiting for the other source"""
+        for source, state in self._sources.items():
+            self._process(source, state)
+        self._resolve(force=final)
+
+    def close_turn(self) -> Dict[str, Any]:
+        """
+        Metrics of the audio since the previous turn was closed
+
+        Returns:
+            dict: Per-source levels plus overlap and dead air for the turn
+        """
+        self.flush()
+        metrics = self._turn.to_dict(self.sample_rate, self.window_seconds)
+        self._turn = _Scope(self.np)
+        return metrics
+
+    def session_metrics(self, final: bool = False) -> Dict[str, Any]:
+        """
+        Metrics of the audio analyzed so far in the session
+
+        Args:
+            final: Set once the tap is closed, so the tail of the call is fully counted
+
+        Returns:
+            dict: Per-source levels plus overlap and dead air for the session
+        """
+        self.flush(final)
+        return self._session.to_dict(self.sample_rate, self.window_seconds)
@@ -0,0 +1,105 @@
+# sdk/whispey/audio_tap.py
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger("whispey_audio_tap")
+
+USER_SOURCE = "user"
+AGENT_SOURCE = "agent"
+
+
+class RoomAudioTap:
+    """
+    Taps the audio tracks of a LiveKit room and fans the frames out to consumers.
+
+    Remote audio tracks are tagged as the "user" source and the agent's own
+    published audio tracks as the "agent" source. Every frame is resampled by
+    LiveKit to ``sample_rate``/``num_channels`` so consumers can mix and
+    compare sources directly.
+
+    Consumers implement ``on_audio_frame(source, frame)``; it is called from
+    the event loop for every frame and must stay cheap.
+
+    Args:
+        room: Connected ``livekit.rtc.Room``
+        sample_rate: Sample rate of the delivered frames
+        num_channels: Channel count of the delivered frames
+    """
+
+    def __init__(self, room, sample_rate: int = 48000, num_channels: int = 1):
+        self.room = room
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.consumers: List[Any] = []
+
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, Any] = {}
+        self._started = False
+
+    def add_consumer(self, consumer):
+        self.consumers.append(consumer)
+
+    def start(self):
+        """Tap the audio tracks already in the room and any published later"""
+        if self._started:
+            return
+        self._started = True
+
+        from livekit import rtc
+
+        def is_audio(track) -> bool:
+            return track is not None and track.kind == rtc.TrackKind.KIND_AUDIO
+
+        @self.room.on("track_subscribed")
+        def on_track_subscribed(track, publication, participant):
+            if is_audio(track):
+                self._tap(track, USER_SOURCE)
+
+        @self.room.on("local_track_published")
+        def on_local_track_published(publication, track):
+            if is_audio(track):
+                self._tap(track, AGENT_SOURCE)
+
+        for participant in self.room.remote_participants.values():
+            for publication in participant.track_publications.values():
+                if is_audio(publication.track):
+                    self._tap(publication.track, USER_SOURCE)
+        for publication in self.room.local_participant.track_publications.values():
+            if is_audio(publication.track):
+                self._tap(publication.track, AGENT_SOURCE)
+
+    def _tap(self, track, source: str):
+        if track.sid in self._tasks:
+            return
+
+        from livekit import rtc
+        stream = rtc.AudioStream(track, sample_rate=self.sample_rate, num_channels=self.num_channels)
+        self._streams[track.sid] = stream
+        self._tasks[track.sid] = asyncio.ensure_future(self._pump(stream, source, track.sid))
+        logger.info(f"🎧 Tapping {source} audio track {track.sid}")
+
+    async def _pump(self, stream, source: str, track_sid: str):
+        try:
+            async for event in stream:
+                for consumer in self.consumers:
+                    try:
+                        consumer.on_audio_frame(source, event.frame)
+                    except Exception as e:
+                        logger.error(f"❌ Audio consumer {type(consumer).__name__} failed: {e}")
+        except asyncio.CancelledError:
+            pass
+        finally:
+            logger.info(f"🎧 Stopped tapping {source} audio track {track_sid}")
+
+    async def aclose(self):
+        """Stop every tapped stream"""
+        for task in self._tasks.values():
+            task.cancel()
+        for stream in self._streams.values():
+            try:
+                await stream.aclose()
+            except Exception:
+                pass
+        self._tasks.clear()
+        self._streams.clear()
@@ -0,0 +1,328 @@
+# sdk/whispey/columnar_sink.py
+import os
+import time
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger("columnar_sink")
+
+# Typed metric columns flattened out of each ConversationTurn
+# (column name, metrics attribute on the turn, key inside that metrics dict, arrow type)
+TURN_METRIC_COLUMNS = [
+    ("stt_audio_duration", "stt_metrics", "audio_duration", "float64"),
+    ("stt_duration", "stt_metrics", "duration", "float64"),
+    ("stt_request_id", "stt_metrics", "request_id", "string"),
+    ("llm_prompt_tokens", "llm_metrics", "prompt_tokens", "int64"),
+    ("llm_completion_tokens", "llm_metrics", "completion_tokens", "int64"),
+    ("llm_ttft", "llm_metrics", "ttft", "float64"),
+    ("llm_tokens_per_second", "llm_metrics", "tokens_per_second", "float64"),
+    ("llm_request_id", "llm_metrics", "request_id", "string"),
+    ("tts_characters_count", "tts_metrics", "characters_count", "int64"),
+    ("tts_audio_duration", "tts_metrics", "audio_duration", "float64"),
+    ("tts_ttfb", "tts_metrics", "ttfb", "float64"),
+    ("tts_request_id", "tts_metrics", "request_id", "string"),
+    ("eou_end_of_utterance_delay", "eou_metrics", "end_of_utterance_delay", "float64"),
+    ("eou_transcription_delay", "eou_metrics", "transcription_delay", "float64"),
+]
+
+SESSION_USAGE_COLUMNS = [
+    ("llm_prompt_tokens", "int64"),
+    ("llm_completion_tokens", "int64"),
+    ("llm_cached_tokens", "int64"),
+    ("tts_characters", "int64"),
+    ("stt_audio_duration", "float64"),
+]
+
+SUPPORTED_FORMATS = ("parquet", "arrow")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "ColumnarSink requires pyarrow. Install it with: pip install 'whispey[columnar]'"
+        ) from e
+
+
+def _to_epoch(value) -> Optional[float]:
+    """Normalise the timestamp flavours found in whispey data to epoch seconds"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+class _RotatingTableWriter:
+    """
+    Writes one table into size/time rotated files.
+
+    Rows are buffered and written as one row group (record batch for Arrow IPC)
+    once ``row_group_rows`` rows or about ``row_group_bytes`` bytes have built up,
+    or when the file is rotated, so a session never becomes its own tiny row group.
+    Not thread-safe: ColumnarSink serializes access.
+    """
+
+    def __init__(self, pa, directory: str, table_name: str, schema, file_format: str,
+                 compression: str, max_file_bytes: int, max_file_seconds: float,
+                 row_group_rows: int, row_group_bytes: int):
+        self.pa = pa
+        self.directory = directory
+        self.table_name = table_name
+        self.schema = schema
+        self.file_format = file_format
+        self.compression = compression
+        self.max_file_bytes = max_file_bytes
+        self.max_file_seconds = max_file_seconds
+        self.row_group_rows = row_group_rows
+        self.row_group_bytes = row_group_bytes
+
+        self.part_counter = 0
+        self.sink = None
+        self.writer = None
+        self.tmp_path = None
+        self.final_path = None
+        # When the first row of the current file arrived (buffered or written); None while empty
+        self.started_at: Optional[float] = None
+
+        self.pending: Dict[str, list] = {name: [] for name in schema.names}
+        self.pending_rows = 0
+        self.pending_bytes = 0
+
+    def _open(self):
+        self.part_counter += 1
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        extension = "parquet" if self.file_format == "parquet" else "arrow"
+        file_name = f"{self.table_name}-{stamp}-{os.getpid()}-{self.part_counter:05d}.{extension}"
+
+        self.final_path = os.path.join(self.directory, file_name)
+        # Readers only ever see complete files: write under a temp name, rename on close
+        self.tmp_path = self.final_path + ".inprogress"
+        self.sink = self.pa.OSFile(self.tmp_path, "wb")
+
+        if self.file_format == "parquet":
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(self.sink, self.schema, compression=self.compression)
+        else:
+            options = self.pa.ipc.IpcWriteOptions(compression=self.compression)
+            self.writer = self.pa.ipc.new_file(self.sink, self.schema, options=options)
+
+        logger.info(f"📂 Opened {self.table_name} file {self.tmp_path}")
+
+    def write(self, columns: Dict[str, list]):
+        rows = len(next(iter(columns.values())))
+        if not rows:
+            return
+        if self.started_at is None:
+            self.started_at = time.time()
+
+        for name, values in columns.items():
+            self.pending[name].extend(values)
+            # Rough in-memory size: string lengths, 8 bytes for everything else
+            self.pending_bytes += sum(len(value) if isinstance(value, str) else 8 for value in values)
+        self.pending_rows += rows
+
+        if self.pending_rows >= self.row_group_rows or self.pending_bytes >= self.row_group_bytes:
+            self._write_row_group()
+            if self.max_file_bytes and self.sink.tell() >= self.max_file_bytes:
+                self.close()
+        if self.expired():
+            self.close()
+
+    def _write_row_group(self):
+        if not self.pending_rows:
+            return
+        if self.writer is None:
+            self._open()
+
+        batch = self.pa.RecordBatch.from_pydict(self.pending, schema=self.schema)
+        if self.file_format == "parquet":
+            self.writer.write_batch(batch)
+        else:
+            self.writer.write(batch)
+
+        self.pending = {name: [] for name in self.schema.names}
+        self.pending_rows = 0
+        self.pending_bytes = 0
+
+    def expired(self) -> bool:
+        """Whether the current file has been collecting rows for max_file_seconds"""
+        return bool(self.max_file_seconds and self.started_at is not None
+                    and time.time() - self.started_at >= self.max_file_seconds)
+
+    def close(self):
+        """Write the buffered rows and finalize the current file"""
+        self._write_row_group()
+        self.started_at = None
+        if self.writer is None:
+            return
+        self.writer.close()
+        self.sink.close()
+        os.replace(self.tmp_path, self.final_path)
+        logger.info(f"📦 Closed {self.table_name} file {self.final_path}")
+
+        self.writer = None
+        self.sink = None
+
+
+class ColumnarSink:
+    """
+    Writes finished sessions to local columnar files: one table of sessions and
+    one table of turns with typed metric columns.
+
+    Rows are buffered in memory and written as one row group once
+    ``row_group_rows`` rows or about ``row_group_bytes`` bytes have built up.
+    Files are rotated once they reach ``max_file_bytes`` or have been collecting
+    rows for ``max_file_seconds``; a background thread rotates idle files too,
+    so nothing stays ``*.inprogress`` on a quiet worker. Columns are built
+    straight from the collector's ConversationTurn objects, without going
+    through the JSON payload.
+
+    Args:
+        directory: Local directory the files are written to (created if missing)
+        file_format: "parquet" (default) or "arrow" (Arrow IPC file)
+        compression: Codec used for the files (default: "zstd")
+        max_file_bytes: Rotate a file once it grows past this size (0 disables)
+        max_file_seconds: Rotate a file once it has been collecting rows this long (0 disables)
+        row_group_rows: Rows buffered per table before a row group is written
+        row_group_bytes: Approximate buffered bytes per table before a row group is written
+    """
+
+    def __init__(self, directory: str, file_format: str = "parquet", compression: str = "zstd",
+                 max_file_bytes: int = 64 * 1024 * 1024, max_file_seconds: float = 3600,
+                 row_group_rows: int = 10000, row_group_bytes: int = 16 * 1024 * 1024):
+        if file_format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported columnar format '{file_format}', expected one of {SUPPORTED_FORMATS}")
+
+        pa = _import_pyarrow()
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.file_format = file_format
+
+        session_fields = [
+            pa.field("session_id", pa.string()),
+            pa.field("call_id", pa.string()),
+            pa.field("agent_id", pa.string()),
+            pa.field("call_ended_reason", pa.string()),
+            pa.field("call_started_at", pa.float64()),
+            pa.field("call_ended_at", pa.float64()),
+            pa.field("duration_seconds", pa.int64()),
+            pa.field("total_turns", pa.int64()),
+        ]
+        session_fields += [pa.field(name, pa.type_for_alias(arrow_type)) for name, arrow_type in SESSION_USAGE_COLUMNS]
+        self.session_schema = pa.schema(session_fields)
+
+        turn_fields = [
+            pa.field("session_id", pa.string()),
+            pa.field("call_id", pa.string()),
+            pa.field("agent_id", pa.string()),
+            pa.field("turn_index", pa.int64()),
+            pa.field("turn_id", pa.string()),
+            pa.field("timestamp", pa.float64()),
+            pa.field("user_transcript", pa.string()),
+            pa.field("agent_response", pa.string()),
+        ]
+        turn_fields += [pa.field(name, pa.type_for_alias(arrow_type)) for name, _, _, arrow_type in TURN_METRIC_COLUMNS]
+        self.turn_schema = pa.schema(turn_fields)
+
+        self._sessions = _RotatingTableWriter(pa, directory, "sessions", self.session_schema, file_format,
+                                              compression, max_file_bytes, max_file_seconds,
+                                              row_group_rows, row_group_bytes)
+        self._turns = _RotatingTableWriter(pa, directory, "turns", self.turn_schema, file_format,
+                                           compression, max_file_bytes, max_file_seconds,
+                                           row_group_rows, row_group_bytes)
+        # Sessions are written from executor threads; the rotation thread runs alongside them
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._rotation_thread = None
+        if max_file_seconds:
+            self._rotation_thread = threading.Thread(
+                target=self._rotate_expired, args=(min(max_file_seconds, 30.0),),
+                name="whispey-columnar-rotation", daemon=True
+            )
+            self._rotation_thread.start()
+
+        # Last resort for files still open at interpreter exit; the shutdown flush (flush_all) normally closes them
+        atexit.register(self.close)
+
+    def write_session(self, session_id: str, whispey_data: Dict[str, Any], turns: List[Any]):
+        """
+        Append one finished session and its turns
+
+        Args:
+            session_id: Session ID from observe_session
+            whispey_data: Final whispey data generated for the session
+            turns: ConversationTurn objects from the session's transcript collector
+        """
+        call_id = whispey_data.get("call_id")
+        agent_id = whispey_data.get("agent_id")
+        usage = whispey_data.get("metadata", {}).get("usage", {})
+
+        session_columns = {
+            "session_id": [session_id],
+            "call_id": [call_id],
+            "agent_id": [agent_id],
+            "call_ended_reason": [whispey_data.get("call_ended_reason")],
+            "call_started_at": [_to_epoch(whispey_data.get("call_started_at"))],
+            "call_ended_at": [_to_epoch(whispey_data.get("call_ended_at"))],
+            "duration_seconds": [whispey_data.get("duration_seconds")],
+            "total_turns": [len(turns)],
+        }
+        for name, _ in SESSION_USAGE_COLUMNS:
+            session_columns[name] = [usage.get(name)]
+
+        turn_columns = {field_name: [] for field_name in self.turn_schema.names}
+        for index, turn in enumerate(turns):
+            turn_columns["session_id"].append(session_id)
+            turn_columns["call_id"].append(call_id)
+            turn_columns["agent_id"].append(agent_id)
+            turn_columns["turn_index"].append(index)
+            turn_columns["turn_id"].append(turn.turn_id)
+            turn_columns["timestamp"].append(turn.timestamp)
+            turn_columns["user_transcript"].append(turn.user_transcript)
+            turn_columns["agent_response"].append(turn.agent_response)
+
+            for name, source, key, _ in TURN_METRIC_COLUMNS:
+                turn_metrics = getattr(turn, source)
+                turn_columns[name].append(turn_metrics.get(key) if turn_metrics else None)
+
+        with self._lock:
+            self._sessions.write(session_columns)
+            if turns:
+                self._turns.write(turn_columns)
+
+        logger.info(f"🧱 Wrote session {session_id} with {len(turns)} turns to columnar sink")
+
+    def _rotate_expired(self, interval: float):
+        while not self._stopped.wait(interval):
+            try:
+                with self._lock:
+                    for table in (self._sessions, self._turns):
+                        if table.expired():
+                            table.close()
+            except Exception as e:
+                logger.error(f"❌ Failed to rotate columnar files: {e}")
+
+    def flush(self):
+        """Write buffered rows and finalize the open files; later sessions start new files"""
+        with self._lock:
+            self._sessions.close()
+            self._turns.close()
+
+    def close(self):
+        """Flush, close any open files and stop the rotation thread"""
+        self._stopped.set()
+        self.flush()
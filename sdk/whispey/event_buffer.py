@@ -0,0 +1,138 @@
+# sdk/whispey/event_buffer.py
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from whispey.telemetry import sdk_stats
+
+logger = logging.getLogger("whispey_event_buffer")
+
+DEFAULT_DRAIN_INTERVAL = 0.05
+DEFAULT_DRAIN_BATCH = 256
+
+
+class EventRingBuffer:
+    """
+    Fixed-capacity FIFO of raw event records.
+
+    Every slot is allocated up front, so a push never allocates or grows the
+    buffer. When the buffer is full the new record is dropped and counted in
+    ``dropped``; records already queued are never overwritten, so the ones
+    that are processed keep their order.
+    """
+
+    __slots__ = ("capacity", "dropped", "_slots", "_read", "_write", "_size")
+
+    def __init__(self, capacity: int = 1024):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.dropped = 0
+        self._slots: List[Any] = [None] * capacity
+        self._read = 0
+        self._write = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, record) -> bool:
+        """Queue a record; returns False (and counts it) if the buffer is full"""
+        if self._size == self.capacity:
+            self.dropped += 1
+            return False
+        write = self._write
+        self._slots[write] = record
+        write += 1
+        self._write = 0 if write == self.capacity else write
+        self._size += 1
+        return True
+
+    def drain(self, max_records: Optional[int] = None) -> List[Any]:
+        """Remove and return up to max_records queued records (all of them by default), oldest first"""
+        count = self._size if max_records is None else min(max_records, self._size)
+        records = []
+        slots = self._slots
+        read = self._read
+        for _ in range(count):
+            records.append(slots[read])
+            # Release the event object right away
+            slots[read] = None
+            read += 1
+            if read == self.capacity:
+                read = 0
+        self._read = read
+        self._size -= count
+        return records
+
+
+class BufferedEventPipeline:
+    """
+    Decouples event handlers from the work they trigger.
+
+    Handlers only ``push((kind, timestamp, event))`` into a per-session
+    EventRingBuffer. A background task drains it every ``drain_interval``
+    seconds, in batches of ``batch_size``, and calls ``processors[kind](event,
+    timestamp)`` for each record. ``drain()`` processes everything queued
+    right away, e.g. before the session data is read.
+
+    Args:
+        processors: Processing function per event kind
+        capacity: Ring buffer slots
+        drain_interval: Seconds between background drains
+        batch_size: Records processed before yielding to the event loop
+    """
+
+    def __init__(self, processors: Dict[str, Callable[[Any, float], Any]], capacity: int = 1024,
+                 drain_interval: float = DEFAULT_DRAIN_INTERVAL, batch_size: int = DEFAULT_DRAIN_BATCH):
+        self.processors = processors
+        self.buffer = EventRingBuffer(capacity)
+        self.push = self.buffer.push
+        self.drain_interval = drain_interval
+        self.batch_size = batch_size
+        self.processed = 0
+        self._reported_dropped = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def dropped(self) -> int:
+        return self.buffer.dropped
+
+    def start(self):
+        """Start the background drain task (needs a running event loop)"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def drain(self, max_records: Optional[int] = None) -> int:
+        """Process queued records now; returns how many were processed"""
+        records = self.buffer.drain(max_records)
+        for kind, timestamp, event in records:
+            try:
+                self.processors[kind](event, timestamp)
+            except Exception as e:
+                logger.error(f"❌ Failed to process buffered {kind} event: {e}")
+        self.processed += len(records)
+
+        dropped = self.buffer.dropped
+        if dropped != self._reported_dropped:
+            logger.warning(f"⚠️ Event buffer full: {dropped - self._reported_dropped} events dropped")
+            sdk_stats.incr("events_dropped", dropped - self._reported_dropped)
+            self._reported_dropped = dropped
+        return len(records)
+
+    async def _run(self):
+        try:
+            while True:
+                await asyncio.sleep(self.drain_interval)
+                # Yield between batches so a burst never holds the event loop for long
+                while self.drain(self.batch_size) == self.batch_size:
+                    await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            pass
+
+    def stop(self):
+        """Process what is left and stop the background task"""
+        self.drain()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -1,9 +1,12 @@
 import time
 import logging
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from livekit.agents import metrics, MetricsCollectedEvent
 from livekit.agents.metrics import STTMetrics, LLMMetrics, TTSMetrics, EOUMetrics
+from whispey.phrase_tagger import HANDOFF_TAG, get_default_phrase_tagger
+from whispey.spill import SpillList, StreamedArray
+from whispey.event_buffer import BufferedEventPipeline
 
 
 logger = logging.getLogger("kannada-tutor")
@@ -21,6 +24,9 @@ class ConversationTurn:
     timestamp: float = field(default_factory=time.time)
     user_turn_complete: bool = False
     agent_turn_complete: bool = False
+    anomaly_checked: bool = False
+    phrase_tags: Dict[str, int] = field(default_factory=dict)
+    audio_metrics: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -31,14 +37,27 @@ class ConversationTurn:
             'llm_metrics': self.llm_metrics,
             'tts_metrics': self.tts_metrics,
             'eou_metrics': self.eou_metrics,
+            'phrase_tags': self.phrase_tags,
+            'audio_metrics': self.audio_metrics,
             'timestamp': self.timestamp
         }
 
+def new_turn_list(max_turns_in_memory: Optional[int] = None, spill_mmap: bool = False):
+    """Plain list, or a SpillList holding at most max_turns_in_memory turns in memory"""
+    if not max_turns_in_memory:
+        return []
+    return SpillList(max_turns_in_memory, to_record=asdict, from_record=lambda record: ConversationTurn(**record),
+                     use_mmap=spill_mmap, name="turns")
+
 class CorrectedTranscriptCollector:
-    """Corrected collector that properly maps STT→user, TTS→agent"""
+    """Corrected collector that properly maps STT→user, TTS→agent
+
+    With max_turns_in_memory set, completed turns beyond that budget are spilled to a
+    temporary file and streamed back at export time (see SpillList)
+    """
     
-    def __init__(self):
-        self.turns: List[ConversationTurn] = []
+    def __init__(self, max_turns_in_memory: Optional[int] = None, spill_mmap: bool = False):
+        self.turns = new_turn_list(max_turns_in_memory, spill_mmap)
         self.session_start_time = time.time()
         self.current_turn: Optional[ConversationTurn] = None
         self.turn_counter = 0
@@ -49,9 +68,19 @@ class CorrectedTranscriptCollector:
             'eou': None
         }
         
-    def on_conversation_item_added(self, event):
-        """Called when conversation item is added to history"""
-        logger.info(f"🔍 CONVERSATION: {event.item.role} - {event.item.text_content[:50]}...")
+    def on_conversation_item_added(self, event, text: Optional[str] = None,
+                                   timestamp: Optional[float] = None) -> Optional[ConversationTurn]:
+        """Called when conversation item is added to history
+
+        text overrides the item's text_content (e.g. after PII redaction), timestamp the time the
+        item was added (when events are processed later). Returns the turn the item belongs to
+        (None for roles other than user/assistant)
+        """
+        if text is None:
+            text = event.item.text_content
+        if timestamp is None:
+            timestamp = time.time()
+        logger.info(f"🔍 CONVERSATION: {event.item.role} - {text[:50]}...")
         
         if event.item.role == "user":
             # User input - start new turn or update existing
@@ -59,10 +88,10 @@ class CorrectedTranscriptCollector:
                 self.turn_counter += 1
                 self.current_turn = ConversationTurn(
                     turn_id=f"turn_{self.turn_counter}",
-                    timestamp=time.time()
+                    timestamp=timestamp
                 )
             
-            self.current_turn.user_transcript = event.item.text_content
+            self.current_turn.user_transcript = text
             self.current_turn.user_turn_complete = True
             
             # Apply pending STT metrics (STT metrics come AFTER user transcript)
@@ -77,7 +106,8 @@ class CorrectedTranscriptCollector:
                 self.pending_metrics['eou'] = None
                 logger.info(f"⏱️ Applied pending EOU metrics to turn {self.current_turn.turn_id}")
                 
-            logger.info(f"👤 User input for turn {self.current_turn.turn_id}: {event.item.text_content[:50]}...")
+            logger.info(f"👤 User input for turn {self.current_turn.turn_id}: {text[:50]}...")
+            return self.current_turn
             
         elif event.item.role == "assistant":
             # Agent response - complete the turn
@@ -86,10 +116,10 @@ class CorrectedTranscriptCollector:
                 self.turn_counter += 1
                 self.current_turn = ConversationTurn(
                     turn_id=f"turn_{self.turn_counter}",
-                    timestamp=time.time()
+                    timestamp=timestamp
                 )
             
-            self.current_turn.agent_response = event.item.text_content
+            self.current_turn.agent_response = text
             self.current_turn.agent_turn_complete = True
             
             # Apply pending LLM metrics
@@ -104,16 +134,24 @@ class CorrectedTranscriptCollector:
                 self.pending_metrics['tts'] = None
                 logger.info(f"🗣️ Applied pending TTS metrics to turn {self.current_turn.turn_id}")
             
-            logger.info(f"🤖 Agent response for turn {self.current_turn.turn_id}: {event.item.text_content[:50]}...")
+            logger.info(f"🤖 Agent response for turn {self.current_turn.turn_id}: {text[:50]}...")
             
             # Turn is complete, add to turns list
-            self.turns.append(self.current_turn)
-            logger.info(f"✅ Completed turn {self.current_turn.turn_id}")
+            completed_turn = self.current_turn
+            self.turns.append(completed_turn)
+            logger.info(f"✅ Completed turn {completed_turn.turn_id}")
             self.current_turn = None
+            return completed_turn
+
+        return None
     
-    def on_metrics_collected(self, metrics_event):
-        """Called when metrics are collected - maps metrics intelligently"""
+    def on_metrics_collected(self, metrics_event) -> Optional[ConversationTurn]:
+        """Called when metrics are collected - maps metrics intelligently
+
+        Returns the turn the metrics were applied to, or None if they were stored as pending
+        """
         metrics_obj = metrics_event.metrics
+        applied_turn = None
         
         logger.info(f"📈 METRICS: {type(metrics_obj).__name__}")
         
@@ -129,11 +167,13 @@ class CorrectedTranscriptCollector:
             # Try to apply to current turn first
             if self.current_turn and self.current_turn.user_transcript and not self.current_turn.stt_metrics:
                 self.current_turn.stt_metrics = stt_data
+                applied_turn = self.current_turn
                 logger.info(f"📊 Applied STT metrics to current turn {self.current_turn.turn_id}")
             
             # Try to apply to last turn if it has user input but no STT
             elif self.turns and self.turns[-1].user_transcript and not self.turns[-1].stt_metrics:
                 self.turns[-1].stt_metrics = stt_data
+                applied_turn = self.turns[-1]
                 logger.info(f"📊 Applied STT metrics to last turn {self.turns[-1].turn_id}")
             
             # Otherwise store as pending
@@ -155,6 +195,7 @@ class CorrectedTranscriptCollector:
             # Apply to current turn or store as pending
             if self.current_turn and not self.current_turn.llm_metrics:
                 self.current_turn.llm_metrics = llm_data
+                applied_turn = self.current_turn
                 logger.info(f"🧠 Applied LLM metrics to current turn {self.current_turn.turn_id}")
             else:
                 self.pending_metrics['llm'] = llm_data
@@ -173,11 +214,13 @@ class CorrectedTranscriptCollector:
             # Try to apply to current turn first
             if self.current_turn and self.current_turn.agent_response and not self.current_turn.tts_metrics:
                 self.current_turn.tts_metrics = tts_data
+                applied_turn = self.current_turn
                 logger.info(f"🗣️ Applied TTS metrics to current turn {self.current_turn.turn_id}")
             
             # Try to apply to last turn if it has agent response but no TTS
             elif self.turns and self.turns[-1].agent_response and not self.turns[-1].tts_metrics:
                 self.turns[-1].tts_metrics = tts_data
+                applied_turn = self.turns[-1]
                 logger.info(f"🗣️ Applied TTS metrics to last turn {self.turns[-1].turn_id}")
             
             # Otherwise store as pending
@@ -196,14 +239,31 @@ class CorrectedTranscriptCollector:
             # Apply to current turn or store as pending
             if self.current_turn and self.current_turn.user_transcript and not self.current_turn.eou_metrics:
                 self.current_turn.eou_metrics = eou_data
+                applied_turn = self.current_turn
                 logger.info(f"⏱️ Applied EOU metrics to current turn {self.current_turn.turn_id}")
             elif self.turns and self.turns[-1].user_transcript and not self.turns[-1].eou_metrics:
                 self.turns[-1].eou_metrics = eou_data
+                applied_turn = self.turns[-1]
                 logger.info(f"⏱️ Applied EOU metrics to last turn {self.turns[-1].turn_id}")
             else:
                 self.pending_metrics['eou'] = eou_data
                 logger.info("⏱️ Stored EOU metrics as pending")
+
+        return applied_turn
     
+    @property
+    def spills_to_disk(self) -> bool:
+        return isinstance(self.turns, SpillList)
+
+    def recent_turns(self) -> List[ConversationTurn]:
+        """Turns still held in memory (all of them unless spilling to disk)"""
+        return self.turns.recent() if self.spills_to_disk else self.turns
+
+    def close(self):
+        """Release the spill file, if any"""
+        if self.spills_to_disk:
+            self.turns.close()
+
     def finalize_session(self):
         """Apply any remaining pending metrics"""
         if self.current_turn:
@@ -212,22 +272,28 @@ class CorrectedTranscriptCollector:
             
         # Apply any remaining pending metrics to the last appropriate turn
         if self.pending_metrics['tts'] and self.turns:
-            for turn in reversed(self.turns):
+            for turn in reversed(self.recent_turns()):
                 if turn.agent_response and not turn.tts_metrics:
                     turn.tts_metrics = self.pending_metrics['tts']
                     logger.info(f"🗣️ Applied final TTS metrics to turn {turn.turn_id}")
                     break
                     
         if self.pending_metrics['stt'] and self.turns:
-            for turn in reversed(self.turns):
+            for turn in reversed(self.recent_turns()):
                 if turn.user_transcript and not turn.stt_metrics:
                     turn.stt_metrics = self.pending_metrics['stt']
                     logger.info(f"📊 Applied final STT metrics to turn {turn.turn_id}")
                     break
     
     def get_turns_array(self) -> List[Dict[str, Any]]:
-        """Get the array of conversation turns with transcripts and metrics"""
+        """Get the array of conversation turns with transcripts and metrics
+
+        When turns spill to disk this is a StreamedArray read back lazily at encode time
+        """
         self.finalize_session()
+        if self.spills_to_disk:
+            turns = self.turns
+            return StreamedArray(lambda: (turn.to_dict() for turn in turns), len(turns))
         return [turn.to_dict() for turn in self.turns]
     
     def get_formatted_transcript(self) -> str:
@@ -268,23 +334,52 @@ class CorrectedTranscriptCollector:
         
         return "\n".join(lines)
 
-def setup_session_event_handlers(session, session_data, usage_collector, userdata):
-    """Setup all session event handlers WITH CORRECTED transcript collector"""
+def setup_session_event_handlers(session, session_data, usage_collector, userdata, bug_detector=None, phrase_tagger=None, redactor=None,
+                                 max_turns_in_memory=None, spill_mmap=False, audio_analyzer=None, event_buffer_size=None):
+    """Setup all session event handlers WITH CORRECTED transcript collector
+
+    bug_detector, if given, is fed every metric event and completed turn while the call is live
+    (see LatencyAnomalyDetector). phrase_tagger (see PhraseTagger) tags every utterance; it
+    defaults to a tagger with only the built-in handoff phrases. redactor (see PIIRedactor)
+    redacts each utterance once, as it enters the collector, so every later view shares the
+    redacted text. max_turns_in_memory bounds the turns and user/agent messages held in memory;
+    older ones spill to disk. audio_analyzer (see AudioQualityAnalyzer) attaches the audio metrics
+    since the previous turn to each completed turn.
+
+    With event_buffer_size set, the handlers only push raw events into a ring buffer of that
+    size and all of the above runs in a background task (see BufferedEventPipeline). The
+    pipeline is returned so callers can drain it before reading the session data.
+    """
+    if phrase_tagger is None:
+        phrase_tagger = get_default_phrase_tagger()
+    session_data.setdefault("phrase_tag_counts", {})
     
     # 🚀 CREATE CORRECTED TRANSCRIPT COLLECTOR
-    transcript_collector = CorrectedTranscriptCollector()
+    transcript_collector = CorrectedTranscriptCollector(max_turns_in_memory, spill_mmap)
+
+    if max_turns_in_memory:
+        for key in ("user_messages", "agent_messages"):
+            messages = SpillList(max_turns_in_memory, use_mmap=spill_mmap, name=key)
+            for message in session_data.get(key, []):
+                messages.append(message)
+            session_data[key] = messages
     
     # 🔧 STORE IT IN SESSION_DATA SO YOU CAN ACCESS IT LATER
     session_data["transcript_collector"] = transcript_collector
     
-    @session.on("metrics_collected")
-    def on_metrics_collected(ev: MetricsCollectedEvent):
+    def process_metrics(ev: MetricsCollectedEvent, timestamp: float):
         # Your existing metrics handling
         usage_collector.collect(ev.metrics)
         metrics.log_metrics(ev.metrics)
         
         # 🎯 ADD CORRECTED TRANSCRIPT MAPPING
-        transcript_collector.on_metrics_collected(ev)
+        applied_turn = transcript_collector.on_metrics_collected(ev)
+
+        if bug_detector:
+            try:
+                bug_detector.on_metrics_collected(session_data, ev.metrics, applied_turn)
+            except Exception as e:
+                logger.error(f"❌ Bug detector failed on metrics: {e}")
         
         if isinstance(ev.metrics, metrics.LLMMetrics):
             logger.info(f"🧠 LLM: {ev.metrics.prompt_tokens} prompt + {ev.metrics.completion_tokens} completion tokens, TTFT: {ev.metrics.ttft:.2f}s")
@@ -295,36 +390,97 @@ def setup_session_event_handlers(session, session_data, usage_collector, userdat
         elif isinstance(ev.metrics, metrics.STTMetrics):
             logger.info(f"🎙️ STT: {ev.metrics.audio_duration:.2f}s audio processed in {ev.metrics.duration:.2f}s")
 
-    @session.on("conversation_item_added")
-    def on_conversation_item_added(event):
+    def process_conversation_item(event, timestamp: float):
         """Track conversation flow for metrics"""
         
+        raw_text = event.item.text_content
+        text = raw_text
+
+        # 🔒 Redact once; the collector and message lists only ever see the redacted text
+        if redactor:
+            text, redactions = redactor.redact_with_counts(raw_text)
+            if redactions:
+                redaction_counts = session_data.setdefault("pii_redactions", {})
+                for name, count in redactions.items():
+                    redaction_counts[name] = redaction_counts.get(name, 0) + count
+
         # 🎯 ADD CORRECTED TRANSCRIPT MAPPING
-        transcript_collector.on_conversation_item_added(event)
+        turn = transcript_collector.on_conversation_item_added(event, text, timestamp)
+
+        # 🏷️ Single pass over the utterance for every registered phrase
+        tag_hits = phrase_tagger.scan(raw_text, event.item.role)
+        if tag_hits:
+            tag_counts = session_data["phrase_tag_counts"]
+            for tag, count in tag_hits.items():
+                tag_counts[tag] = tag_counts.get(tag, 0) + count
+                if turn:
+                    turn.phrase_tags[tag] = turn.phrase_tags.get(tag, 0) + count
+            logger.info(f"🏷️ Tagged {event.item.role} message: {tag_hits}")
         
         # Your existing conversation tracking
         if event.item.role == "user":
-            logger.info(f"👤 User: {event.item.text_content[:50]}...")
+            logger.info(f"👤 User: {text[:50]}...")
             session_data["user_messages"].append({
-                "timestamp": time.time(),
-                "content": event.item.text_content,
+                "timestamp": timestamp,
+                "content": text,
                 "type": "user_input"
             })
         elif event.item.role == "assistant":
-            logger.info(f"🤖 Agent: {event.item.text_content[:50]}...")
+            logger.info(f"🤖 Agent: {text[:50]}...")
             session_data["agent_messages"].append({
-                "timestamp": time.time(), 
-                "content": event.item.text_content,
+                "timestamp": timestamp,
+                "content": text,
                 "type": "agent_response"
             })
             
             # ✅ FIXED: Better handoff detection
-            if any(phrase in event.item.text_content for phrase in [
-                "[Handing off to", "[Handing back to", "handoff_to_", "transfer_to_"
-            ]):
+            if HANDOFF_TAG in tag_hits:
                 session_data["handoffs"] += 1
                 logger.info(f"🔄 Handoff detected - Total: {session_data['handoffs']}")
 
+            if audio_analyzer and turn:
+                try:
+                    turn.audio_metrics = audio_analyzer.close_turn()
+                except Exception as e:
+                    logger.error(f"❌ Audio analyzer failed on turn: {e}")
+
+            if bug_detector:
+                try:
+                    bug_detector.on_turn_completed(session_data, transcript_collector)
+                except Exception as e:
+                    logger.error(f"❌ Bug detector failed on turn: {e}")
+
+    event_pipeline = None
+    if event_buffer_size:
+        event_pipeline = BufferedEventPipeline(
+            {"metrics": process_metrics, "conversation_item": process_conversation_item}, capacity=event_buffer_size
+        )
+        try:
+            event_pipeline.start()
+        except RuntimeError:
+            logger.warning("⚠️ No running event loop, processing session events inline")
+            event_pipeline = None
+
+    if event_pipeline:
+        # 🚀 Hot path: one push per event; the pipeline's background task does the work
+        push = event_pipeline.push
+
+        @session.on("metrics_collected")
+        def on_metrics_collected(ev: MetricsCollectedEvent):
+            push(("metrics", time.time(), ev))
+
+        @session.on("conversation_item_added")
+        def on_conversation_item_added(event):
+            push(("conversation_item", time.time(), event))
+    else:
+        @session.on("metrics_collected")
+        def on_metrics_collected(ev: MetricsCollectedEvent):
+            process_metrics(ev, time.time())
+
+        @session.on("conversation_item_added")
+        def on_conversation_item_added(event):
+            process_conversation_item(event, time.time())
+
     @session.on("close")
     def on_session_close(event):
         """Mark session as completed or failed"""
@@ -338,14 +494,19 @@ def setup_session_event_handlers(session, session_data, usage_collector, userdat
             
         logger.info(f"📊 Session ended - Success: {session_data['call_success']}, Lesson completed: {session_data['lesson_completed']}")
 
+    return event_pipeline
+
 # 🎯 HELPER FUNCTIONS
 def get_session_transcript(session_data) -> Dict[str, Any]:
     """Get transcript data from session"""
     if "transcript_collector" in session_data:
         collector = session_data["transcript_collector"]
+        turns_array = collector.get_turns_array()
+        # The formatted transcript would pull every spilled turn back into one string
+        formatted_transcript = "" if collector.spills_to_disk else collector.get_formatted_transcript()
         return {
-            "turns_array": collector.get_turns_array(),
-            "formatted_transcript": collector.get_formatted_transcript(),
+            "turns_array": turns_array,
+            "formatted_transcript": formatted_transcript,
             "total_turns": len(collector.turns)
         }
     return {"turns_array": [], "formatted_transcript": "", "total_turns": 0}
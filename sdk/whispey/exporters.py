@@ -0,0 +1,321 @@
+# sdk/whispey/exporters.py
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+
+from whispey.send_log import post_payload, write_payload, payload_bytes, DEFAULT_REQUEST_TIMEOUT
+from whispey.telemetry import sdk_stats
+
+logger = logging.getLogger("whispey_exporters")
+
+# Write buffer for local session dumps: large payloads go out in few, big writes
+DEFAULT_WRITE_BUFFER = 1024 * 1024
+
+
+def write_atomic(path: str, payload: bytes, buffer_size: int = DEFAULT_WRITE_BUFFER):
+    """
+    Write payload (bytes or a PayloadFile) to path so readers only ever see the old file or the
+    complete new one
+
+    The bytes go to a temporary file in the same directory, are flushed and fsynced,
+    then renamed over path.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb", buffering=buffer_size) as f:
+            write_payload(f, payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class WhispeyExporter:
+    """
+    Base class for session exporters.
+
+    Exporters receive the payload already encoded by ``encode_payload`` so that
+    a session is serialized once no matter how many sinks it is sent to. The
+    decoded ``data`` dict is passed alongside for exporters that need to look
+    at individual fields; it must be treated as read-only.
+
+    The payload is bytes, or a ``PayloadFile`` for bounded-memory sessions:
+    use ``write_payload`` to copy it or ``payload_bytes`` to load it.
+
+    When the export has a deadline it is passed as ``deadline`` (a
+    ``time.monotonic()`` timestamp); exporters doing network I/O should fit
+    their requests within it. Exporters without the argument still work: it is
+    only passed when set, and the export is cut off at the deadline regardless.
+    """
+
+    name = "exporter"
+
+    async def export(self, payload: bytes, data: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Deliver one encoded session payload
+
+        Args:
+            payload: UTF-8 encoded JSON body (bytes or PayloadFile)
+            data: The whispey data dict the payload was encoded from
+            deadline: time.monotonic() by which the export must be finished, if any
+
+        Returns:
+            dict: Result with at least a "success" key
+        """
+        raise NotImplementedError
+
+
+async def export_with_deadline(exporter: WhispeyExporter, payload: bytes, data: Dict[str, Any],
+                               deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Call exporter.export, passing the deadline only when there is one"""
+    if deadline is None:
+        return await exporter.export(payload, data)
+    return await exporter.export(payload, data, deadline=deadline)
+
+
+class HttpExporter(WhispeyExporter):
+    """
+    Sends payloads to the Whispey API (or a compatible ingest endpoint)
+
+    Every request is bounded by the export deadline (or ``timeout`` without one);
+    connect and read timeouts are derived from the time left. Throttled, failed
+    (5xx) and timed-out requests are retried with jittered exponential backoff,
+    but only while enough of the budget remains for another attempt.
+
+    With ``hedge_after`` set, a second identical request is sent if the first has
+    not answered within that many seconds, and whichever answers first wins. The
+    ingest endpoint must then be idempotent per ``call_id``.
+
+    Args:
+        apikey: API key (default: WHISPEY_API_KEY)
+        api_url: Ingest URL (default: the Whispey API)
+        timeout: Budget in seconds when the export has no deadline
+        max_retries: Retries after the first attempt
+        retry_backoff: Base delay in seconds before the first retry, doubled for each further retry
+        hedge_after: Seconds to wait for an answer before sending a hedged request (default: no hedging)
+        min_attempt_seconds: Least time left for an attempt to be worth starting
+    """
+
+    name = "http"
+
+    def __init__(self, apikey: Optional[str] = None, api_url: Optional[str] = None,
+                 timeout: float = DEFAULT_REQUEST_TIMEOUT, max_retries: int = 2, retry_backoff: float = 0.5,
+                 hedge_after: Optional[float] = None, min_attempt_seconds: float = 0.5):
+        self.apikey = apikey
+        self.api_url = api_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.hedge_after = hedge_after
+        self.min_attempt_seconds = min_attempt_seconds
+
+    def _post(self, payload: bytes, deadline: float):
+        return post_payload(payload, apikey=self.apikey, api_url=self.api_url,
+                            timeout=deadline - time.monotonic())
+
+    async def _attempt(self, payload: bytes, deadline: float) -> Dict[str, Any]:
+        primary = asyncio.ensure_future(self._post(payload, deadline))
+        requests = [primary]
+        try:
+            hedge_at = time.monotonic() + self.hedge_after if self.hedge_after is not None else None
+            if hedge_at is None or deadline - hedge_at < self.min_attempt_seconds:
+                return await primary
+
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+            if done:
+                return primary.result()
+
+            sdk_stats.incr("exports_hedged")
+            logger.info(f"⏱️ No answer after {self.hedge_after}s, sending hedged request")
+            requests.append(asyncio.ensure_future(self._post(payload, deadline)))
+            pending = set(requests)
+            result: Dict[str, Any] = {}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result.get("success"):
+                        return result
+            return result
+        finally:
+            # Also when the caller is cancelled (e.g. at the export deadline): no request outlives the attempt
+            for task in requests:
+                if not task.done():
+                    task.cancel()
+
+    async def export(self, payload: bytes, data: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        if deadline is None:
+            deadline = time.monotonic() + self.timeout
+
+        result: Dict[str, Any] = {"success": False, "error": "Export deadline passed before the first attempt"}
+        attempt = 0
+        while deadline - time.monotonic() >= self.min_attempt_seconds:
+            attempt += 1
+            result = await self._attempt(payload, deadline)
+            result["attempts"] = attempt
+            if result.get("success") or not result.get("retryable") or attempt > self.max_retries:
+                return result
+
+            # Full jitter keeps many agents that failed together from retrying together
+            delay = random.uniform(0, self.retry_backoff * (2 ** (attempt - 1)))
+            if deadline - time.monotonic() - delay < self.min_attempt_seconds:
+                break
+            sdk_stats.incr("exports_retried")
+            logger.info(f"🔁 Retrying export in {delay:.2f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+
+        result["deadline_exceeded"] = True
+        return result
+
+
+class FileExporter(WhispeyExporter):
+    """Appends each payload as one line of a local NDJSON file"""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = asyncio.Lock()
+
+    def _append(self, payload: bytes):
+        with open(self.path, "ab") as f:
+            write_payload(f, payload)
+            f.write(b"\n")
+
+    async def export(self, payload: bytes, data: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        try:
+            # Serialize appends so concurrent exports never interleave lines
+            async with self._lock:
+                await asyncio.get_running_loop().run_in_executor(None, self._append, payload)
+            return {"success": True, "path": self.path, "bytes": len(payload)}
+        except OSError as e:
+            return {"success": False, "error": f"Failed to write {self.path}: {e}"}
+
+
+class DirectoryExporter(WhispeyExporter):
+    """
+    Writes each payload to its own JSON file, ``<directory>/<call_id>.json``
+
+    Files are written atomically, so a crash mid-write never leaves a truncated
+    session behind. The directory can be replayed with ``whispey-reingest``.
+    """
+
+    name = "directory"
+
+    def __init__(self, directory: str, buffer_size: int = DEFAULT_WRITE_BUFFER):
+        self.directory = directory
+        self.buffer_size = buffer_size
+
+    def path_for(self, data: Dict[str, Any]) -> str:
+        call_id = str(data.get("call_id") or "session").replace(os.sep, "_")
+        return os.path.join(self.directory, f"{call_id}.json")
+
+    def _write(self, path: str, payload: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        write_atomic(path, payload, self.buffer_size)
+
+    async def export(self, payload: bytes, data: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        path = self.path_for(data)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._write, path, payload)
+            return {"success": True, "path": path, "bytes": len(payload)}
+        except OSError as e:
+            return {"success": False, "error": f"Failed to write {path}: {e}"}
+
+
+class StdoutExporter(WhispeyExporter):
+    """Writes each payload as one line on stdout (or any text stream)"""
+
+    name = "stdout"
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    async def export(self, payload: bytes, data: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        stream = self.stream or sys.stdout
+        stream.write(payload_bytes(payload).decode("utf-8") + "\n")
+        stream.flush()
+        return {"success": True, "bytes": len(payload)}
+
+
+class MemoryExporter(WhispeyExporter):
+    """Keeps payloads in memory - handy for tests and local debugging"""
+
+    name = "memory"
+
+    def __init__(self):
+        self.payloads: List[bytes] = []
+
+    async def export(self, payload: bytes, data: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        self.payloads.append(payload_bytes(payload))
+        return {"success": True, "bytes": len(payload)}
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """Decoded payloads, in the order they were exported"""
+        return [json.loads(payload) for payload in self.payloads]
+
+    def clear(self):
+        self.payloads.clear()
+
+
+class FanOutExporter(WhispeyExporter):
+    """
+    Delivers one encoded payload to several exporters concurrently.
+
+    Each sink fails independently: an exception or failed result from one sink
+    never prevents delivery to the others. The combined result lists every
+    sink's outcome under "results".
+
+    Args:
+        exporters: Exporters to deliver to
+        require: "all" (default) - succeed only if every sink succeeded,
+            or "any" - succeed if at least one sink succeeded
+    """
+
+    name = "fanout"
+
+    def __init__(self, exporters: List[WhispeyExporter], require: str = "all"):
+        if require not in ("all", "any"):
+            raise ValueError(f"require must be 'all' or 'any', got '{require}'")
+        if not exporters:
+            raise ValueError("FanOutExporter needs at least one exporter")
+        self.exporters = list(exporters)
+        self.require = require
+
+    async def _export_one(self, exporter: WhispeyExporter, payload: bytes, data: Dict[str, Any],
+                          deadline: Optional[float]) -> Dict[str, Any]:
+        try:
+            return await export_with_deadline(exporter, payload, data, deadline)
+        except Exception as e:
+            logger.error(f"❌ Exporter {exporter.name} raised: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def export(self, payload: bytes, data: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        outcomes = await asyncio.gather(
+            *(self._export_one(exporter, payload, data, deadline) for exporter in self.exporters)
+        )
+
+        results = {}
+        for index, (exporter, outcome) in enumerate(zip(self.exporters, outcomes)):
+            results[f"{index}:{exporter.name}"] = outcome
+
+        successes = [outcome.get("success", False) for outcome in outcomes]
+        success = all(successes) if self.require == "all" else any(successes)
+
+        result = {"success": success, "results": results}
+        if not success:
+            failed = [key for key, outcome in results.items() if not outcome.get("success")]
+            result["error"] = f"Export failed for: {', '.join(failed)}"
+        return result
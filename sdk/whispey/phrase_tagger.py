@@ -0,0 +1,167 @@
+# sdk/whispey/phrase_tagger.py
+import re
+import logging
+from typing import Dict, List, Iterable, Optional, Set
+
+logger = logging.getLogger("phrase_tagger")
+
+HANDOFF_TAG = "handoff"
+
+# Phrases the SDK has always treated as agent handoffs
+DEFAULT_HANDOFF_PHRASES = ["[Handing off to", "[Handing back to", "handoff_to_", "transfer_to_"]
+
+ALL_ROLES = ("user", "assistant")
+
+_END = ""
+
+
+def _trie_pattern(node: dict) -> Optional[str]:
+    """
+    Turn a character trie into a regex that factors out shared prefixes.
+
+    Matching at any position then costs at most the length of the longest
+    phrase instead of trying every phrase in turn, and the greedy optional
+    groups make the longest phrase win at a given start position.
+    """
+    if _END in node and len(node) == 1:
+        return None
+
+    alternatives = []
+    single_chars = []
+    for char in sorted(key for key in node if key != _END):
+        sub_pattern = _trie_pattern(node[char])
+        if sub_pattern is None:
+            single_chars.append(re.escape(char))
+        else:
+            alternatives.append(re.escape(char) + sub_pattern)
+
+    only_single_chars = not alternatives
+    if single_chars:
+        alternatives.append(single_chars[0] if len(single_chars) == 1 else "[" + "".join(single_chars) + "]")
+
+    pattern = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    if _END in node:
+        pattern = pattern + "?" if only_single_chars else "(?:" + pattern + ")?"
+    return pattern
+
+
+class PhraseTagger:
+    """
+    Tags transcript utterances by the phrases they contain.
+
+    Register any number of phrases per tag (handoffs, escalations, compliance
+    disclaimers, competitor mentions, ...). For each role the phrases are
+    compiled into a single trie-shaped regex, so an utterance is scanned once
+    regardless of how many phrases are registered. Where phrases overlap, the
+    longest phrase starting at the earliest position wins.
+
+    A "handoff" tag with the SDK's built-in handoff markers is registered for
+    agent messages by default; its hits drive the session's ``handoffs`` count.
+
+    Args:
+        rules: Optional {tag: [phrases]} applied to both roles
+        case_sensitive: Match phrases case-sensitively (default: False)
+        whole_word: Only match phrases not embedded in a larger word (default: False)
+        include_handoff: Register the default handoff phrases (default: True)
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Iterable[str]]] = None, case_sensitive: bool = False,
+                 whole_word: bool = False, include_handoff: bool = True):
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+
+        # role -> normalized phrase -> tags
+        self._phrases: Dict[str, Dict[str, List[str]]] = {role: {} for role in ALL_ROLES}
+        self._compiled: Dict[str, Optional[re.Pattern]] = {}
+
+        if include_handoff:
+            self.add(HANDOFF_TAG, DEFAULT_HANDOFF_PHRASES, roles=("assistant",))
+        for tag, phrases in (rules or {}).items():
+            self.add(tag, phrases)
+
+    @property
+    def tags(self) -> Set[str]:
+        """Every tag this tagger can record"""
+        return {tag for role_phrases in self._phrases.values() for tags in role_phrases.values() for tag in tags}
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def add(self, tag: str, phrases: Iterable[str], roles: Iterable[str] = ALL_ROLES):
+        """
+        Register phrases for a tag
+
+        Args:
+            tag: Tag recorded when any of the phrases is found
+            phrases: Phrases or keywords to look for
+            roles: Message roles to scan ("user", "assistant"); defaults to both
+        """
+        for role in roles:
+            if role not in self._phrases:
+                raise ValueError(f"Unknown role '{role}', expected one of {ALL_ROLES}")
+            role_phrases = self._phrases[role]
+            for phrase in phrases:
+                if not phrase:
+                    continue
+                tags = role_phrases.setdefault(self._normalize(phrase), [])
+                if tag not in tags:
+                    tags.append(tag)
+            # Recompile lazily on the next scan
+            self._compiled.pop(role, None)
+
+    def _compile(self, role: str) -> Optional[re.Pattern]:
+        trie: dict = {}
+        for phrase in self._phrases[role]:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[_END] = {}
+
+        pattern = _trie_pattern(trie) if trie else None
+        if pattern is None:
+            return None
+        if self.whole_word:
+            pattern = r"(?<!\w)" + pattern + r"(?!\w)"
+
+        flags = 0 if self.case_sensitive else re.IGNORECASE
+        compiled = re.compile(pattern, flags)
+        logger.info(f"🏷️ Compiled {len(self._phrases[role])} phrases for {role} messages")
+        return compiled
+
+    def scan(self, text: str, role: str) -> Dict[str, int]:
+        """
+        Scan one utterance
+
+        Args:
+            text: Utterance text
+            role: Message role ("user" or "assistant")
+
+        Returns:
+            dict: {tag: number of hits}, empty if nothing matched
+        """
+        if not text or role not in self._phrases:
+            return {}
+
+        if role not in self._compiled:
+            self._compiled[role] = self._compile(role)
+        matcher = self._compiled[role]
+        if matcher is None:
+            return {}
+
+        role_phrases = self._phrases[role]
+        hits: Dict[str, int] = {}
+        for match in matcher.finditer(text):
+            for tag in role_phrases.get(self._normalize(match.group(0)), ()):
+                hits[tag] = hits.get(tag, 0) + 1
+        return hits
+
+
+_default_tagger: Optional[PhraseTagger] = None
+
+
+def get_default_phrase_tagger() -> PhraseTagger:
+    """Shared tagger with only the default handoff phrases, compiled once per process"""
+    global _default_tagger
+    if _default_tagger is None:
+        _default_tagger = PhraseTagger()
+    return _default_tagger
@@ -0,0 +1,403 @@
+# sdk/whispey/recorder.py
+import os
+import math
+import asyncio
+import logging
+from fractions import Fraction
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("whispey_recorder")
+
+# Longest a source may lag behind the others before it is mixed in as silence (seconds)
+MAX_SOURCE_LAG_SECONDS = 0.2
+
+
+def _import_recording_deps():
+    try:
+        import av
+        import numpy
+        return av, numpy
+    except ImportError as e:
+        raise ImportError(
+            "CallRecorder requires PyAV and NumPy. Install them with: pip install 'whispey[recording]'"
+        ) from e
+
+
+class RecordingUpload:
+    """One in-progress upload, fed chunk by chunk"""
+
+    async def write(self, chunk: bytes):
+        raise NotImplementedError
+
+    async def complete(self) -> str:
+        """Finish the upload and return the recording URL"""
+        raise NotImplementedError
+
+    async def abort(self):
+        raise NotImplementedError
+
+
+class RecordingStore:
+    """Destination for streamed recordings"""
+
+    async def open(self, key: str, content_type: str) -> RecordingUpload:
+        raise NotImplementedError
+
+
+class _LocalUpload(RecordingUpload):
+    def __init__(self, path: str, url: str):
+        self.path = path
+        self.url = url
+        self.tmp_path = path + ".part"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = open(self.tmp_path, "wb")
+
+    async def write(self, chunk: bytes):
+        await asyncio.get_running_loop().run_in_executor(None, self.file.write, chunk)
+
+    async def complete(self) -> str:
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+        return self.url
+
+    async def abort(self):
+        self.file.close()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+class LocalObjectStore(RecordingStore):
+    """
+    Local stand-in for an object store: each recording is streamed to a file.
+
+    Args:
+        directory: Root directory for recordings
+        base_url: Public URL prefix the directory is served under; file:// URLs are returned if omitted
+    """
+
+    def __init__(self, directory: str, base_url: Optional[str] = None):
+        self.directory = directory
+        self.base_url = base_url.rstrip("/") if base_url else None
+
+    async def open(self, key: str, content_type: str) -> RecordingUpload:
+        path = os.path.join(self.directory, key)
+        url = f"{self.base_url}/{key}" if self.base_url else f"file://{os.path.abspath(path)}"
+        return _LocalUpload(path, url)
+
+
+class _HttpStreamingUpload(RecordingUpload):
+    def __init__(self, store: "HttpStreamingStore", key: str, content_type: str):
+        self.store = store
+        # Bounded: if the upload falls behind, the encoder waits instead of buffering the call
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=store.max_pending_chunks)
+        self.response_task = asyncio.ensure_future(self._post(key, content_type))
+
+    async def _body(self):
+        while True:
+            chunk = await self.queue.get()
+            if chunk is None:
+                return
+            yield chunk
+
+    async def _post(self, key: str, content_type: str) -> Dict[str, Any]:
+        import aiohttp
+
+        headers = {"Content-Type": content_type, "X-Recording-Key": key, **self.store.headers}
+        # No total timeout: the body is streamed for as long as the call lasts. Only connecting
+        # and reading are bounded; the read timeout starts once the body has been sent
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.store.connect_timeout,
+                                        sock_read=self.store.response_timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.post(self.store.upload_url, data=self._body(), headers=headers) as response:
+                if response.status >= 400:
+                    raise RuntimeError(f"Recording upload failed ({response.status}): {await response.text()}")
+                return await response.json()
+
+    async def write(self, chunk: bytes):
+        if self.response_task.done():
+            # Surface upload errors to the recorder instead of queueing forever
+            self.response_task.result()
+        await self.queue.put(chunk)
+
+    async def complete(self) -> str:
+        await self.queue.put(None)
+        result = await asyncio.wait_for(self.response_task, self.store.response_timeout)
+        return result[self.store.url_field]
+
+    async def abort(self):
+        self.response_task.cancel()
+
+
+class HttpStreamingStore(RecordingStore):
+    """
+    Streams each recording to an HTTP endpoint in a single chunked POST while the call runs.
+
+    The endpoint receives the encoded audio as the request body (chunked transfer
+    encoding, ``X-Recording-Key`` header with the object key) and must answer with
+    JSON containing the recording URL under ``url_field``.
+
+    Args:
+        upload_url: Endpoint receiving the upload
+        headers: Extra request headers (e.g. authentication)
+        url_field: Response field holding the recording URL (default: "url")
+        max_pending_chunks: Encoded chunks that may wait for the network before the recorder blocks
+        connect_timeout: Seconds allowed for connecting to the endpoint
+        response_timeout: Seconds allowed for the response once the recording has been sent;
+            the upload itself is not time-limited, so recordings can be as long as the call
+    """
+
+    def __init__(self, upload_url: str, headers: Optional[Dict[str, str]] = None, url_field: str = "url",
+                 max_pending_chunks: int = 8, connect_timeout: float = 10.0, response_timeout: float = 60.0):
+        self.upload_url = upload_url
+        self.headers = headers or {}
+        self.url_field = url_field
+        self.max_pending_chunks = max_pending_chunks
+        self.connect_timeout = connect_timeout
+        self.response_timeout = response_timeout
+
+    async def open(self, key: str, content_type: str) -> RecordingUpload:
+        return _HttpStreamingUpload(self, key, content_type)
+
+
+class _ChunkSink:
+    """File-like object PyAV muxes into; hands out complete chunks as they fill up"""
+
+    def __init__(self, chunk_bytes: int):
+        self.chunk_bytes = chunk_bytes
+        self.buffer = bytearray()
+        self.ready = []
+
+    def write(self, data) -> int:
+        self.buffer += data
+        while len(self.buffer) >= self.chunk_bytes:
+            self.ready.append(bytes(self.buffer[:self.chunk_bytes]))
+            del self.buffer[:self.chunk_bytes]
+        return len(data)
+
+    def flush_remaining(self):
+        if self.buffer:
+            self.ready.append(bytes(self.buffer))
+            self.buffer.clear()
+
+    def take(self):
+        chunks, self.ready = self.ready, []
+        return chunks
+
+
+class CallRecorder:
+    """
+    Records a call from room audio frames, encoding Opus/OGG incrementally and
+    streaming it to a RecordingStore while the call is in progress.
+
+    User and agent audio are mixed to mono. Encoded audio leaves memory in
+    ``chunk_bytes`` chunks, so the call is never buffered as a whole. At most
+    ``max_buffered_seconds`` of encoded audio (and never less than two chunks)
+    may wait for the store; if the upload falls further behind, or fails, the
+    recording is abandoned and the reason is kept in ``error``.
+
+    Args:
+        store: Where the recording is streamed to
+        key: Object key / file name of the recording
+        sample_rate: Sample rate of the tapped frames (Opus works at 48000)
+        bitrate: Opus bitrate in bits per second
+        chunk_bytes: Size of the chunks handed to the store
+        max_buffered_seconds: Encoded audio that may wait for the upload before the recording is abandoned
+    """
+
+    content_type = "audio/ogg"
+
+    def __init__(self, store: RecordingStore, key: str, sample_rate: int = 48000, bitrate: int = 32000,
+                 chunk_bytes: int = 256 * 1024, max_buffered_seconds: float = 10.0):
+        self.av, self.np = _import_recording_deps()
+        self.store = store
+        self.key = key
+        self.sample_rate = sample_rate
+        self.bitrate = bitrate
+
+        self.tap = None
+        self._owns_tap = False
+        self.url: Optional[str] = None
+        self.error: Optional[str] = None
+        self.samples_recorded = 0
+
+        self._sink = _ChunkSink(chunk_bytes)
+        self._container = None
+        self._stream = None
+        self._pending: Dict[str, Any] = {}
+        self._max_lag = int(MAX_SOURCE_LAG_SECONDS * sample_rate)
+        self._max_queued_chunks = max(2, math.ceil(max_buffered_seconds * bitrate / 8 / chunk_bytes))
+        self._chunks: Optional[asyncio.Queue] = None
+        self._upload_task: Optional[asyncio.Task] = None
+        self._stopped = False
+
+    def attach(self, room):
+        """Start recording the room's audio"""
+        from whispey.audio_tap import RoomAudioTap
+
+        self.tap = RoomAudioTap(room, sample_rate=self.sample_rate, num_channels=1)
+        self._owns_tap = True
+        self.tap.add_consumer(self)
+        self._start_upload()
+        self.tap.start()
+        logger.info(f"⏺️ Recording room {getattr(room, 'name', '')} to {self.key}")
+
+    def attach_tap(self, tap):
+        """Record from an already running RoomAudioTap shared with other consumers"""
+        self.tap = tap
+        tap.add_consumer(self)
+        self._start_upload()
+
+    def _start_upload(self):
+        self._chunks = asyncio.Queue(maxsize=self._max_queued_chunks)
+        self._upload_task = asyncio.ensure_future(self._upload())
+
+    def _open_encoder(self):
+        self._container = self.av.open(self._sink, mode="w", format="ogg")
+        self._stream = self._container.add_stream("libopus", rate=self.sample_rate)
+        self._stream.bit_rate = self.bitrate
+        self._stream.layout = "mono"
+
+    def on_audio_frame(self, source: str, frame):
+        if self._stopped or not self._upload_ok():
+            return
+        samples = self.np.frombuffer(frame.data, dtype=self.np.int16)
+        pending = self._pending.get(source)
+        self._pending[source] = samples if pending is None else self.np.concatenate((pending, samples))
+        self._mix()
+
+    def _mix(self, flush: bool = False):
+        lengths = [len(samples) for samples in self._pending.values()]
+        if not lengths:
+            return
+
+        longest = max(lengths)
+        # Mix what every source has; a source lagging too far behind counts as silence
+        ready = longest if flush else max(min(lengths), longest - self._max_lag)
+        if ready <= 0:
+            return
+
+        mixed = self.np.zeros(ready, dtype=self.np.int32)
+        for source, samples in self._pending.items():
+            take = min(ready, len(samples))
+            mixed[:take] += samples[:take]
+            self._pending[source] = samples[take:]
+
+        self._encode(self.np.clip(mixed, -32768, 32767).astype(self.np.int16))
+
+    def _encode(self, samples):
+        if self._container is None:
+            self._open_encoder()
+
+        frame = self.av.AudioFrame.from_ndarray(samples.reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = self.sample_rate
+        frame.pts = self.samples_recorded
+        frame.time_base = Fraction(1, self.sample_rate)
+        self.samples_recorded += len(samples)
+
+        for packet in self._stream.encode(frame):
+            self._container.mux(packet)
+        self._queue_chunks()
+
+    def _queue_chunks(self):
+        for chunk in self._sink.take():
+            try:
+                self._chunks.put_nowait(chunk)
+            except asyncio.QueueFull:
+                self._fail(f"upload fell behind by more than {self._max_queued_chunks} chunks")
+                return
+
+    def _upload_ok(self) -> bool:
+        """False once the recording has failed; nothing is encoded or queued after that"""
+        if self.error is not None:
+            return False
+        task = self._upload_task
+        if task is not None and task.done():
+            # The upload only ends on its own after the end marker is queued, so here it failed
+            if task.cancelled():
+                self._fail("upload was cancelled")
+            elif task.exception() is not None:
+                self._fail(str(task.exception()) or type(task.exception()).__name__)
+        return self.error is None
+
+    def _fail(self, message: str):
+        self.error = message
+        logger.error(f"❌ Recording upload failed: {message}")
+        # Drop everything buffered for the upload and stop it
+        self._pending.clear()
+        self._sink.take()
+        self._sink.buffer.clear()
+        while not self._chunks.empty():
+            self._chunks.get_nowait()
+        if not self._upload_task.done():
+            self._upload_task.cancel()
+
+    async def _put(self, item) -> bool:
+        """Queue item for the upload, giving up if the upload ends first"""
+        put = asyncio.ensure_future(self._chunks.put(item))
+        await asyncio.wait({put, self._upload_task}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            return False
+        return True
+
+    async def _upload(self):
+        # Open the upload with the first encoded chunk: a call without audio uploads nothing
+        chunk = await self._chunks.get()
+        if chunk is None:
+            logger.info(f"⏺️ No audio recorded for {self.key}")
+            return
+
+        upload = await self.store.open(self.key, self.content_type)
+        try:
+            while chunk is not None:
+                await upload.write(chunk)
+                chunk = await self._chunks.get()
+            self.url = await upload.complete()
+            logger.info(f"✅ Recording uploaded: {self.url}")
+        except BaseException:
+            await upload.abort()
+            raise
+
+    def abort(self):
+        """Stop recording and discard the upload, without waiting for it"""
+        self._stopped = True
+        if self._upload_task is not None and not self._upload_task.done():
+            self._upload_task.cancel()
+
+    async def stop(self) -> Optional[str]:
+        """
+        Stop recording, flush the encoder and finish the upload
+
+        Returns:
+            str: The recording URL, or None if nothing was recorded or the upload failed
+        """
+        if self._stopped:
+            return self.url
+        self._stopped = True
+
+        if self.tap and self._owns_tap:
+            await self.tap.aclose()
+        if self._upload_task is None:
+            return None
+
+        if self._upload_ok():
+            try:
+                self._mix(flush=True)
+                if self._container is not None:
+                    for packet in self._stream.encode(None):
+                        self._container.mux(packet)
+                    self._container.close()
+                    self._sink.flush_remaining()
+            except Exception as e:
+                logger.error(f"❌ Failed to finalize recording encoder: {e}")
+
+            # The call is over: wait for room in the queue instead of abandoning the tail
+            for chunk in self._sink.take() + [None]:
+                if not await self._put(chunk):
+                    break
+
+        await asyncio.wait({self._upload_task})
+        self._upload_ok()
+        return self.url
@@ -0,0 +1,192 @@
+# sdk/whispey/redaction.py
+import re
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("pii_redaction")
+
+# Built-in detectors, tried in this order at each position of the utterance
+DEFAULT_DETECTORS = {
+    "email": r"(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+    "card": r"(?<!\d)(?:\d[ -]?){12,18}\d(?!\d)",
+    "ssn": r"(?<!\d)\d{3}-\d{2}-\d{4}(?!\d)",
+    "phone": r"(?<![\w+(])\+?\(?\d(?:[\s().-]{0,2}\d){7,14}(?!\d)",
+}
+
+
+# Character class a match must start with. Detectors sharing a guard are grouped behind a
+# single lookahead, so most positions of an utterance are rejected with one check
+DEFAULT_GUARDS = {
+    "card": r"[+\d]",
+    "ssn": r"[+\d]",
+    "phone": r"[+(\d]",
+}
+
+
+def luhn_valid(number: str) -> bool:
+    """Luhn checksum over the digits of a candidate card number"""
+    digits = [int(char) for char in number if char.isdigit()]
+    if len(digits) < 13:
+        return False
+    checksum = 0
+    for index, digit in enumerate(reversed(digits)):
+        if index % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        checksum += digit
+    return checksum % 10 == 0
+
+
+# Dates written like 2024-10-19 (optionally followed by more digits, e.g. a time)
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}(?!\d)")
+
+
+def phone_valid(number: str) -> bool:
+    """
+    Whether a candidate digit run looks like a phone number
+
+    Needs 10 or more digits (area code and subscriber number), or 8 or more after a
+    +country code. Shorter runs are amounts, order or invoice numbers, and ISO dates
+    never count.
+    """
+    if _ISO_DATE.match(number):
+        return False
+    digits = sum(char.isdigit() for char in number)
+    return digits >= 10 or (number.startswith("+") and digits >= 8)
+
+
+DEFAULT_VALIDATORS = {
+    "card": luhn_valid,
+    "phone": phone_valid,
+}
+
+
+class PIIRedactor:
+    """
+    Redacts PII from utterances in a single pass.
+
+    All detectors are compiled into one alternation with a named group per
+    detector, so each utterance is scanned once however many detectors are
+    configured. A detector may have a validator (cards are Luhn-checked). A
+    match that fails validation is cut back to its longest valid prefix ending
+    at a digit-group boundary (a card followed by its expiry date or CVV), then
+    offered to the remaining detectors, before being left untouched.
+
+    Args:
+        detectors: {name: regex} replacing the built-in detectors (email, card, ssn, phone)
+        extra_detectors: {name: regex} added after the detectors
+        validators: {name: callable(matched_text) -> bool}, defaults to Luhn for "card" and
+            phone_valid for "phone"
+        guards: {name: character class} a match of that detector must start with
+            (defaults cover the built-in digit detectors)
+        replacement: Format of the replacement text, ``{name}`` is the upper-cased detector name
+    """
+
+    def __init__(self, detectors: Optional[Dict[str, str]] = None, extra_detectors: Optional[Dict[str, str]] = None,
+                 validators: Optional[Dict[str, Callable[[str], bool]]] = None,
+                 guards: Optional[Dict[str, str]] = None, replacement: str = "[REDACTED_{name}]"):
+        self.detectors = dict(DEFAULT_DETECTORS if detectors is None else detectors)
+        self.detectors.update(extra_detectors or {})
+        if not self.detectors:
+            raise ValueError("PIIRedactor needs at least one detector")
+
+        self.validators = dict(DEFAULT_VALIDATORS if validators is None else validators)
+        self.guards = dict(DEFAULT_GUARDS if guards is None else guards)
+        self.replacement = replacement
+
+        # Detector names are user supplied, so groups get positional names
+        self._names = list(self.detectors)
+        self._group_names = {f"d{index}": name for index, name in enumerate(self._names)}
+        self._pattern = re.compile(self._combined_pattern())
+        self._individual = {name: re.compile(pattern) for name, pattern in self.detectors.items()}
+        self._replacements = {name: replacement.format(name=name.upper()) for name in self._names}
+
+    def _combined_pattern(self) -> str:
+        # Alternatives keep the detector order; guarded ones join the group of their guard
+        alternatives = []
+        guarded_groups: Dict[str, list] = {}
+        for index, name in enumerate(self._names):
+            group = f"(?P<d{index}>{self.detectors[name]})"
+            guard = self.guards.get(name)
+            if guard is None:
+                alternatives.append(group)
+            elif guard in guarded_groups:
+                guarded_groups[guard].append(group)
+            else:
+                guarded_groups[guard] = [group]
+                alternatives.append(guard)
+
+        return "|".join(
+            f"(?={alternative})(?:{'|'.join(guarded_groups[alternative])})" if alternative in guarded_groups
+            else alternative
+            for alternative in alternatives
+        )
+
+    def _valid_prefix(self, name: str, text: str) -> Optional[int]:
+        """Length of the longest prefix of text, cut where a digit group ends, that is a valid match of name"""
+        pattern = self._individual[name]
+        validator = self.validators[name]
+        for end in range(len(text) - 1, 0, -1):
+            if text[end - 1].isdigit() and not text[end].isdigit():
+                prefix = text[:end]
+                if pattern.fullmatch(prefix) and validator(prefix):
+                    return end
+        return None
+
+    def _classify(self, match: "re.Match") -> Optional[Tuple[str, int]]:
+        """Detector name and length of the redacted span, or None to leave the match alone"""
+        name = self._group_names[match.lastgroup]
+        text = match.group(0)
+        validator = self.validators.get(name)
+        if validator is None or validator(text):
+            return name, len(text)
+
+        # The greedy pattern may have swallowed digits that follow, e.g. "4111 1111 1111 1111 12/25"
+        end = self._valid_prefix(name, text)
+        if end is not None:
+            return name, end
+
+        # Failed validation (e.g. a long digit run that is not a card): try the later detectors
+        for other in self._names[self._names.index(name) + 1:]:
+            if self._individual[other].fullmatch(text):
+                other_validator = self.validators.get(other)
+                if other_validator is None or other_validator(text):
+                    return other, len(text)
+        return None
+
+    def redact_with_counts(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """
+        Redact one utterance
+
+        Args:
+            text: Utterance text
+
+        Returns:
+            tuple: (redacted text, {detector name: number of redactions})
+        """
+        if not text:
+            return text, {}
+
+        counts: Dict[str, int] = {}
+
+        def replace(match):
+            classified = self._classify(match)
+            if classified is None:
+                return match.group(0)
+            name, end = classified
+            counts[name] = counts.get(name, 0) + 1
+            text = match.group(0)
+            if end == len(text):
+                return self._replacements[name]
+            # Only a prefix was redacted; the rest may still hold PII of its own
+            rest, rest_counts = self.redact_with_counts(text[end:])
+            for other, count in rest_counts.items():
+                counts[other] = counts.get(other, 0) + count
+            return self._replacements[name] + rest
+
+        return self._pattern.sub(replace, text), counts
+
+    def redact(self, text: str) -> str:
+        """Redact one utterance, returning only the redacted text"""
+        return self.redact_with_counts(text)[0]
@@ -0,0 +1,331 @@
+# sdk/whispey/reingest.py
+"""
+Re-ingest or reprocess session dumps saved with ``export(..., save_telemetry_json=True)``.
+
+Sessions are processed in parallel by a pool of worker processes. Progress is
+reported on stderr, and every finished session is recorded in a state file, so
+an interrupted run picks up where it stopped when started again.
+
+Rewritten dumps are written to --output; they only replace the originals with
+an explicit --in-place. Without either they are sent but not saved.
+
+Usage:
+    whispey-reingest whispey_telemetry                      # send every dump to the Whispey API
+    whispey-reingest whispey_telemetry --recompute          # recompute derived metrics and send
+    whispey-reingest whispey_telemetry --recompute --no-send --output recomputed/
+    whispey-reingest whispey_telemetry --recompute --phrases tags.json --in-place   # {"tag": ["phrase", ...]}
+    whispey-reingest whispey_telemetry --hook mypkg.metrics:recompute --workers 16
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import importlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from whispey.exporters import write_atomic
+from whispey.phrase_tagger import PhraseTagger, get_default_phrase_tagger
+
+STATE_FILE = ".whispey-reingest-state.jsonl"
+
+# Tagger built from --phrases, compiled once per worker process
+_worker_tagger: Optional[PhraseTagger] = None
+
+
+def recompute_derived_metrics(data: Dict[str, Any], phrase_tagger=None) -> Dict[str, Any]:
+    """
+    Recompute the metrics the SDK derives from a session's raw data
+
+    Rebuilds duration_formatted, the per-turn phrase_tags and metadata.phrase_tags.
+    Turns are re-tagged from the exported text, so with PII redaction enabled
+    phrases inside redacted spans are no longer found.
+
+    With a phrase_tagger, its rules replace every recorded tag. Without one only
+    the built-in handoff tag is rebuilt; custom tags recorded by the agent are
+    kept as they are.
+
+    Args:
+        data: A saved whispey payload; updated in place
+        phrase_tagger: PhraseTagger to tag turns with (default: the built-in handoff tagger)
+
+    Returns:
+        dict: The same payload
+    """
+    # Tags the tagger does not own were recorded with rules we do not have; keep them
+    owned = None
+    if phrase_tagger is None:
+        phrase_tagger = get_default_phrase_tagger()
+        owned = phrase_tagger.tags
+    metadata = data.setdefault("metadata", {})
+
+    duration = data.get("duration_seconds")
+    if isinstance(duration, (int, float)):
+        duration = int(duration)
+        metadata["duration_formatted"] = f"{duration // 60}m {duration % 60}s"
+
+    tag_counts: Dict[str, int] = {}
+    if owned is not None:
+        tag_counts = {tag: count for tag, count in (metadata.get("phrase_tags") or {}).items() if tag not in owned}
+    for turn in data.get("transcript_with_metrics") or []:
+        turn_tags: Dict[str, int] = {}
+        if owned is not None:
+            turn_tags = {tag: count for tag, count in (turn.get("phrase_tags") or {}).items() if tag not in owned}
+        for role, key in (("user", "user_transcript"), ("assistant", "agent_response")):
+            for tag, count in phrase_tagger.scan(turn.get(key) or "", role).items():
+                turn_tags[tag] = turn_tags.get(tag, 0) + count
+                tag_counts[tag] = tag_counts.get(tag, 0) + count
+        turn["phrase_tags"] = turn_tags
+
+    if tag_counts:
+        metadata["phrase_tags"] = tag_counts
+    else:
+        metadata.pop("phrase_tags", None)
+    return data
+
+
+def load_hook(spec: str) -> Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Resolve a "module:function" hook that receives each payload and returns it (or None to keep it)"""
+    module_name, _, attribute = spec.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Hook must look like 'module:function', got '{spec}'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _init_worker(quiet: bool, phrases: Optional[Dict[str, List[str]]]):
+    global _worker_tagger
+    if phrases:
+        _worker_tagger = PhraseTagger(phrases)
+    # post_payload reports every request on stdout; keep the progress line readable
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+
+
+def process_file(path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reprocess one saved session (runs in a worker process)
+
+    Returns:
+        dict: {"file", "success"} plus "error" on failure
+    """
+    name = os.path.basename(path)
+    try:
+        with open(path, "rb") as f:
+            payload = f.read()
+
+        if options["recompute"] or options["hook"]:
+            data = json.loads(payload)
+            if options["recompute"]:
+                recompute_derived_metrics(data, _worker_tagger)
+            if options["hook"]:
+                data = load_hook(options["hook"])(data) or data
+            payload = json.dumps(data).encode("utf-8")
+            # The source dump is only replaced when asked to
+            output_dir = options.get("output") or (os.path.dirname(path) if options.get("in_place") else None)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+                write_atomic(os.path.join(output_dir, name), payload)
+
+        if options["send"]:
+            from whispey.send_log import post_payload
+            result = asyncio.run(post_payload(payload, apikey=options["apikey"], api_url=options["api_url"]))
+            if not result.get("success"):
+                return {"file": name, "success": False, "error": str(result.get("error"))[:500]}
+
+        return {"file": name, "success": True}
+    except Exception as e:
+        return {"file": name, "success": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def run_mode(options: Dict[str, Any]) -> str:
+    """
+    Key identifying what a run does to each dump, recorded in the resume state
+
+    A run with other phrase rules or another hook reprocesses every dump instead
+    of skipping the ones finished under the old settings.
+    """
+    mode = "+".join(step for step in ("recompute", "hook", "send") if options.get(step)) or "noop"
+    if options.get("recompute") and options.get("phrases"):
+        rules = json.dumps(options["phrases"], sort_keys=True).encode("utf-8")
+        mode += f";phrases={hashlib.sha256(rules).hexdigest()[:16]}"
+    if options.get("hook"):
+        mode += f";hook={options['hook']}"
+    return mode
+
+
+def read_state(state_path: str, mode: str) -> set:
+    """Names of the files already processed successfully in this mode"""
+    done = set()
+    if not os.path.exists(state_path):
+        return done
+    with open(state_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted run
+                continue
+            if entry.get("mode") == mode and entry.get("success"):
+                done.add(entry["file"])
+    return done
+
+
+class Progress:
+    """Throttled progress line on stderr"""
+
+    def __init__(self, total: int, skipped: int, interval: float = 1.0):
+        self.total = total
+        self.skipped = skipped
+        self.interval = interval
+        self.succeeded = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.last_report = 0.0
+
+    def update(self, success: bool):
+        if success:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        now = time.monotonic()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report()
+
+    def report(self, final: bool = False):
+        done = self.succeeded + self.failed
+        elapsed = time.monotonic() - self.started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - done) / rate if rate else 0.0
+        percent = done / self.total * 100 if self.total else 100.0
+        line = (f"[{done}/{self.total}] {percent:5.1f}%  ok={self.succeeded} failed={self.failed} "
+                f"skipped={self.skipped}  {rate:.1f}/s  eta {eta:.0f}s")
+        sys.stderr.write(("\r" + line + "\n") if final else ("\r" + line))
+        sys.stderr.flush()
+
+
+def list_dumps(directory: str) -> List[str]:
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.endswith(".json") and not name.startswith(".")
+    )
+
+
+def run(directory: str, options: Dict[str, Any], workers: Optional[int] = None, state_path: Optional[str] = None,
+        restart: bool = False, quiet: bool = True, progress_interval: float = 1.0) -> Dict[str, int]:
+    """
+    Reprocess every session dump in directory with a process pool
+
+    Args:
+        directory: Directory of <call_id>.json dumps
+        options: send, recompute, hook, output, apikey and api_url (see process_file), and optionally
+            phrases, the {tag: [phrases]} rules to re-tag turns with, and in_place, to replace the
+            source dumps when there is no output directory
+        workers: Worker processes (default: CPU count)
+        state_path: Resume state file (default: <directory>/.whispey-reingest-state.jsonl)
+        restart: Ignore the state file and process every dump again
+        quiet: Silence the workers' per-request output
+        progress_interval: Seconds between progress lines
+
+    Returns:
+        dict: Counts of succeeded, failed and skipped sessions
+    """
+    mode = run_mode(options)
+    state_path = state_path or os.path.join(directory, STATE_FILE)
+    done = set() if restart else read_state(state_path, mode)
+
+    paths = [path for path in list_dumps(directory) if os.path.basename(path) not in done]
+    progress = Progress(len(paths), len(done), progress_interval)
+    max_in_flight = (workers or os.cpu_count() or 1) * 4
+
+    with open(state_path, "a", encoding="utf-8") as state, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(quiet, options.get("phrases"))) as pool:
+        pending = set()
+        queue = iter(paths)
+        exhausted = False
+        while pending or not exhausted:
+            # Keep a bounded number of sessions in flight instead of queueing thousands of futures
+            while not exhausted and len(pending) < max_in_flight:
+                path = next(queue, None)
+                if path is None:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(process_file, path, options))
+            if not pending:
+                break
+
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                result = future.result()
+                state.write(json.dumps({"file": result["file"], "mode": mode, "success": result["success"],
+                                        "error": result.get("error"), "at": time.time()}) + "\n")
+                state.flush()
+                if not result["success"]:
+                    sys.stderr.write(f"\n❌ {result['file']}: {result.get('error')}\n")
+                progress.update(result["success"])
+
+    progress.report(final=True)
+    return {"succeeded": progress.succeeded, "failed": progress.failed, "skipped": len(done)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="whispey-reingest", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("directory", help="directory of saved session dumps (<call_id>.json)")
+    parser.add_argument("--recompute", action="store_true", help="recompute derived metrics and rewrite the dumps")
+    parser.add_argument("--phrases", help="JSON file of {tag: [phrases]} to re-tag turns with (with --recompute)")
+    parser.add_argument("--hook", help="'module:function' applied to every payload after recomputing")
+    parser.add_argument("--no-send", action="store_true", help="only rewrite the dumps, do not send them")
+    parser.add_argument("--output", help="write rewritten dumps to this directory")
+    parser.add_argument("--in-place", action="store_true", help="replace the source dumps with the rewritten ones")
+    parser.add_argument("--apikey", help="API key (default: WHISPEY_API_KEY)")
+    parser.add_argument("--api-url", help="ingest URL (default: the Whispey API)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--state", help=f"resume state file (default: <directory>/{STATE_FILE})")
+    parser.add_argument("--restart", action="store_true", help="ignore the state file and process every dump")
+    parser.add_argument("--verbose", action="store_true", help="show the per-request output of the workers")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        parser.error(f"{args.directory} is not a directory")
+    if args.no_send and not (args.recompute or args.hook):
+        parser.error("--no-send needs --recompute or --hook, otherwise there is nothing to do")
+    if args.phrases and not args.recompute:
+        parser.error("--phrases only applies with --recompute")
+    if args.output and args.in_place:
+        parser.error("--output and --in-place are mutually exclusive")
+    if (args.output or args.in_place) and not (args.recompute or args.hook):
+        parser.error("--output and --in-place need --recompute or --hook, otherwise nothing is rewritten")
+    if args.no_send and not (args.output or args.in_place):
+        parser.error("--no-send needs --output or --in-place, otherwise the results are discarded")
+    if args.hook:
+        # Fail fast instead of once per session in the workers
+        load_hook(args.hook)
+
+    phrases = None
+    if args.phrases:
+        with open(args.phrases, "r", encoding="utf-8") as f:
+            phrases = json.load(f)
+
+    options = {
+        "send": not args.no_send,
+        "recompute": args.recompute,
+        "phrases": phrases,
+        "hook": args.hook,
+        "output": args.output,
+        "in_place": args.in_place,
+        "apikey": args.apikey,
+        "api_url": args.api_url,
+    }
+    counts = run(args.directory, options, workers=args.workers, state_path=args.state, restart=args.restart,
+                 quiet=not args.verbose)
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,57 @@
 import os
 import json
 import asyncio
-import aiohttp
+import tempfile
 from datetime import datetime
-from dotenv import load_dotenv
-
-load_dotenv()
 
 # Configuration
 WHISPEY_API_URL = "https://mp1grlhon8.execute-api.ap-south-1.amazonaws.com/dev/send-call-log"
-WHISPEY_API_KEY = os.getenv("WHISPEY_API_KEY")
+DEFAULT_TELEMETRY_DIR = "whispey_telemetry"
+
+# Request timeouts (seconds): a request never runs longer than its budget, and connecting
+# (DNS, TCP, TLS) may only use part of it so a dead endpoint fails fast enough to retry
+DEFAULT_REQUEST_TIMEOUT = 30.0
+CONNECT_TIMEOUT_SHARE = 0.3
+MAX_CONNECT_TIMEOUT = 5.0
+
+# Responses worth retrying: throttling and server-side failures
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Environment is read on first use, not at import: importing the SDK has no side effects
+_env_loaded = False
+
+def _load_env():
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+def get_api_key():
+    """
+    Resolve the WHISPEY_API_KEY environment variable (loading .env on first call)
+
+    Returns:
+        str: The API key, or None if it is not set
+    """
+    _load_env()
+    return os.getenv("WHISPEY_API_KEY")
+
+def get_telemetry_dir():
+    """
+    Directory session JSON dumps are saved to (WHISPEY_TELEMETRY_DIR, default ./whispey_telemetry)
+
+    Returns:
+        str: The directory path
+    """
+    _load_env()
+    return os.getenv("WHISPEY_TELEMETRY_DIR") or DEFAULT_TELEMETRY_DIR
+
+def __getattr__(name):
+    # Backwards compatibility for code reading send_log.WHISPEY_API_KEY
+    if name == "WHISPEY_API_KEY":
+        return get_api_key()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def convert_timestamp(timestamp_value):
     """
@@ -44,26 +86,213 @@ def convert_timestamp(timestamp_value):
     # Default: convert to string
     return str(timestamp_value)
 
-async def send_to_whispey(data, apikey=None, api_url=None):
+def request_timeouts(budget):
     """
-    Send data to Whispey API
-    
+    Connect, read and total timeouts for a request that must finish within budget seconds
+
+    Returns:
+        dict: total, connect and sock_read timeouts in seconds
+    """
+    budget = max(budget, 0.001)
+    return {
+        "total": budget,
+        "connect": min(budget * CONNECT_TIMEOUT_SHARE, MAX_CONNECT_TIMEOUT),
+        "sock_read": budget,
+    }
+
+def prepare_payload(data):
+    """
+    Normalise a whispey data dict in place before it is encoded
+
     Args:
         data (dict): The data to send to the API
-        apikey (str, optional): Custom API key to use. If not provided, uses WHISPEY_API_KEY environment variable
-    
+
     Returns:
-        dict: Response from the API or error information
+        dict: The same dict, with timestamp fields converted to ISO format
     """
-    
-    # Convert timestamp fields to proper ISO format
     if "call_started_at" in data:
         data["call_started_at"] = convert_timestamp(data["call_started_at"])
     if "call_ended_at" in data:
         data["call_ended_at"] = convert_timestamp(data["call_ended_at"])
-    
+    return data
+
+# Chunk size for streaming payload files from disk
+PAYLOAD_CHUNK_SIZE = 256 * 1024
+
+class _StreamedValue(Exception):
+    """Raised while encoding to signal that a StreamedArray was reached"""
+
+def _reject_streams(value):
+    from whispey.spill import StreamedArray
+    if isinstance(value, StreamedArray):
+        raise _StreamedValue()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _encode_or_none(value):
+    """JSON text of value, or None if it contains a StreamedArray"""
+    try:
+        return json.dumps(value, default=_reject_streams)
+    except _StreamedValue:
+        return None
+
+def _iter_json(value):
+    """
+    Yield the JSON text of value in pieces, writing StreamedArrays item by item
+
+    Only the containers on the path to a StreamedArray are walked here; everything
+    else is encoded by json.dumps in one go. The output matches json.dumps.
+    """
+    from whispey.spill import StreamedArray
+    if isinstance(value, StreamedArray):
+        yield "["
+        for index, item in enumerate(value):
+            yield (", " if index else "") + json.dumps(item)
+        yield "]"
+        return
+
+    text = _encode_or_none(value)
+    if text is not None:
+        yield text
+    else:
+        yield from _iter_container(value)
+
+def _iter_container(value):
+    """Yield the JSON text of a dict or list holding a StreamedArray somewhere below it"""
+    if isinstance(value, dict):
+        yield "{"
+        for index, (key, item) in enumerate(value.items()):
+            # Same key conversion as json.dumps: non-string keys become their JSON text
+            key = key if isinstance(key, str) else json.dumps(key)
+            yield (", " if index else "") + json.dumps(key) + ": "
+            yield from _iter_json(item)
+        yield "}"
+    else:
+        yield "["
+        for index, item in enumerate(value):
+            if index:
+                yield ", "
+            yield from _iter_json(item)
+        yield "]"
+
+class PayloadFile:
+    """
+    An encoded payload kept in a temporary file instead of in memory
+
+    encode_payload returns one for bounded-memory sessions, whose spilled turns
+    would otherwise be loaded back into memory as one large body. It is streamed
+    to the API, and exporters copy it chunk by chunk. ``len()`` is its size in bytes.
+    """
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        fd, path = tempfile.mkstemp(prefix="whispey-payload-", suffix=".json")
+        try:
+            size = 0
+            with os.fdopen(fd, "wb", buffering=PAYLOAD_CHUNK_SIZE) as f:
+                for chunk in chunks:
+                    encoded = chunk.encode("utf-8")
+                    f.write(encoded)
+                    size += len(encoded)
+        except BaseException:
+            os.remove(path)
+            raise
+        return cls(path, size)
+
+    def __len__(self):
+        return self.size
+
+    def chunks(self, chunk_size=PAYLOAD_CHUNK_SIZE):
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    async def stream(self, chunk_size=PAYLOAD_CHUNK_SIZE):
+        """Async iterator over the bytes, reading from disk off the event loop"""
+        loop = asyncio.get_running_loop()
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = await loop.run_in_executor(None, f.read, chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def read(self):
+        """The whole payload as bytes (loads it into memory)"""
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def close(self):
+        """Delete the file"""
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    def __del__(self):
+        self.close()
+
+def write_payload(f, payload):
+    """Write a payload (bytes or PayloadFile) to a binary file object"""
+    if isinstance(payload, PayloadFile):
+        for chunk in payload.chunks():
+            f.write(chunk)
+    else:
+        f.write(payload)
+
+def payload_bytes(payload):
+    """A payload as bytes, whether it was encoded in memory or to a PayloadFile"""
+    return payload.read() if isinstance(payload, PayloadFile) else payload
+
+def close_payload(payload):
+    """Release a payload's temporary file, if it has one"""
+    if isinstance(payload, PayloadFile):
+        payload.close()
+
+def encode_payload(data):
+    """
+    Prepare and serialize whispey data once, so the payload can be shared by every exporter
+
+    Args:
+        data (dict): The data to send to the API
+
+    Returns:
+        bytes: UTF-8 encoded JSON body; a PayloadFile holding it instead when the data contains
+            arrays streamed from disk (bounded-memory sessions), so they never sit in memory whole
+
+    Raises:
+        TypeError, ValueError: If the data is not JSON serializable
+    """
+    prepare_payload(data)
+    body = _encode_or_none(data)
+    if body is not None:
+        return body.encode("utf-8")
+    return PayloadFile.from_chunks(_iter_container(data))
+
+async def post_payload(body, apikey=None, api_url=None, timeout=None):
+    """
+    POST an already-encoded JSON body to the Whispey API
+
+    Args:
+        body (bytes or PayloadFile): Encoded payload from encode_payload
+        apikey (str, optional): Custom API key to use. If not provided, uses WHISPEY_API_KEY environment variable
+        api_url (str, optional): Override the default API URL
+        timeout (float, optional): Seconds the whole request may take (default: DEFAULT_REQUEST_TIMEOUT);
+            the connect and read timeouts are derived from it
+
+    Returns:
+        dict: Response from the API or error information. Failures carry "retryable"
+    """
     # Use custom API key if provided, otherwise fall back to environment variable
-    api_key_to_use = apikey if apikey is not None else WHISPEY_API_KEY
+    api_key_to_use = apikey if apikey is not None else get_api_key()
     
     # Validate API key
     if not api_key_to_use:
@@ -83,21 +312,24 @@ async def send_to_whispey(data, apikey=None, api_url=None):
     # Validate headers
     headers = {k: v for k, v in headers.items() if k is not None and v is not None}
     
-    print(f"📤 Sending data to Whispey API...")
-    print(f"Data keys: {list(data.keys())}")
-    print(f"Call started at: {data.get('call_started_at')}")
-    print(f"Call ended at: {data.get('call_ended_at')}")
-    
     try:
         # Determine target URL (overrideable)
         url_to_use = api_url if api_url else WHISPEY_API_URL
-        # Test JSON serialization first
-        json_str = json.dumps(data)
-        print(f"✅ JSON serialization OK ({len(json_str)} chars)")
         
+        # Imported here so the HTTP stack only loads when a session is actually exported
+        import aiohttp
+
+        client_timeout = aiohttp.ClientTimeout(**request_timeouts(timeout or DEFAULT_REQUEST_TIMEOUT))
+
+        data = body
+        if isinstance(body, PayloadFile):
+            # Stream from disk; every attempt (retry or hedge) reads its own handle
+            data = body.stream()
+            headers["Content-Length"] = str(len(body))
+
         # Send the request
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url_to_use, json=data, headers=headers) as response:
+        async with aiohttp.ClientSession(timeout=client_timeout) as session:
+            async with session.post(url_to_use, data=data, headers=headers) as response:
                 print(f"📡 Response status: {response.status}")
                 
                 if response.status >= 400:
@@ -106,10 +338,15 @@ async def send_to_whispey(data, apikey=None, api_url=None):
                     return {
                         "success": False,
                         "status": response.status,
-                        "error": error_text
+                        "error": error_text,
+                        "retryable": response.status in RETRYABLE_STATUSES
                     }
                 else:
-                    result = await response.json()
+                    # The ingest accepted the call: never turn an odd response body into a failure that gets retried
+                    try:
+                        result = await response.json(content_type=None)
+                    except ValueError:
+                        result = await response.text()
                     print(f"✅ Success! Response: {json.dumps(result, indent=2)}")
                     return {
                         "success": True,
@@ -117,18 +354,55 @@ async def send_to_whispey(data, apikey=None, api_url=None):
                         "data": result
                     }
                     
-    except (TypeError, ValueError) as e:
-        # These are the actual exceptions json.dumps() raises
-        error_msg = f"JSON serialization failed: {e}"
+    except asyncio.TimeoutError:
+        error_msg = f"Request timed out after {timeout or DEFAULT_REQUEST_TIMEOUT:.2f}s"
         print(f"❌ {error_msg}")
         return {
             "success": False,
-            "error": error_msg
+            "error": error_msg,
+            "retryable": True
         }
     except Exception as e:
         error_msg = f"Request failed: {e}"
         print(f"❌ {error_msg}")
+        return {
+            "success": False,
+            "error": error_msg,
+            # Connection problems are worth another attempt; a broken environment is not
+            "retryable": not isinstance(e, ImportError)
+        }
+
+async def send_to_whispey(data, apikey=None, api_url=None):
+    """
+    Send data to Whispey API
+    
+    Args:
+        data (dict): The data to send to the API
+        apikey (str, optional): Custom API key to use. If not provided, uses WHISPEY_API_KEY environment variable
+    
+    Returns:
+        dict: Response from the API or error information
+    """
+    
+    print(f"📤 Sending data to Whispey API...")
+    print(f"Data keys: {list(data.keys())}")
+    
+    try:
+        body = encode_payload(data)
+        print(f"✅ JSON serialization OK ({len(body)} bytes)")
+    except (TypeError, ValueError) as e:
+        # These are the actual exceptions json.dumps() raises
+        error_msg = f"JSON serialization failed: {e}"
+        print(f"❌ {error_msg}")
         return {
             "success": False,
             "error": error_msg
-        }
\ No newline at end of file
+        }
+    
+    print(f"Call started at: {data.get('call_started_at')}")
+    print(f"Call ended at: {data.get('call_ended_at')}")
+    
+    try:
+        return await post_payload(body, apikey=apikey, api_url=api_url)
+    finally:
+        close_payload(body)
@@ -0,0 +1,152 @@
+# sdk/whispey/spill.py
+import os
+import json
+import mmap
+import logging
+import tempfile
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("whispey_spill")
+
+# Items that always stay in memory: late STT/TTS metrics still land on the last turns
+MIN_IN_MEMORY = 4
+
+
+class SpillList:
+    """
+    Append-only list that keeps at most ``max_in_memory`` items in memory.
+
+    Once the budget is exceeded, the oldest half of the in-memory items is
+    appended to a temporary NDJSON file. Iterating streams the spilled items
+    back from disk (optionally through mmap) one line at a time, followed by
+    the in-memory tail, so the full list is never reloaded into memory.
+
+    Only the in-memory tail supports indexing (``items[-1]``) and is returned
+    by ``recent()``; spilled items are read-only.
+
+    Args:
+        max_in_memory: Number of items kept in memory (at least 4)
+        to_record: Converts an item to a JSON-serializable dict (default: identity)
+        from_record: Rebuilds an item from its dict (default: identity)
+        use_mmap: Memory-map the spill file when streaming it back
+        name: Used in the spill file name, for debugging
+    """
+
+    def __init__(self, max_in_memory: int, to_record: Optional[Callable[[Any], Dict[str, Any]]] = None,
+                 from_record: Optional[Callable[[Dict[str, Any]], Any]] = None, use_mmap: bool = False,
+                 name: str = "items"):
+        if max_in_memory < MIN_IN_MEMORY:
+            raise ValueError(f"max_in_memory must be at least {MIN_IN_MEMORY}")
+
+        self.max_in_memory = max_in_memory
+        self.to_record = to_record or (lambda item: item)
+        self.from_record = from_record or (lambda record: record)
+        self.use_mmap = use_mmap
+        self.name = name
+
+        self._memory: List[Any] = []
+        self._spilled_count = 0
+        self._spill_file = None
+        self._spill_path: Optional[str] = None
+
+    @property
+    def spilled_count(self) -> int:
+        return self._spilled_count
+
+    @property
+    def spill_path(self) -> Optional[str]:
+        return self._spill_path
+
+    def append(self, item: Any):
+        self._memory.append(item)
+        if len(self._memory) > self.max_in_memory:
+            self._spill(len(self._memory) - self.max_in_memory // 2)
+
+    def _spill(self, count: int):
+        if self._spill_file is None:
+            self._spill_file = tempfile.NamedTemporaryFile(
+                mode="ab", prefix=f"whispey-{self.name}-", suffix=".ndjson", delete=False
+            )
+            self._spill_path = self._spill_file.name
+
+        batch = self._memory[:count]
+        lines = b"".join(json.dumps(self.to_record(item)).encode("utf-8") + b"\n" for item in batch)
+        self._spill_file.write(lines)
+        self._spill_file.flush()
+
+        del self._memory[:count]
+        self._spilled_count += count
+        logger.info(f"💾 Spilled {count} {self.name} to {self._spill_path} ({self._spilled_count} on disk)")
+
+    def recent(self) -> List[Any]:
+        """The items still held in memory, oldest first"""
+        return self._memory
+
+    def __len__(self) -> int:
+        return self._spilled_count + len(self._memory)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += len(self)
+        if index < self._spilled_count or index >= len(self):
+            raise IndexError(f"{self.name} index {index} is not held in memory")
+        return self._memory[index - self._spilled_count]
+
+    def _iter_spilled(self, count: int) -> Iterator[Any]:
+        if not count:
+            return
+        with open(self._spill_path, "rb") as f:
+            if self.use_mmap:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    for _ in range(count):
+                        yield self.from_record(json.loads(mapped.readline()))
+            else:
+                for _ in range(count):
+                    yield self.from_record(json.loads(f.readline()))
+
+    def __iter__(self) -> Iterator[Any]:
+        # Snapshot both parts so items spilled mid-iteration are neither skipped nor repeated
+        spilled_count = self._spilled_count
+        memory = list(self._memory)
+        yield from self._iter_spilled(spilled_count)
+        yield from memory
+
+    def close(self):
+        """Delete the spill file"""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            try:
+                os.remove(self._spill_path)
+            except OSError:
+                pass
+            self._spill_file = None
+            logger.info(f"🗑️ Removed spill file {self._spill_path}")
+
+
+class StreamedArray:
+    """
+    A JSON array produced lazily at encode time.
+
+    encode_payload writes the items one at a time to a payload file instead of
+    requiring the whole list in memory; ``iter(...)`` works as for a list.
+
+    Args:
+        factory: Returns a fresh iterator over the items on every call
+        length: Number of items the iterator yields
+    """
+
+    def __init__(self, factory: Callable[[], Iterator[Any]], length: int):
+        self.factory = factory
+        self.length = length
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.factory()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __bool__(self) -> bool:
+        return self.length > 0
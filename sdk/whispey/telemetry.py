@@ -0,0 +1,168 @@
+# sdk/whispey/telemetry.py
+import sys
+import time
+import asyncio
+import logging
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("whispey_telemetry")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+DEFAULT_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram: O(log buckets) per observation, constant memory"""
+
+    def __init__(self, buckets_ms: Optional[List[float]] = None):
+        self.bounds = list(buckets_ms or DEFAULT_BUCKETS_MS)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value_ms: float):
+        self.counts[bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (max for the open-ended bucket)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound:g}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum_ms": self.total,
+            "avg_ms": self.total / self.count if self.count else None,
+            "min_ms": self.min,
+            "max_ms": self.max,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+class SDKTelemetry:
+    """Counters and latency histograms describing the SDK's own export pipeline"""
+
+    COUNTERS = [
+        "sessions_started",
+        "sessions_ended",
+        "exports_attempted",
+        "exports_succeeded",
+        "exports_failed",
+        "exports_retried",
+        "exports_hedged",
+        "exports_deadline_exceeded",
+        "exports_fallback",
+        "serialization_errors",
+        "events_dropped",
+        "bytes_sent",
+    ]
+
+    HISTOGRAMS = [
+        "serialization_ms",
+        "export_ms",
+        "call_end_to_ack_ms",
+    ]
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started_at = time.time()
+        self.counters: Dict[str, int] = {name: 0 for name in self.COUNTERS}
+        self.histograms: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in self.HISTOGRAMS}
+
+    def incr(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value_ms: float):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.observe(value_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Point-in-time copy of every counter, histogram and session gauge"""
+        return {
+            "uptime_seconds": time.time() - self.started_at,
+            "counters": dict(self.counters),
+            "histograms": {name: histogram.snapshot() for name, histogram in self.histograms.items()},
+            "sessions": _session_gauges(),
+        }
+
+
+def _session_gauges() -> Dict[str, int]:
+    # Only look at the session store if it was ever loaded - stats() must not import LiveKit
+    whispey_module = sys.modules.get("whispey.whispey")
+    if whispey_module is None:
+        return {"in_store": 0, "active": 0, "awaiting_export": 0}
+
+    store = whispey_module._session_data_store
+    active = sum(1 for info in store.values() if info['call_active'])
+    return {
+        "in_store": len(store),
+        "active": active,
+        "awaiting_export": len(store) - active,
+    }
+
+
+# Process-wide instance shared by every LivekitObserve
+sdk_stats = SDKTelemetry()
+
+
+def get_stats() -> Dict[str, Any]:
+    """Snapshot of the SDK's own counters, latency histograms and session gauges"""
+    return sdk_stats.snapshot()
+
+
+def start_stats_reporter(interval_seconds: float = 60.0,
+                         hook: Optional[Callable[[Dict[str, Any]], Any]] = None) -> "asyncio.Task":
+    """
+    Periodically log the stats snapshot, or hand it to a hook
+
+    Args:
+        interval_seconds: Time between snapshots
+        hook: Optional callback (plain or async) receiving each snapshot instead of it being logged
+
+    Returns:
+        asyncio.Task: Cancel it to stop reporting
+    """
+    async def report():
+        while True:
+            await asyncio.sleep(interval_seconds)
+            snapshot = get_stats()
+            if hook is None:
+                counters = snapshot["counters"]
+                export_ms = snapshot["histograms"]["export_ms"]
+                logger.info(
+                    f"📈 Whispey SDK stats: {counters['exports_succeeded']} ok / {counters['exports_failed']} failed / "
+                    f"{counters['exports_retried']} retried, {counters['bytes_sent']} bytes sent, "
+                    f"export p95 {export_ms['p95_ms']} ms, sessions {snapshot['sessions']}"
+                )
+                continue
+            try:
+                result = hook(snapshot)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"❌ Stats hook failed: {e}")
+
+    return asyncio.get_running_loop().create_task(report())
@@ -1,19 +1,34 @@
 # sdk/whispey/whispey.py
 import time
 import uuid
+import asyncio
+import heapq
 import logging
 from datetime import datetime
 from typing import Dict, Any
 from whispey.event_handlers import setup_session_event_handlers, safe_extract_transcript_data
 from whispey.metrics_service import setup_usage_collector, create_session_data
-from whispey.send_log import send_to_whispey
+from whispey.send_log import encode_payload, close_payload
+from whispey.exporters import HttpExporter, DirectoryExporter, export_with_deadline
+from whispey.spill import SpillList, StreamedArray
+from whispey.telemetry import sdk_stats
 
 logger = logging.getLogger("observe_session")
 
 # Global session storage - store data, not class instances
 _session_data_store = {}
 
-def observe_session(session, agent_id,host_url,bug_detector=None, **kwargs):
+# Columnar writes still running in executor threads; flush_all waits for them
+_columnar_writes = set()
+
+# Share of an export deadline the recording may use to finish uploading
+RECORDING_DEADLINE_SHARE = 0.5
+# Time kept back from an export deadline to hand the payload to the fallback exporter
+FALLBACK_RESERVE_SECONDS = 0.5
+
+def observe_session(session, agent_id,host_url,bug_detector=None, columnar_sink=None, phrase_tagger=None, redactor=None,
+                    max_turns_in_memory=None, spill_mmap=False, recording_store=None, audio_quality=False,
+                    event_buffer_size=None, room=None, **kwargs):
     session_id = str(uuid.uuid4())
 
     logger.info(f"🔗 Setting up Whispey-compatible metrics collection for session {session_id}")
@@ -29,6 +44,7 @@ def observe_session(session, agent_id,host_url,bug_detector=None, **kwargs):
 
         # Update session data with all dynamic parameters
         session_data.update(kwargs)
+        session_data["agent_id"] = agent_id
 
         # Store session info in global storage (data only, not class instances)
         _session_data_store[session_id] = {
@@ -40,12 +56,41 @@ def observe_session(session, agent_id,host_url,bug_detector=None, **kwargs):
             'agent_id': agent_id,
             'call_active': True,
             'whispey_data': None,
-            'bug_detector': bug_detector
+            'bug_detector': bug_detector,
+            'columnar_sink': columnar_sink,
+            'transcript_collector': None,
+            'recorder': None,
+            'audio_analyzer': None,
+            'audio_tap': None,
+            'event_pipeline': None
 
         }
 
+        if audio_quality:
+            try:
+                from whispey.audio_quality import AudioQualityAnalyzer
+                _session_data_store[session_id]['audio_analyzer'] = AudioQualityAnalyzer()
+            except Exception as e:
+                logger.error(f"⚠️ Failed to set up audio quality analyzer: {e}")
+
         # Setup event handlers with session
-        setup_session_event_handlers(session, session_data, usage_collector, None,bug_detector)
+        _session_data_store[session_id]['event_pipeline'] = setup_session_event_handlers(
+            session, session_data, usage_collector, None,bug_detector, phrase_tagger, redactor,
+            max_turns_in_memory, spill_mmap, _session_data_store[session_id]['audio_analyzer'], event_buffer_size
+        )
+
+        # Keep a handle on the collector: safe_extract_transcript_data drops it from session_data
+        _session_data_store[session_id]['transcript_collector'] = session_data.get("transcript_collector")
+
+        if recording_store:
+            try:
+                from whispey.recorder import CallRecorder
+                _session_data_store[session_id]['recorder'] = CallRecorder(recording_store, f"{agent_id}/{session_id}.ogg")
+            except Exception as e:
+                logger.error(f"⚠️ Failed to set up call recorder: {e}")
+
+        if room is not None:
+            attach_session_room(session_id, room)
 
         # Add custom handlers for Whispey integration
         # Note: We need to access the room through JobContext in your entrypoint
@@ -60,6 +105,7 @@ def observe_session(session, agent_id,host_url,bug_detector=None, **kwargs):
             error_msg = str(event.error) if hasattr(event, 'error') and event.error else None
             end_session_manually(session_id, "completed", error_msg)
 
+        sdk_stats.incr("sessions_started")
         logger.info(f"✅ Whispey-compatible metrics collection active for session {session_id}")
         return session_id
 
@@ -68,6 +114,76 @@ def observe_session(session, agent_id,host_url,bug_detector=None, **kwargs):
         # Still return session_id so caller can handle gracefully
         return session_id
 
+def attach_session_room(session_id: str, room):
+    """Tap the room's audio for the session's recorder and audio analyzer (call once the room is connected)"""
+    session_info = _session_data_store.get(session_id)
+    if not session_info:
+        logger.error(f"Session {session_id} not found when attaching room")
+        return
+    if session_info['audio_tap'] or not (session_info['recorder'] or session_info['audio_analyzer']):
+        return
+
+    try:
+        from whispey.audio_tap import RoomAudioTap
+        # One tap feeds every consumer: each track is decoded and resampled once
+        tap = RoomAudioTap(room)
+        if session_info['recorder']:
+            session_info['recorder'].attach_tap(tap)
+        if session_info['audio_analyzer']:
+            tap.add_consumer(session_info['audio_analyzer'])
+        tap.start()
+        session_info['audio_tap'] = tap
+        logger.info(f"🎧 Audio tap attached to session {session_id}")
+    except Exception as e:
+        logger.error(f"⚠️ Failed to tap room audio for session {session_id}: {e}")
+
+async def stop_session_audio(session_id: str):
+    """Stop the session's audio tap and recorder, filling in the recording URL and final audio metrics"""
+    session_info = _session_data_store.get(session_id)
+    if not session_info:
+        return
+
+    tap = session_info.get('audio_tap')
+    if tap:
+        await tap.aclose()
+
+    analyzer = session_info.get('audio_analyzer')
+    if analyzer and tap and session_info['whispey_data'] is not None:
+        try:
+            session_info['whispey_data']["metadata"]["audio_quality"] = analyzer.session_metrics(final=True)
+        except Exception as e:
+            logger.error(f"Error finalizing audio metrics: {e}")
+
+    recorder = session_info.get('recorder')
+    if recorder:
+        url = await recorder.stop()
+        if url and session_info['whispey_data'] is not None and not session_info['whispey_data'].get("recording_url"):
+            session_info['whispey_data']["recording_url"] = url
+            logger.info(f"📎 Added streamed recording URL: {url}")
+
+async def stop_session_audio_within(session_id: str, timeout: float = None):
+    """stop_session_audio, given up after timeout seconds so an export keeps to its deadline"""
+    if timeout is None:
+        await stop_session_audio(session_id)
+        return
+    try:
+        await asyncio.wait_for(stop_session_audio(session_id), timeout=max(timeout, 0))
+    except asyncio.TimeoutError:
+        logger.error("⏱️ Recording did not finish within the export deadline, exporting without it")
+
+def _release_session_audio(session_info):
+    """Stop audio work a session still has running, e.g. when stopping it ran out of time"""
+    recorder = session_info.get('recorder')
+    if recorder:
+        recorder.abort()
+    tap = session_info.get('audio_tap')
+    if tap:
+        try:
+            asyncio.get_running_loop().create_task(tap.aclose())
+        except RuntimeError:
+            # No event loop: none of the tap's tasks can be running either
+            pass
+
 def set_session_start_time(session_id: str):
     """Call this when the agent actually connects to the room to set the real call start time"""
     if session_id in _session_data_store:
@@ -88,12 +204,41 @@ def generate_whispey_data(session_id: str, status: str = "in_progress", error: s
 
     # Extract transcript data using your existing function
     session_data = session_info['session_data']
+    collector = session_info.get('transcript_collector')
+    analyzer = session_info.get('audio_analyzer')
+
+    # Process events still waiting in the ring buffer so the data is complete
+    event_pipeline = session_info.get('event_pipeline')
+    if event_pipeline:
+        event_pipeline.drain()
+
+    # The turn left open when the call ended gets the audio since the last completed turn
+    if analyzer and collector and not session_info['call_active']:
+        open_turn = collector.current_turn
+        if open_turn and open_turn.audio_metrics is None:
+            try:
+                open_turn.audio_metrics = analyzer.close_turn()
+            except Exception as e:
+                logger.error(f"Error closing audio metrics for last turn: {e}")
+
     if session_data:
+        # safe_extract_transcript_data drops the collector from session_data; hand it back so
+        # every call (live get_data or final export) extracts from the up-to-date collector
+        if collector and "transcript_collector" not in session_data:
+            session_data["transcript_collector"] = collector
         try:
             safe_extract_transcript_data(session_data)
         except Exception as e:
             logger.error(f"Error extracting transcript data: {e}")
 
+    # Last turn of an ended call can only be checked for missing metrics now
+    bug_detector = session_info.get('bug_detector')
+    if bug_detector and collector and not session_info['call_active']:
+        try:
+            bug_detector.finalize(session_data, collector)
+        except Exception as e:
+            logger.error(f"Error finalizing bug detector: {e}")
+
     # Get usage summary
     usage_summary = {}
     usage_collector = session_info['usage_collector']
@@ -144,12 +289,12 @@ def generate_whispey_data(session_id: str, status: str = "in_progress", error: s
         }
     }
 
-    # Extract transcript data from session
-    transcript_data = safe_extract_transcript_data(session_data)
+    # Transcript data was extracted into session_data above
+    transcript_data = session_data
     if transcript_data and 'transcript_with_metrics' in transcript_data:
         whispey_data["transcript_with_metrics"] = transcript_data['transcript_with_metrics']
         logger.info(f"📊 Extracted {len(transcript_data['transcript_with_metrics'])} conversation turns")
-        logger.info(f"📊 DEBUG: First turn sample: {transcript_data['transcript_with_metrics'][0] if transcript_data['transcript_with_metrics'] else 'EMPTY'}")
+        logger.info(f"📊 DEBUG: First turn sample: {next(iter(transcript_data['transcript_with_metrics']), 'EMPTY')}")
     else:
         logger.warning(f"⚠️ NO transcript_with_metrics extracted! transcript_data: {transcript_data}")
         logger.warning(f"⚠️ Session data keys: {list(session_data.keys()) if session_data else 'NO SESSION DATA'}")
@@ -162,25 +307,29 @@ def generate_whispey_data(session_id: str, status: str = "in_progress", error: s
             user_msgs = session_data.get("user_messages", [])
             agent_msgs = session_data.get("agent_messages", [])
             
-            # Combine and sort by timestamp for simple format
-            all_msgs = []
-            
-            for msg in user_msgs:
-                all_msgs.append({
-                    "speaker": "customer",
-                    "text": msg.get("content", ""),
-                    "timestamp": msg.get("timestamp", 0)
-                })
-            for msg in agent_msgs:
-                all_msgs.append({
-                    "speaker": "agent", 
-                    "text": msg.get("content", ""),
-                    "timestamp": msg.get("timestamp", 0)
-                })
-            
-            # Sort by timestamp
-            all_msgs.sort(key=lambda x: x.get("timestamp", 0))
-            whispey_data["transcript_json"] = all_msgs
+            if isinstance(user_msgs, SpillList) or isinstance(agent_msgs, SpillList):
+                # Messages spilled to disk: both lists are already in time order, so merge
+                # them lazily at encode time instead of loading and sorting everything
+                whispey_data["transcript_json"] = StreamedArray(
+                    lambda: heapq.merge(
+                        (simple_transcript_entry("customer", msg) for msg in user_msgs),
+                        (simple_transcript_entry("agent", msg) for msg in agent_msgs),
+                        key=lambda x: x.get("timestamp", 0)
+                    ),
+                    len(user_msgs) + len(agent_msgs)
+                )
+            else:
+                # Combine and sort by timestamp for simple format
+                all_msgs = []
+                
+                for msg in user_msgs:
+                    all_msgs.append(simple_transcript_entry("customer", msg))
+                for msg in agent_msgs:
+                    all_msgs.append(simple_transcript_entry("agent", msg))
+                
+                # Sort by timestamp
+                all_msgs.sort(key=lambda x: x.get("timestamp", 0))
+                whispey_data["transcript_json"] = all_msgs
             logger.info(f"📄 Built simple transcript: {len(user_msgs)} user + {len(agent_msgs)} agent messages")
         else:
             logger.warning("📄 No message data found for simple transcript")
@@ -191,8 +340,35 @@ def generate_whispey_data(session_id: str, status: str = "in_progress", error: s
         if 'bug_flagged_turns' in session_data:
             whispey_data["metadata"]["bug_flagged_turns"] = session_data['bug_flagged_turns']
 
+        # Add phrase tag counts
+        if session_data.get('phrase_tag_counts'):
+            whispey_data["metadata"]["phrase_tags"] = session_data['phrase_tag_counts']
+
+        # Add PII redaction counts (never the redacted values)
+        if session_data.get('pii_redactions'):
+            whispey_data["metadata"]["pii_redactions"] = session_data['pii_redactions']
+
+    # Events lost to a full ring buffer
+    if event_pipeline and event_pipeline.dropped:
+        whispey_data["metadata"]["events_dropped"] = event_pipeline.dropped
+
+    # Add session-level audio quality metrics
+    if analyzer and session_info['audio_tap']:
+        try:
+            whispey_data["metadata"]["audio_quality"] = analyzer.session_metrics()
+        except Exception as e:
+            logger.error(f"Error computing audio metrics: {e}")
+
     return whispey_data
 
+def simple_transcript_entry(speaker: str, msg: Dict[str, Any]) -> Dict[str, Any]:
+    """One transcript_json entry (speaker, text, timestamp) built from a user/agent message"""
+    return {
+        "speaker": speaker,
+        "text": msg.get("content", ""),
+        "timestamp": msg.get("timestamp", 0)
+    }
+
 def get_session_whispey_data(session_id: str) -> Dict[str, Any]:
     """Get Whispey-formatted data for a session"""
     if session_id not in _session_data_store:
@@ -216,24 +392,104 @@ def end_session_manually(session_id: str, status: str = "completed", error: str
 
     logger.info(f"🔚 Manually ending session {session_id} with status: {status}")
 
-    # Mark as inactive
+    # Mark as inactive (a session can be ended twice: disconnect, then close)
+    if _session_data_store[session_id]['call_active']:
+        _session_data_store[session_id]['ended_at'] = time.time()
+        sdk_stats.incr("sessions_ended")
     _session_data_store[session_id]['call_active'] = False
 
     # Generate and cache final whispey data
     final_data = generate_whispey_data(session_id, status, error)
     _session_data_store[session_id]['whispey_data'] = final_data
 
+    # The final data is built: stop draining events in the background
+    event_pipeline = _session_data_store[session_id].get('event_pipeline')
+    if event_pipeline:
+        event_pipeline.stop()
+
     logger.info(f"📊 Session {session_id} ended - Whispey data prepared")
 
+    write_session_to_columnar_sink(session_id)
+
+def write_session_to_columnar_sink(session_id: str):
+    """Write a finished session to its columnar sink, if one was configured"""
+    session_info = _session_data_store.get(session_id)
+    if not session_info or not session_info.get('columnar_sink'):
+        return
+
+    # A session can be ended more than once (disconnect, then close) - write it only once
+    if session_info.get('columnar_written'):
+        return
+    session_info['columnar_written'] = True
+
+    collector = session_info.get('transcript_collector')
+    turns = collector.turns if collector else []
+    args = (session_info['columnar_sink'], session_id, session_info['whispey_data'] or {}, turns)
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _write_columnar(*args)
+        return
+
+    # Encoding and file writes stay off the agent's event loop
+    future = loop.run_in_executor(None, _write_columnar, *args)
+    session_info['columnar_write'] = future
+    _columnar_writes.add(future)
+    future.add_done_callback(_columnar_writes.discard)
+
+def _write_columnar(sink, session_id: str, whispey_data: Dict[str, Any], turns):
+    try:
+        sink.write_session(session_id, whispey_data, turns)
+    except Exception as e:
+        logger.error(f"❌ Failed to write session {session_id} to columnar sink: {e}")
+
+async def flush_columnar_sinks(sinks, timeout: float = None):
+    """Wait for columnar writes still running, then finalize the sinks' open files"""
+    if _columnar_writes:
+        _, unfinished = await asyncio.wait(list(_columnar_writes), timeout=timeout)
+        if unfinished:
+            logger.error(f"❌ {len(unfinished)} columnar writes did not finish in time")
+
+    loop = asyncio.get_running_loop()
+    for sink in sinks:
+        try:
+            await loop.run_in_executor(None, sink.flush)
+        except Exception as e:
+            logger.error(f"❌ Failed to flush columnar sink: {e}")
+
 def cleanup_session(session_id: str):
     """Clean up session data"""
     if session_id in _session_data_store:
-        del _session_data_store[session_id]
+        session_info = _session_data_store.pop(session_id)
+
+        event_pipeline = session_info.get('event_pipeline')
+        if event_pipeline:
+            event_pipeline.stop()
+        _release_session_audio(session_info)
+
+        # The columnar write may still be reading spilled turns
+        columnar_write = session_info.get('columnar_write')
+        if columnar_write and not columnar_write.done():
+            columnar_write.add_done_callback(lambda _: _close_spill_files(session_info))
+        else:
+            _close_spill_files(session_info)
+
         logger.info(f"🗑️ Cleaned up session {session_id}")
 
-async def send_session_to_whispey(session_id: str, recording_url: str = "", additional_transcript: list = None, force_end: bool = True, apikey: str = None, api_url: str = None) -> dict:
+def _close_spill_files(session_info):
+    """Remove any spill files of a bounded-memory session"""
+    collector = session_info.get('transcript_collector')
+    if collector:
+        collector.close()
+    for key in ("user_messages", "agent_messages"):
+        messages = (session_info.get('session_data') or {}).get(key)
+        if isinstance(messages, SpillList):
+            messages.close()
+
+async def send_session_to_whispey(session_id: str, recording_url: str = "", additional_transcript: list = None, force_end: bool = True, apikey: str = None, api_url: str = None, exporter=None, telemetry_dir: str = None, deadline: float = None, fallback=None) -> dict:
     """
-    Send session data to Whispey API
+    Send session data to Whispey API (or any other configured exporter)
 
     Args:
         session_id: Session ID to send
@@ -242,10 +498,29 @@ async def send_session_to_whispey(session_id: str, recording_url: str = "", addi
         force_end: Whether to force end the session before sending (default: True)
         apikey: Custom API key to use. If not provided, uses WHISPEY_API_KEY environment variable
         api_url: Override the default API URL (e.g., your own host). Defaults to built-in Lambda URL
+        exporter: WhispeyExporter to deliver the payload with. Defaults to an HttpExporter built from apikey/api_url
+        telemetry_dir: Also save the payload as <telemetry_dir>/<call_id>.json, written before it is exported
+            so the session can be re-ingested even if the export fails
+        deadline: Seconds the whole export may take. Request timeouts and retries are fitted into it, and
+            the exporter is cut off shortly before it so the payload can still reach the fallback
+        fallback: WhispeyExporter (e.g. a DirectoryExporter) the payload is handed to when the export fails
+            or runs out of time; the session is then cleaned up as if it had been sent
 
     Returns:
-        dict: Response from Whispey API
+        dict: Response from Whispey API, or the exporter's result
     """
+    session_info = _session_data_store.get(session_id)
+    if session_info:
+        # flush_all leaves sessions alone while another export of them is running
+        session_info['exporting'] = True
+    try:
+        return await _send_session_to_whispey(session_id, recording_url, additional_transcript, force_end, apikey,
+                                              api_url, exporter, telemetry_dir, deadline, fallback)
+    finally:
+        if session_info:
+            session_info['exporting'] = False
+
+async def _send_session_to_whispey(session_id: str, recording_url: str = "", additional_transcript: list = None, force_end: bool = True, apikey: str = None, api_url: str = None, exporter=None, telemetry_dir: str = None, deadline: float = None, fallback=None) -> dict:
     logger.info(f"🚀 Starting send_session_to_whispey for {session_id}")
 
     if session_id not in _session_data_store:
@@ -261,6 +536,11 @@ async def send_session_to_whispey(session_id: str, recording_url: str = "", addi
         logger.info(f"🔚 Force ending session {session_id}")
         end_session_manually(session_id, "completed")
 
+    deadline_at = time.monotonic() + deadline if deadline else None
+
+    # Finish streaming the recording; its URL fills in recording_url unless one was given
+    await stop_session_audio_within(session_id, deadline * RECORDING_DEADLINE_SHARE if deadline_at else None)
+
     # Get whispey data
     whispey_data = get_session_whispey_data(session_id)
 
@@ -287,24 +567,201 @@ async def send_session_to_whispey(session_id: str, recording_url: str = "", addi
     print(f"Usage: {whispey_data.get('metadata', {}).get('usage', {})}")
     print("============================")
 
+    if exporter is None:
+        exporter = HttpExporter(apikey=apikey, api_url=api_url)
+
+    sdk_stats.incr("exports_attempted")
+
+    # Encode once - every sink behind the exporter shares these bytes
+    try:
+        serialize_started = time.perf_counter()
+        payload = encode_payload(whispey_data)
+        sdk_stats.observe("serialization_ms", (time.perf_counter() - serialize_started) * 1000)
+        logger.info(f"✅ JSON serialization OK ({len(payload)} bytes)")
+    except (TypeError, ValueError) as e:
+        sdk_stats.incr("serialization_errors")
+        sdk_stats.incr("exports_failed")
+        error_msg = f"JSON serialization failed: {e}"
+        logger.error(f"❌ {error_msg}")
+        return {"success": False, "error": error_msg}
+
+    # Keep a local copy first: it survives a failed export or a crash while sending
+    telemetry_json = None
+    if telemetry_dir:
+        dump = await DirectoryExporter(telemetry_dir).export(payload, whispey_data)
+        if dump["success"]:
+            telemetry_json = dump["path"]
+            logger.info(f"💾 Saved session telemetry to {telemetry_json}")
+        else:
+            logger.error(f"❌ {dump['error']}")
+
     # Send to Whispey
     try:
-        logger.info(f"📤 Sending to Whispey API...")
-        result = await send_to_whispey(whispey_data, apikey=apikey, api_url=api_url)
+        logger.info(f"📤 Sending to {exporter.name} exporter...")
+        export_started = time.perf_counter()
+        if deadline_at is None:
+            result = await exporter.export(payload, whispey_data)
+        else:
+            # Stop the exporter early enough to still hand the payload to the fallback
+            exporter_deadline = deadline_at - (FALLBACK_RESERVE_SECONDS if fallback else 0)
+            try:
+                result = await asyncio.wait_for(
+                    export_with_deadline(exporter, payload, whispey_data, exporter_deadline),
+                    timeout=max(exporter_deadline - time.monotonic(), 0)
+                )
+            except asyncio.TimeoutError:
+                result = {"success": False, "error": f"Export did not finish within {deadline}s", "deadline_exceeded": True}
+        sdk_stats.observe("export_ms", (time.perf_counter() - export_started) * 1000)
+        if result.get("deadline_exceeded"):
+            sdk_stats.incr("exports_deadline_exceeded")
+        if telemetry_json:
+            result["telemetry_json"] = telemetry_json
 
         if result.get("success"):
+            sdk_stats.incr("exports_succeeded")
+            sdk_stats.incr("bytes_sent", len(payload))
+            ended_at = session_info.get('ended_at')
+            if ended_at:
+                sdk_stats.observe("call_end_to_ack_ms", (time.time() - ended_at) * 1000)
             logger.info(f"✅ Successfully sent session {session_id} to Whispey")
             cleanup_session(session_id)
         else:
+            sdk_stats.incr("exports_failed")
             logger.error(f"❌ Whispey API returned failure: {result}")
 
-        return result
-
     except Exception as e:
+        sdk_stats.incr("exports_failed")
         logger.error(f"❌ Exception sending to Whispey: {e}")
         import traceback
         traceback.print_exc()
-        return {"success": False, "error": str(e)}
+        result = {"success": False, "error": str(e)}
+
+    if not result.get("success") and fallback:
+        result["fallback"] = await hand_to_fallback(session_id, fallback, payload, whispey_data)
+
+    close_payload(payload)
+    return result
+
+async def hand_to_fallback(session_id: str, fallback, payload: bytes, whispey_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Deliver a payload the export could not, so it is kept instead of dropped"""
+    try:
+        outcome = await fallback.export(payload, whispey_data)
+    except Exception as e:
+        outcome = {"success": False, "error": str(e)}
+
+    if outcome.get("success"):
+        sdk_stats.incr("exports_fallback")
+        logger.info(f"🛟 Session {session_id} handed to {fallback.name} fallback")
+        cleanup_session(session_id)
+    else:
+        logger.error(f"❌ Fallback {fallback.name} failed for session {session_id}: {outcome.get('error')}")
+    return outcome
+
+async def spool_session(session_id: str, fallback, deadline: float = None) -> Dict[str, Any]:
+    """
+    End a session and hand its payload straight to the fallback exporter, without trying to send it
+
+    The recording and audio metrics are finalized first. With a deadline (seconds the spool may
+    take) they get the same share of it as in send_session_to_whispey.
+    """
+    if session_id not in _session_data_store:
+        return {"success": False, "error": "Session not found"}
+    if _session_data_store[session_id]['call_active']:
+        end_session_manually(session_id, "completed")
+    await stop_session_audio_within(session_id, deadline * RECORDING_DEADLINE_SHARE if deadline is not None else None)
+
+    whispey_data = get_session_whispey_data(session_id)
+    try:
+        payload = encode_payload(whispey_data)
+    except (TypeError, ValueError) as e:
+        sdk_stats.incr("serialization_errors")
+        return {"success": False, "error": f"JSON serialization failed: {e}"}
+    try:
+        return await hand_to_fallback(session_id, fallback, payload, whispey_data)
+    finally:
+        close_payload(payload)
+
+async def flush_all(deadline: float = 30.0, concurrency: int = 8, exporter=None, fallback=None, apikey: str = None,
+                    api_url: str = None, telemetry_dir: str = None, columnar_sink=None) -> Dict[str, Any]:
+    """
+    Finalize and export every session in the store, concurrently, within one time budget
+
+    Meant for worker shutdown: in-progress sessions are ended, and up to concurrency
+    exports run at once. Each export gets the time left of the shared deadline. Sessions
+    still waiting when too little time is left go straight to the fallback exporter.
+    Sessions whose export is already running elsewhere are left alone. Columnar sinks
+    are flushed last, so no file is left ``*.inprogress``.
+
+    Args:
+        deadline: Seconds the whole flush may take
+        concurrency: Exports running at the same time
+        exporter: WhispeyExporter to send with (default: HttpExporter from apikey/api_url)
+        fallback: WhispeyExporter keeping payloads that could not be sent (e.g. a DirectoryExporter)
+        apikey: API key for the default exporter
+        api_url: API URL for the default exporter
+        telemetry_dir: Also save every payload there as <call_id>.json
+        columnar_sink: ColumnarSink to flush even if none of the sessions uses it
+
+    Returns:
+        dict: Session IDs that were "sent", "spooled" to the fallback, "dropped", or already
+            "in_progress" elsewhere, plus "elapsed_seconds"
+    """
+    started = time.monotonic()
+    deadline_at = started + deadline
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    report: Dict[str, Any] = {"sent": [], "spooled": [], "dropped": [], "in_progress": []}
+
+    session_ids = []
+    sinks = {id(columnar_sink): columnar_sink} if columnar_sink else {}
+    for session_id, session_info in list(_session_data_store.items()):
+        if session_info.get('columnar_sink'):
+            sinks[id(session_info['columnar_sink'])] = session_info['columnar_sink']
+        if session_info.get('exporting'):
+            report["in_progress"].append(session_id)
+        else:
+            session_ids.append(session_id)
+
+    if not session_ids:
+        await flush_columnar_sinks(sinks.values(), timeout=deadline)
+        report["elapsed_seconds"] = round(time.monotonic() - started, 3)
+        return report
+
+    logger.info(f"🚿 Flushing {len(session_ids)} sessions (concurrency {concurrency}, deadline {deadline}s)")
+
+    async def flush_one(session_id: str):
+        async with semaphore:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= FALLBACK_RESERVE_SECONDS:
+                result = {"success": False}
+                if fallback:
+                    result = await spool_session(session_id, fallback, deadline=remaining)
+                report["spooled" if result.get("success") else "dropped"].append(session_id)
+                return
+
+            result = await send_session_to_whispey(session_id, exporter=exporter, apikey=apikey, api_url=api_url,
+                                                   telemetry_dir=telemetry_dir, deadline=remaining, fallback=fallback)
+            if result.get("success"):
+                report["sent"].append(session_id)
+            elif result.get("fallback", {}).get("success"):
+                report["spooled"].append(session_id)
+            else:
+                report["dropped"].append(session_id)
+
+    tasks = {asyncio.ensure_future(flush_one(session_id)): session_id for session_id in session_ids}
+    # Exports stop at the deadline on their own; this only catches one that does not
+    _, stuck = await asyncio.wait(tasks, timeout=deadline + FALLBACK_RESERVE_SECONDS)
+    for task in stuck:
+        task.cancel()
+        report["dropped"].append(tasks[task])
+
+    await flush_columnar_sinks(sinks.values(), timeout=max(deadline_at - time.monotonic(), FALLBACK_RESERVE_SECONDS))
+
+    report["elapsed_seconds"] = round(time.monotonic() - started, 3)
+    logger.info(
+        f"🚿 Flush done in {report['elapsed_seconds']}s: {len(report['sent'])} sent, "
+        f"{len(report['spooled'])} spooled, {len(report['dropped'])} dropped"
+    )
+    return report
 
 # Utility functions
 def get_latest_session():
@@ -319,7 +776,7 @@ def get_all_active_sessions():
     return [sid for sid, data in _session_data_store.items() if data['call_active']]
 
 def cleanup_all_sessions():
-    """Clean up all sessions"""
+    """Clean up all sessions without exporting them (use flush_all to send them first)"""
     session_ids = list(_session_data_store.keys())
     for session_id in session_ids:
         end_session_manually(session_id, "cleanup")